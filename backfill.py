@@ -0,0 +1,184 @@
+"""Backfill historique du calendrier TradingEconomics (back-testing)
+
+Usage: python scraper.py backfill --from 2024-01-01 --to 2024-06-30 [--out backfill.jsonl]
+
+La plage est découpée en fenêtres de quelques jours, téléchargées avec une
+concurrence bornée et un délai de politesse entre deux requêtes, puis
+parsées dans un pool de processus. Chaque fenêtre terminée est ajoutée au
+fichier JSONL (une annonce par ligne) et enregistrée dans un fichier d'état:
+la mémoire reste constante quelle que soit la longueur de la plage, et une
+relance reprend après la dernière fenêtre validée.
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
+from scraper import TradingEconomicsScraper
+
+_worker_scraper = None
+
+def _parse_window(content, parse_mode):
+    """Parse une fenêtre dans un processus du pool -> lignes JSONL"""
+    global _worker_scraper
+    if _worker_scraper is None or _worker_scraper.parse_mode != parse_mode:
+        _worker_scraper = TradingEconomicsScraper(parse_mode=parse_mode)
+    events = _worker_scraper._parse_html(content)
+    return len(events), "".join(event_to_json(event) + "\n" for event in events).encode("utf-8")
+
+def event_to_json(event):
+    """Annonce -> ligne JSON (relue avec EconomicEvent.from_dict)"""
+    return json.dumps(event.to_dict(), ensure_ascii=False, sort_keys=True)
+
+def windows(start, end, window_days):
+    """Découpe [start, end] (inclus) en fenêtres (d1, d2) de window_days jours"""
+    result = []
+    day = start
+    while day <= end:
+        last = min(day + timedelta(days=window_days - 1), end)
+        result.append((day, last))
+        day = last + timedelta(days=1)
+    return result
+
+class Backfill:
+    """Téléchargement fenêtré, parallèle et reprenable d'une plage passée"""
+
+    MAX_ATTEMPTS = 3
+
+    def __init__(self, output, window_days=7, concurrency=3, delay=1.0, workers=None, scraper=None):
+        self.output = output
+        self.state_path = output + ".state"
+        self.window_days = window_days
+        self.concurrency = concurrency
+        self.delay = delay
+        self.workers = workers
+        self.scraper = scraper or TradingEconomicsScraper()
+        self._next_request = 0.0
+        self._state = None
+        self.fetched = 0
+        self.events = 0
+        self.bytes = 0
+        self.failed = []
+
+    # --- État --------------------------------------------------------------
+
+    def _load_state(self, start, end):
+        """Fenêtres déjà validées; le JSONL est tronqué à la dernière écriture validée"""
+        state = {'from': start.isoformat(), 'to': end.isoformat(), 'window': self.window_days, 'done': [], 'offset': 0}
+        if os.path.exists(self.state_path):
+            with open(self.state_path, encoding="utf-8") as f:
+                saved = json.load(f)
+            if (saved['from'], saved['to'], saved['window']) != (state['from'], state['to'], state['window']):
+                raise ValueError(f"{self.output} contient le backfill {saved['from']} → {saved['to']}: choisir un autre --out")
+            state = saved
+        elif os.path.exists(self.output) and os.path.getsize(self.output):
+            raise ValueError(f"{self.output} existe déjà sans fichier d'état: choisir un autre --out")
+
+        # Une fenêtre à moitié écrite lors d'un crash est retirée du fichier
+        with open(self.output, "ab") as f:
+            f.truncate(state['offset'])
+        self._state = state
+        return set(state['done'])
+
+    def _commit(self, window_start, offset):
+        self._state['done'].append(window_start.isoformat())
+        self._state['offset'] = offset
+        tmp = self.state_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self._state, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.state_path)
+
+    # --- Exécution ---------------------------------------------------------
+
+    async def run(self, start, end):
+        """Backfill de [start, end]; retourne les fenêtres en échec (à relancer)"""
+        done = self._load_state(start, end)
+        todo = [w for w in windows(start, end, self.window_days) if w[0].isoformat() not in done]
+        print(f"📚 Backfill {start} → {end}: {len(todo)} fenêtres à traiter ({len(done)} déjà faites)")
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+        write_lock = asyncio.Lock()
+        started = time.perf_counter()
+
+        with ProcessPoolExecutor(max_workers=self.workers) as pool, open(self.output, "ab") as out:
+            async def process(window):
+                async with semaphore:
+                    try:
+                        content = await self._fetch(window)
+                    except Exception as e:
+                        print(f"❌ Fenêtre {window[0]} → {window[1]}: {e!r}")
+                        self.failed.append(window)
+                        return
+                    loop = asyncio.get_running_loop()
+                    count, lines = await loop.run_in_executor(pool, _parse_window, content, self.scraper.parse_mode)
+                    del content
+
+                    async with write_lock:
+                        out.write(lines)
+                        out.flush()
+                        os.fsync(out.fileno())
+                        self._commit(window[0], out.tell())
+                    self.events += count
+                    print(f"✅ {window[0]} → {window[1]}: {count} annonces")
+
+            try:
+                await asyncio.gather(*(process(window) for window in todo))
+            finally:
+                await self.scraper.close()
+
+        elapsed = time.perf_counter() - started
+        print(
+            f"📚 Backfill terminé en {elapsed:.1f}s: {self.fetched} fenêtres, {self.events} annonces, "
+            f"{self.bytes / 1e6:.1f} Mo téléchargés, {len(self.failed)} en échec"
+        )
+        return self.failed
+
+    async def _fetch(self, window):
+        """GET d'une fenêtre: délai de politesse entre deux requêtes, retries avec backoff"""
+        params = TradingEconomicsScraper._range_params(*window)
+        for attempt in range(self.MAX_ATTEMPTS):
+            now = time.monotonic()
+            wait = self._next_request - now
+            self._next_request = max(now, self._next_request) + self.delay
+            if wait > 0:
+                await asyncio.sleep(wait)
+            try:
+                _, content, _ = await self.scraper.fetch_conditional(params)
+                self.fetched += 1
+                self.bytes += len(content)
+                return content
+            except Exception:
+                if attempt == self.MAX_ATTEMPTS - 1:
+                    raise
+                await asyncio.sleep(self.delay * 2 ** (attempt + 1))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="scraper", description="Outils du scraper TradingEconomics")
+    commands = parser.add_subparsers(dest="command", required=True)
+    backfill = commands.add_parser("backfill", help="télécharge une plage passée vers un fichier JSONL")
+    backfill.add_argument("--from", dest="start", type=date.fromisoformat, required=True)
+    backfill.add_argument("--to", dest="end", type=date.fromisoformat, required=True)
+    backfill.add_argument("--out", default="backfill.jsonl")
+    backfill.add_argument("--window", type=int, default=7, help="jours par requête")
+    backfill.add_argument("--concurrency", type=int, default=3, help="requêtes simultanées")
+    backfill.add_argument("--delay", type=float, default=1.0, help="secondes entre deux requêtes")
+    backfill.add_argument("--workers", type=int, default=None, help="processus de parsing")
+    args = parser.parse_args(argv)
+
+    if args.end < args.start:
+        parser.error("--to doit être postérieur à --from")
+
+    job = Backfill(args.out, args.window, args.concurrency, args.delay, args.workers)
+    try:
+        failed = asyncio.run(job.run(args.start, args.end))
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 2
+    if failed:
+        print(f"⚠️ {len(failed)} fenêtres en échec: relancer la même commande pour les reprendre")
+        return 1
+    return 0
@@ -0,0 +1,112 @@
+"""Benchmark du backfill: requête monolithique vs fenêtres parallèles streamées sur disque
+
+Usage: python -m benchmarks.bench_backfill [--weeks 26] [--window 7] [--concurrency 4]
+
+Un serveur HTTP local génère la page calendrier de n'importe quelle plage
+(d1, d2). "avant" télécharge toute la plage en une requête et la parse dans
+le processus; "après" passe par Backfill (fenêtres, pool de processus,
+écriture JSONL au fil de l'eau). Le pic mémoire est celui du processus
+principal (tracemalloc). Les pages étant générées par plage, les deux
+variantes ne contiennent pas exactement les mêmes annonces.
+"""
+import argparse
+import asyncio
+import http.server
+import os
+import tempfile
+import threading
+import time
+import tracemalloc
+from datetime import date, timedelta
+from urllib.parse import parse_qs, urlparse
+
+from backfill import Backfill
+from benchmarks.fixtures import build_calendar_page
+from scraper import TradingEconomicsScraper
+
+
+def serve(rows_per_day):
+    """Serveur calendrier local: une page générée par plage (d1, d2)"""
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            query = parse_qs(urlparse(self.path).query)
+            d1, d2 = date.fromisoformat(query['d1'][0]), date.fromisoformat(query['d2'][0])
+            content = build_calendar_page(
+                start=d1, days=(d2 - d1).days + 1, rows_per_day=rows_per_day, seed=d1.toordinal()
+            )
+            self.send_response(200)
+            self.send_header('Content-Length', str(len(content)))
+            self.end_headers()
+            self.wfile.write(content)
+
+        def log_message(self, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}/calendar"
+
+
+def measure(coro_factory):
+    """(résultat, secondes, pic mémoire en octets) d'une coroutine
+
+    Deux exécutions: tracemalloc ralentit fortement le parsing, le temps est
+    donc mesuré sans lui.
+    """
+    start = time.perf_counter()
+    result = asyncio.run(coro_factory())
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    asyncio.run(coro_factory())
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--weeks", type=int, default=26)
+    parser.add_argument("--window", type=int, default=7, help="jours par requête")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--rows", type=int, default=40, help="lignes par jour")
+    args = parser.parse_args()
+
+    server, url = serve(args.rows)
+    start = date(2024, 1, 1)
+    end = start + timedelta(weeks=args.weeks) - timedelta(days=1)
+
+    async def monolithic():
+        scraper = TradingEconomicsScraper()
+        scraper.BASE_URL = url
+        try:
+            return len(await scraper.fetch_range_async(start, end))
+        finally:
+            await scraper.close()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        output = os.path.join(tmp, "backfill.jsonl")
+
+        async def windowed():
+            for path in (output, output + ".state"):
+                if os.path.exists(path):
+                    os.remove(path)
+            scraper = TradingEconomicsScraper()
+            scraper.BASE_URL = url
+            job = Backfill(output, window_days=args.window, concurrency=args.concurrency, delay=0, scraper=scraper)
+            await job.run(start, end)
+            return job.events
+
+        before = measure(monolithic)
+        after = measure(windowed)
+        size = os.path.getsize(output)
+    server.shutdown()
+
+    print(f"\n📚 {args.weeks} semaines ({start} → {end}), fenêtres de {args.window} jours, concurrence {args.concurrency}")
+    for label, (events, elapsed, peak) in (("avant", before), ("après", after)):
+        print(f"   {label:5} : {elapsed:6.2f} s | {events} annonces | pic mémoire {peak / 1e6:7.1f} Mo")
+    print(f"⚡ Gain: x{before[1] / after[1]:.1f} en temps, x{before[2] / after[2]:.0f} en mémoire ({size / 1e6:.1f} Mo écrits)")
+
+
+if __name__ == "__main__":
+    main()
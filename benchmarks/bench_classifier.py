@@ -0,0 +1,64 @@
+"""Vérifie le classifieur sur le corpus figé et mesure son coût par nom
+
+Usage: python -m benchmarks.bench_classifier [--repeat 200]
+
+Le corpus (benchmarks/data/classifier_corpus.json) a été généré avec les
+anciennes fonctions _is_relevant_event / _simplify_event_name /
+_get_affected_assets: toute divergence fait échouer le script. L'équivalence
+est vérifiée par tests/test_classifier.py (corpus + boucle mot-clé de référence).
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import classifier
+
+CORPUS = Path(__file__).parent / "data" / "classifier_corpus.json"
+
+
+def check(corpus):
+    """Retourne la liste des noms dont la classification diverge du corpus"""
+    errors = []
+    for entry in corpus:
+        result = classifier.classify(entry["name"])
+        expected = (entry["relevant"], entry["canonical"], tuple(entry["assets"]))
+        if (result.relevant, result.name, result.assets) != expected:
+            errors.append((entry["name"], expected, tuple(result)))
+    return errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    corpus = json.loads(CORPUS.read_text(encoding="utf-8"))
+    errors = check(corpus)
+    for name, expected, got in errors:
+        print(f"❌ {name!r}: attendu {expected}, obtenu {got}")
+    if errors:
+        sys.exit(1)
+    print(f"✅ {len(corpus)} noms identiques au corpus")
+
+    names = [entry["name"] for entry in corpus]
+    classify_uncached = classifier.classify.__wrapped__
+
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        for name in names:
+            classify_uncached(name)
+    cold = (time.perf_counter() - start) / (args.repeat * len(names))
+
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        for name in names:
+            classifier.classify(name)
+    warm = (time.perf_counter() - start) / (args.repeat * len(names))
+
+    print(f"⏱️ classify: {cold * 1e6:.2f} µs/nom (sans cache) | {warm * 1e6:.2f} µs/nom (mémoïsé)")
+
+
+if __name__ == "__main__":
+    main()
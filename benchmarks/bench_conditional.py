@@ -0,0 +1,135 @@
+"""Benchmark des polls répétés: GET complet vs GET conditionnel (ETag) via CalendarCache
+
+Usage: python -m benchmarks.bench_conditional [--polls 20] [--rows 40]
+
+Un serveur HTTP local sert une page calendrier synthétique avec un ETag. "avant"
+refait GET + parsing à chaque poll; "après" passe par CalendarCache (TTL nul):
+seul le premier poll télécharge et parse, les suivants reçoivent un 304.
+La dernière partie coupe le serveur pour vérifier que la dernière donnée
+valide est servie et que le coupe-circuit limite les requêtes.
+"""
+import argparse
+import asyncio
+import http.server
+import threading
+import time
+from datetime import date
+
+from benchmarks.fixtures import build_calendar_page
+from calendar_cache import CalendarCache, CircuitBreaker
+from scraper import TradingEconomicsScraper
+
+
+class StubServer:
+    """Serveur calendrier local: compte requêtes, octets envoyés et 304"""
+
+    def __init__(self, content):
+        self.content = content
+        self.failing = False
+        self.requests = 0
+        self.bytes_sent = 0
+        self.not_modified = 0
+        stub = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            def do_GET(self):
+                stub.requests += 1
+                if stub.failing:
+                    self.send_response(503)
+                    self.end_headers()
+                    return
+                if self.headers.get('If-None-Match') == '"calendar-v1"':
+                    stub.not_modified += 1
+                    self.send_response(304)
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header('ETag', '"calendar-v1"')
+                self.send_header('Content-Length', str(len(stub.content)))
+                self.end_headers()
+                self.wfile.write(stub.content)
+                stub.bytes_sent += len(stub.content)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_port}/calendar"
+
+    def reset(self):
+        self.requests = self.bytes_sent = self.not_modified = 0
+
+
+class CountingScraper(TradingEconomicsScraper):
+    """Scraper qui cumule le temps CPU passé à parser"""
+
+    def __init__(self, url):
+        super().__init__()
+        self.BASE_URL = url
+        self.parse_time = 0.0
+
+    def _parse_html(self, content):
+        start = time.perf_counter()
+        try:
+            return super()._parse_html(content)
+        finally:
+            self.parse_time += time.perf_counter() - start
+
+
+async def run(args):
+    start = date.today()
+    stub = StubServer(build_calendar_page(start=start, days=8, rows_per_day=args.rows))
+    end = start.fromordinal(start.toordinal() + 7)
+
+    scraper = CountingScraper(stub.url)
+    began = time.perf_counter()
+    for _ in range(args.polls):
+        await scraper.fetch_range_async(start, end)
+    before = (time.perf_counter() - began, stub.requests, stub.bytes_sent, scraper.parse_time)
+    await scraper.close()
+
+    stub.reset()
+    scraper = CountingScraper(stub.url)
+    cache = CalendarCache(scraper, ttl=0)
+    began = time.perf_counter()
+    for _ in range(args.polls):
+        await cache.get_range(start, end)
+        # La revalidation tourne en tâche de fond: on l'attend pour mesurer le coût total
+        await asyncio.gather(*cache._inflight.values(), return_exceptions=True)
+    after = (time.perf_counter() - began, stub.requests, stub.bytes_sent, scraper.parse_time)
+
+    stub.reset()
+    stub.failing = True
+    cache.breaker = CircuitBreaker(failure_threshold=3, reset_timeout=60)
+    served = 0
+    for _ in range(args.polls):
+        served += bool(await cache.get_range(start, end))
+        await asyncio.gather(*cache._inflight.values(), return_exceptions=True)
+    outage = (stub.requests, served, cache.breaker.state)
+    await scraper.close()
+    stub.server.shutdown()
+
+    print(f"🌐 {args.polls} polls d'une page de {len(stub.content) / 1024:.0f} Ko")
+    for label, (elapsed, requests, sent, parse) in (("avant", before), ("après", after)):
+        print(
+            f"   {label:5} : {elapsed * 1000:8.1f} ms | {requests} requêtes | "
+            f"{sent / 1024:8.0f} Ko reçus | parsing {parse * 1000:.1f} ms"
+        )
+    print(f"⚡ Gain: x{before[2] / max(after[2], 1):.0f} en octets, x{before[3] / max(after[3], 1e-9):.0f} en CPU de parsing")
+    print(
+        f"🔌 Panne upstream: {outage[1]}/{args.polls} polls servis depuis le cache, "
+        f"{outage[0]} requêtes envoyées, circuit {outage[2]}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--polls", type=int, default=20)
+    parser.add_argument("--rows", type=int, default=40, help="lignes par jour")
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
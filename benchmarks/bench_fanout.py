@@ -0,0 +1,139 @@
+"""Benchmark de la diffusion multi-guilds: un pipeline par guild vs un scraping partagé
+
+Usage: python -m benchmarks.bench_fanout [--subscribers 10 50 200] [--latency 0.02] [--rows 12]
+
+"avant" reproduit un processus par guild: chaque abonné télécharge et parse
+le calendrier (page synthétique de la semaine servie en local, --rows
+annonces par jour), construit son embed puis l'envoie. "après" scrape une
+fois (refresh_events), fait un rendu par combinaison de filtres et envoie à
+tous les salons en parallèle (publish_agendas). Les abonnés ont 4 combinaisons de filtres / langues.
+Mesure, par nombre d'abonnés, la latence de publication par guild (début du
+job → message envoyé, p50/p95), le nombre de scrapings et de rendus. Les
+appels Discord passent par un client factice avec --latency secondes: au-delà
+de quelques dizaines d'abonnés, la latence restante est celle de la file de
+publication (PUBLISH_CONCURRENCY envois simultanés).
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import time
+from datetime import timedelta
+
+os.environ.setdefault("CHANNEL_ID", "1")
+os.environ.setdefault("GUILD_ID", "2")
+os.environ["EVENTS_DB"] = ":memory:"
+
+import schedulers
+from benchmarks.fake_discord import FakeBot
+from benchmarks.fixtures import build_calendar_page
+from benchmarks.suite import serve
+from metrics import percentiles
+from models import Subscription
+from scraper import TradingEconomicsScraper
+
+FILTERS = [((), 1, "fr"), ((), 3, "fr"), (("ES", "NQ"), 1, "fr"), ((), 1, "en")]
+
+
+def subscribers(count):
+    # Salons distincts d'une série à l'autre: aucun agenda déjà publié à réutiliser
+    return [Subscription(100 + index, count * 10_000 + index, *FILTERS[index % len(FILTERS)]) for index in range(count)]
+
+
+def latencies(bot, targets, started):
+    return [bot.get_channel(s.channel_id).messages[-1].created_at - started for s in targets]
+
+
+async def before(targets, url, start, end, bot):
+    """Un pipeline complet par abonné (un processus par guild)"""
+    renders = 0
+
+    async def one(subscription):
+        nonlocal renders
+        # Chaque processus a son propre cache de rendu
+        schedulers.render_cache.clear()
+        scraper = TradingEconomicsScraper()
+        scraper.BASE_URL = url
+        try:
+            _, content, _ = await scraper.fetch_conditional(scraper._range_params(start, end - timedelta(days=1)))
+        finally:
+            await scraper.close()
+        events = await asyncio.to_thread(scraper._parse_html, content)
+        schedulers.event_store.replace_range(start, end, events)
+        renders += 1
+        rendered = schedulers._agenda_message(start, end, True, subscription)
+        await schedulers.send_pages(bot.get_channel(subscription.channel_id), rendered)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(subscription) for subscription in targets))
+    return latencies(bot, targets, started), len(targets), renders
+
+
+async def after(targets, start, end, bot):
+    """Un scraping, un rendu par filtre, envois en parallèle"""
+    started = time.perf_counter()
+    await schedulers.refresh_events(days_ahead=7)
+    await schedulers.publish_agendas(bot, targets, start, end)
+    return latencies(bot, targets, started), 1, len({s.filter_key for s in targets})
+
+
+async def run(args, url, start, end):
+    schedulers.scraper.BASE_URL = url
+    schedulers.calendar_cache.ttl = 0
+
+    rows = []
+    for count in args.subscribers:
+        targets = subscribers(count)
+        results = {}
+        for variant in ("avant", "après"):
+            bot = FakeBot(latency=args.latency)
+            if variant == "avant":
+                results[variant] = await before(targets, url, start, end, bot)
+            else:
+                results[variant] = await after(targets, start, end, bot)
+        rows.append((count, results))
+    await schedulers.scraper.close()
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--subscribers", type=int, nargs="+", default=[10, 50, 200])
+    parser.add_argument("--latency", type=float, default=0.02, help="latence simulée d'un appel Discord (s)")
+    parser.add_argument("--rows", type=int, default=12, help="annonces par jour dans la page servie")
+    args = parser.parse_args()
+
+    # Page de la semaine à venir, servie quelle que soit la plage demandée
+    start, end = schedulers.scraper.get_date_range(7)
+    end += timedelta(days=1)
+    server, url = serve(_AnyDay(build_calendar_page(start=start, days=8, rows_per_day=args.rows)))
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            rows = asyncio.run(run(args, url, start, end))
+    finally:
+        server.shutdown()
+
+    print(f"\n📬 Diffusion de l'agenda ({args.rows} annonces/jour, latence Discord {args.latency * 1000:.0f} ms, "
+          f"{schedulers.PUBLISH_CONCURRENCY} envois simultanés)")
+    for count, results in rows:
+        print(f"   {count} abonnés:")
+        for variant, (values, scrapes, renders) in results.items():
+            stats = percentiles(values)
+            print(
+                f"      {variant:5}: latence par guild p50 {stats['p50'] * 1000:7.0f} ms | p95 {stats['p95'] * 1000:7.0f} ms "
+                f"| {scrapes:3} scraping(s), {renders:3} rendu(s)"
+            )
+
+
+class _AnyDay(dict):
+    def __init__(self, content):
+        super().__init__()
+        self.content = content
+
+    def __missing__(self, key):
+        return self.content
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Micro-benchmark des lookups de jours fériés
+
+Usage: python -m benchmarks.bench_holidays [--days 3650]
+
+"avant" reproduit le coût de l'ancien is_market_holiday (reconstruction des
+tables US + UK à chaque appel); "après" passe par les tables mémoïsées.
+"""
+import argparse
+import time
+from datetime import date, timedelta
+
+from market_holidays import MarketHolidays
+
+
+def legacy_lookup(check_date):
+    """Ancien chemin: les deux dicts de l'année sont recalculés à chaque appel"""
+    us_holidays = MarketHolidays._compute_us_holidays(check_date.year)
+    uk_holidays = MarketHolidays._compute_uk_holidays(check_date.year)
+    holidays_info = []
+    if check_date in us_holidays:
+        holidays_info.append(us_holidays[check_date])
+    if check_date in uk_holidays:
+        holidays_info.append(uk_holidays[check_date])
+    return holidays_info
+
+
+def per_call(func, dates):
+    start = time.perf_counter()
+    for day in dates:
+        func(day)
+    return (time.perf_counter() - start) / len(dates)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--days", type=int, default=3650)
+    args = parser.parse_args()
+
+    dates = [date(2020, 1, 1) + timedelta(days=i) for i in range(args.days)]
+
+    before = per_call(legacy_lookup, dates)
+    MarketHolidays._tables.clear()
+    cold = per_call(MarketHolidays.is_market_holiday, dates)
+    warm = per_call(MarketHolidays.is_market_holiday, dates)
+
+    start = time.perf_counter()
+    found = MarketHolidays.holidays_between(dates[0], dates[-1] + timedelta(days=1))
+    bulk = time.perf_counter() - start
+
+    print(f"📅 {len(dates)} dates ({dates[0]} → {dates[-1]})")
+    print(f"   avant : {before * 1e6:8.2f} µs/lookup")
+    print(f"   après : {cold * 1e6:8.2f} µs/lookup (tables froides) | {warm * 1e6:.2f} µs/lookup (chaudes)")
+    print(f"   holidays_between: {len(found)} jours fériés en {bulk * 1000:.2f} ms")
+    print(f"⚡ Gain: x{before / warm:.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Benchmark du coût des spans de metrics.py, activés et désactivés
+
+Usage: python -m benchmarks.bench_metrics [--spans 200000] [--repeat 7]
+
+Mesure le coût unitaire d'un span (et d'un appel chronométré par
+accumulate) puis le parsing de la fixture "busy_week" avec les métriques
+activées et désactivées.
+"""
+import argparse
+import time
+
+from benchmarks.fixtures import load_fixture
+from classifier import classify
+from metrics import Metrics, metrics
+from scraper import TradingEconomicsScraper
+
+
+def per_call(fn, count):
+    start = time.perf_counter()
+    fn(count)
+    return (time.perf_counter() - start) / count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--spans", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=7)
+    args = parser.parse_args()
+
+    def loop(count):
+        for _ in range(count):
+            pass
+
+    def spans(instance):
+        def run(count):
+            for _ in range(count):
+                with instance.span("bench"):
+                    pass
+        return run
+
+    def wrapped(instance):
+        def run(count):
+            with instance.accumulate("bench") as timer:
+                timed = timer.wrap(classify)
+                for _ in range(count):
+                    timed("Core CPI YoY")
+        return run
+
+    baseline = per_call(loop, args.spans)
+    print(f"\n⏱️ Coût par span ({args.spans} spans, boucle vide déduite)")
+    for label, enabled in (("activé", True), ("désactivé", False)):
+        instance = Metrics(enabled=enabled)
+        span_cost = per_call(spans(instance), args.spans) - baseline
+        wrap_cost = per_call(wrapped(instance), args.spans) - per_call(lambda n: [classify("Core CPI YoY") for _ in range(n)], args.spans)
+        print(f"   {label:9}: span {span_cost * 1e9:6.0f} ns | appel chronométré +{max(wrap_cost, 0) * 1e9:5.0f} ns")
+
+    content = load_fixture("busy_week")
+    scraper = TradingEconomicsScraper()
+    results = {}
+    for enabled in (True, False, True, False):
+        metrics.enabled = enabled
+        best = float("inf")
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            scraper._parse_html(content)
+            best = min(best, time.perf_counter() - start)
+        results[enabled] = min(best, results.get(enabled, best))
+    metrics.enabled = True
+
+    overhead = results[True] / results[False] - 1
+    print(f"📄 Parsing busy_week: {results[False] * 1000:.1f} ms sans métriques, {results[True] * 1000:.1f} ms avec ({overhead:+.1%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""Benchmark du modèle d'annonce: dict "formaté" vs EconomicEvent compact
+
+Usage: python -m benchmarks.bench_model [--events 100000]
+
+"avant" reproduit l'ancien format du scraper (dict avec datetime, heure,
+drapeau et étoiles précalculés, liste d'assets); "après" utilise
+EconomicEvent (slots, horodatage epoch, codes internés, tuple d'assets).
+Mesure la mémoire retenue pour N annonces, le coût de construction et le
+surcoût du formatage quand les champs d'affichage sont calculés à la demande.
+"""
+import argparse
+import gc
+import time
+import tracemalloc
+from datetime import date
+
+from benchmarks.fixtures import build_calendar_page
+from models import FLAGS
+from rendering import render_cache
+from scraper import TradingEconomicsScraper
+from timeutils import PARIS
+from utils import format_weekly_agenda
+
+
+def as_dict(event):
+    """Annonce au format dict d'origine (champs d'affichage stockés)"""
+    when = event.datetime
+    return {
+        'datetime': when,
+        'time_paris': when.strftime('%H:%M'),
+        'country': FLAGS.get(event.country, FLAGS["WW"]),
+        'name': event.name,
+        'importance': "⭐" * event.importance,
+        'assets': list(event.assets),
+        'description': event.description,
+        'actual': event.actual or "",
+        'previous': event.previous or "",
+        'consensus': event.consensus or "",
+        'forecast': event.forecast or "",
+        'row_id': event.row_id
+    }
+
+
+def retained(build, count):
+    """(octets retenus, secondes) pour construire count annonces"""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    events = build(count)
+    elapsed = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del events
+    return current, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    # Annonces réelles du parseur, répétées jusqu'à N
+    sample = TradingEconomicsScraper()._parse_html(
+        build_calendar_page(start=date(2026, 1, 5), days=28, rows_per_day=40)
+    )
+
+    def build_models(count):
+        # Copies distinctes (replace) pour ne pas mesurer des références partagées
+        return [sample[i % len(sample)].replace(row_id=str(i)) for i in range(count)]
+
+    def build_dicts(count):
+        return [dict(as_dict(sample[i % len(sample)]), row_id=str(i)) for i in range(count)]
+
+    before, build_before = retained(build_dicts, args.events)
+    after, build_after = retained(build_models, args.events)
+
+    week = [e for e in sample if e.datetime.date() < date(2026, 1, 12)]
+    week_dicts = [as_dict(e) for e in week]
+
+    def format_dicts(events):
+        # Ancien formatage: champs déjà prêts, simple lecture
+        return "\n".join(
+            f"⏰ **{e['time_paris']}** - {e['country']} {e['name']} {e['importance']} | {', '.join(e['assets'])}"
+            for e in events
+        )
+
+    def format_models(events):
+        # Même ligne, drapeau/étoiles/heure calculés à l'affichage
+        return "\n".join(
+            f"⏰ **{e.time_paris}** - {e.flag} {e.name} {e.stars} | {', '.join(e.assets)}"
+            for e in events
+        )
+
+    def timed(fn, *fn_args):
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            fn(*fn_args)
+        return (time.perf_counter() - start) / args.repeat
+
+    fmt_before = timed(format_dicts, week_dicts)
+    fmt_after = timed(format_models, week)
+    # Rendu complet à chaque fois (sans le cache par empreinte)
+    agenda = timed(lambda events: (render_cache.clear(), format_weekly_agenda(events)), week)
+
+    print(f"\n🧱 {args.events} annonces ({PARIS})")
+    print(f"   avant : {before / args.events:6.0f} o/annonce | {before / 1e6:6.1f} Mo | construction {build_before:.2f} s")
+    print(f"   après : {after / args.events:6.0f} o/annonce | {after / 1e6:6.1f} Mo | construction {build_after:.2f} s")
+    print(f"⚡ Gain mémoire: x{before / after:.1f}")
+    print(
+        f"🖨️ Agenda de {len(week)} annonces: {fmt_before * 1000:.2f} ms (champs stockés) "
+        f"→ {fmt_after * 1000:.2f} ms (calculés à l'affichage); format_weekly_agenda complet {agenda * 1000:.2f} ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
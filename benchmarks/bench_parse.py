@@ -0,0 +1,55 @@
+"""Benchmark du parsing calendrier: document complet vs table#calendar seule vs streaming
+
+Usage: python -m benchmarks.bench_parse [--weeks 12] [--repeat 3]
+"""
+import argparse
+import gc
+import time
+import tracemalloc
+from datetime import date
+
+from benchmarks.fixtures import build_calendar_page
+from scraper import TradingEconomicsScraper
+
+
+def measure(parse_mode, content, repeat):
+    """Retourne (meilleur temps en s, pic mémoire en octets, nb événements)"""
+    scraper = TradingEconomicsScraper(parse_mode=parse_mode)
+    best = float("inf")
+    events = {}
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        events = scraper._parse_html(content)
+        best = min(best, time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    scraper._parse_html(content)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak, len(events)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--weeks", type=int, default=12, help="semaines de calendrier dans la page")
+    parser.add_argument("--rows", type=int, default=40, help="lignes par jour")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    content = build_calendar_page(start=date(2026, 1, 5), days=args.weeks * 7, rows_per_day=args.rows)
+    print(f"📄 Page: {len(content) / 1024:.0f} KB, {args.weeks * 7 * args.rows} lignes")
+
+    results = {mode: measure(mode, content, args.repeat) for mode in ("full", "strainer", "stream")}
+    for mode, (elapsed, peak, count) in results.items():
+        print(f"{mode:>9}: {elapsed * 1000:8.1f} ms | pic {peak / 1024 / 1024:7.1f} MB | {count} événements")
+
+    full = results["full"]
+    for mode in ("strainer", "stream"):
+        elapsed, peak, _ = results[mode]
+        print(f"⚡ {mode} vs full: x{full[0] / elapsed:.2f} temps, x{full[1] / peak:.2f} mémoire")
+
+
+if __name__ == "__main__":
+    main()
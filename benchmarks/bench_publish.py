@@ -0,0 +1,208 @@
+"""Test de charge hors ligne du chemin de publication Discord
+
+Usage: python -m benchmarks.bench_publish [--guilds 10 50] [--rows 24] [--latency 0.02] [--jitter 0.03]
+                                          [--route-limit 5 1] [--rate-limit-rate 0.02] [--concurrency 4]
+
+Rejoue une semaine chargée (page synthétique de --rows annonces par jour,
+servie en local) pour N guilds simulées, un salon abonné chacune (4
+combinaisons de filtres / langues), à travers le vrai code des jobs:
+
+- agenda: send_weekly_agendas (scraping, rendu, messages puis synchro des
+  Discord Events de chaque guild);
+- rappels: les rappels de la journée la plus chargée, déclenchés heure par
+  heure comme les jobs DateTrigger (send_event_reminder).
+
+Discord est remplacé par benchmarks.fake_discord: latence --latency +
+aléatoire(--jitter), bucket de --route-limit appels par seconde et par route,
+--rate-limit-rate de 429 injectés au hasard. Pour chaque phase: débit
+(appels Discord réussis par seconde), latence de bout en bout (déclenchement →
+message ou Discord Event créé, p50/p95/max), 429 reçus, et annonces perdues:
+ce qui devait exister côté Discord (pages d'agenda, Discord Events, rappels)
+et que le faux serveur n'a pas reçu.
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+# Uniquement les guilds simulées: pas de salon par défaut, aucun store sur disque
+os.environ["CHANNEL_ID"] = ""
+os.environ["GUILD_ID"] = ""
+os.environ["EVENTS_DB"] = ":memory:"
+
+import schedulers
+from benchmarks.fake_discord import FakeBot
+from benchmarks.fixtures import build_calendar_page
+from benchmarks.suite import serve
+from discord_events import DiscordEventManager
+from metrics import percentiles
+from models import Subscription
+from publish_queue import publish_queue
+from subscriptions import SubscriptionRegistry
+from timeutils import PARIS
+
+FILTERS = [((), 1, "fr"), ((), 3, "fr"), (("ES", "NQ"), 1, "fr"), ((), 1, "en")]
+
+
+class Phase:
+    """Mesures d'une phase: durée, appels, latences, attendu vs reçu"""
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.calls = sum(bot.calls.values())
+        self.rate_limited = sum(bot.rate_limited.values())
+        self.failed = publish_queue.failed
+        self.started = time.perf_counter()
+        self.latencies = []
+        self.expected = 0
+        self.delivered = 0
+
+    def stop(self):
+        self.elapsed = time.perf_counter() - self.started
+        self.calls = sum(self.bot.calls.values()) - self.calls
+        self.rate_limited = sum(self.bot.rate_limited.values()) - self.rate_limited
+        self.failed = publish_queue.failed - self.failed
+        return self
+
+
+def subscribers(count):
+    # Guilds et salons distincts d'une série à l'autre: rien de déjà publié à réutiliser
+    return [
+        Subscription(count * 10_000 + index, count * 10_000 + 5_000 + index, *FILTERS[index % len(FILTERS)])
+        for index in range(count)
+    ]
+
+
+async def agenda_phase(bot, targets):
+    """Agenda hebdomadaire + Discord Events de toutes les guilds"""
+    phase = Phase(bot)
+    await schedulers.send_weekly_agendas(bot)
+    phase.stop()
+
+    start, end = schedulers.scraper.get_date_range(7)
+    end += timedelta(days=1)
+    events = schedulers.event_store.range(start, end)
+    now = datetime.now(PARIS).timestamp()
+    for subscription in targets:
+        # Pages d'agenda (rendu déjà en cache)
+        pages = len(schedulers._agenda_message(start, end, schedulers.calendar_cache.healthy, subscription).pages)
+        messages = bot.get_channel(subscription.channel_id).messages
+        phase.expected += pages
+        phase.delivered += min(len(messages), pages)
+        phase.latencies.extend(message.created_at - phase.started for message in messages)
+
+        # Discord Events: une par annonce à venir retenue par le filtre de la guild
+        keys = {
+            DiscordEventManager.event_key(event)
+            for event in SubscriptionRegistry.select(events, [subscription]) if event.timestamp >= now
+        }
+        created = bot.get_guild(subscription.guild_id).events.values()
+        phase.expected += len(keys)
+        phase.delivered += min(len(created), len(keys))
+        phase.latencies.extend(event.created_at - phase.started for event in created)
+    return phase
+
+
+async def reminders_phase(bot, targets):
+    """Rappels de la journée la plus chargée, heure par heure"""
+    start, end = schedulers.scraper.get_date_range(7)
+    by_day = defaultdict(list)
+    for event in schedulers.event_store.range(start, end + timedelta(days=1)):
+        by_day[event.datetime.date()].append(event)
+    day_events = max(by_day.values(), key=len)
+    by_time = defaultdict(list)
+    for event in day_events:
+        by_time[event.timestamp].append(event)
+
+    channels = [bot.get_channel(subscription.channel_id) for subscription in targets]
+    phase = Phase(bot)
+    for timestamp in sorted(by_time):
+        group = by_time[timestamp]
+        fired = time.perf_counter()
+        await asyncio.gather(*(schedulers.send_event_reminder(bot, event, 5, None) for event in group))
+        sent = [message for channel in channels for message in channel.messages if message.created_at >= fired]
+        phase.expected += sum(len(schedulers.subscriptions.matching(event)) for event in group)
+        phase.delivered += len(sent)
+        phase.latencies.extend(message.created_at - fired for message in sent)
+    phase.reminders = len(day_events)
+    return phase.stop()
+
+
+async def run(args, url):
+    schedulers.scraper.BASE_URL = url
+    schedulers.calendar_cache.ttl = 0
+    publish_queue.configure(concurrency=args.concurrency)
+
+    rows = []
+    for count in args.guilds:
+        targets = subscribers(count)
+        for subscription in schedulers.subscriptions.all():
+            schedulers.subscriptions.remove(subscription.channel_id)
+        for subscription in targets:
+            schedulers.subscriptions.add(subscription)
+
+        bot = FakeBot(
+            latency=args.latency,
+            jitter=args.jitter,
+            route_limit=tuple(args.route_limit) if args.route_limit else None,
+            rate_limit_rate=args.rate_limit_rate,
+            retry_after=args.retry_after,
+            seed=count
+        )
+        agenda = await agenda_phase(bot, targets)
+        reminders = await reminders_phase(bot, targets)
+        rows.append((count, {"agenda": agenda, "rappels": reminders}, bot))
+    await schedulers.scraper.close()
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--guilds", type=int, nargs="+", default=[10, 50])
+    parser.add_argument("--rows", type=int, default=24, help="annonces par jour dans la page servie")
+    parser.add_argument("--latency", type=float, default=0.02, help="latence d'un appel Discord (s)")
+    parser.add_argument("--jitter", type=float, default=0.03, help="latence aléatoire ajoutée (s)")
+    parser.add_argument("--route-limit", type=float, nargs=2, metavar=("APPELS", "SECONDES"), default=[5, 1],
+                        help="bucket par route (0 0: sans limite)")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.02, help="proportion de 429 injectés")
+    parser.add_argument("--retry-after", type=float, default=0.2, help="Retry-After des 429 injectés (s)")
+    parser.add_argument("--concurrency", type=int, default=schedulers.PUBLISH_CONCURRENCY, help="envois simultanés")
+    args = parser.parse_args()
+    if args.route_limit == [0, 0]:
+        args.route_limit = None
+
+    start, _ = schedulers.scraper.get_date_range(7)
+    content = build_calendar_page(start=start, days=8, rows_per_day=args.rows)
+    server, url = serve(defaultdict(lambda: content))
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            rows = asyncio.run(run(args, url))
+    finally:
+        server.shutdown()
+
+    limit = f"{args.route_limit[0]:g} appels/{args.route_limit[1]:g}s par route" if args.route_limit else "sans bucket"
+    print(
+        f"\n🧪 Publication Discord hors ligne ({args.rows} annonces/jour, latence {args.latency * 1000:.0f}"
+        f"+{args.jitter * 1000:.0f} ms, {limit}, {args.rate_limit_rate:.0%} de 429 injectés, "
+        f"{args.concurrency} envois simultanés)"
+    )
+    for count, phases, bot in rows:
+        stats = percentiles(bot.durations)
+        print(f"   {count} guilds (appel Discord p50 {stats['p50'] * 1000:.0f} ms | p95 {stats['p95'] * 1000:.0f} ms):")
+        for name, phase in phases.items():
+            latency = percentiles(phase.latencies)
+            lost = phase.expected - phase.delivered
+            detail = f" ({phase.reminders} annonces)" if name == "rappels" else ""
+            print(
+                f"      {name:7}{detail}: {phase.calls:5} appels en {phase.elapsed:6.1f}s = {phase.calls / phase.elapsed:6.1f} appels/s "
+                f"| latence p50 {latency['p50']:6.2f}s p95 {latency['p95']:6.2f}s max {latency['max']:6.2f}s "
+                f"| {phase.rate_limited:4} 429 | {phase.failed} échec(s) | {lost} perdu(s) sur {phase.expected}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Benchmark des requêtes !asset / !next / !week et de la mise à jour des index
+
+Usage: python -m benchmarks.bench_queries [--weeks 4] [--rows 60] [--repeat 2000]
+
+"avant" parcourt toutes les annonces de la période (accès par date
+uniquement) et filtre sur les assets / l'importance; "après" interroge les
+index inversés d'EventStore (asset -> annonces triées par heure, importance
+-> annonces). Mesure aussi un rafraîchissement où une seule annonce change:
+réindexation complète de la plage vs mise à jour incrémentale.
+"""
+import argparse
+import time
+from datetime import datetime, timedelta
+from itertools import cycle, islice
+
+from benchmarks.fixtures import build_calendar_page
+from event_store import EventStore
+from scraper import TradingEconomicsScraper
+from timeutils import PARIS
+
+
+def timed(repeat, fn, *args):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn(*args)
+    return result, (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--weeks", type=int, default=4, help="semaines d'annonces en mémoire")
+    parser.add_argument("--rows", type=int, default=60, help="lignes par jour")
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    now = datetime.now(PARIS)
+    start = now.date()
+    end = start + timedelta(weeks=args.weeks)
+    events = TradingEconomicsScraper()._parse_html(
+        build_calendar_page(start=start, days=args.weeks * 7, rows_per_day=args.rows)
+    )
+    store = EventStore(events)
+    after_ts = now.timestamp()
+    week_end = now.date() + timedelta(days=7)
+
+    def scan_asset(asset, limit):
+        return list(islice((e for e in store.range(start, end) if e.timestamp >= after_ts and asset in e.assets), limit))
+
+    def scan_next(min_importance, limit):
+        return list(islice((e for e in store.range(start, end) if e.timestamp >= after_ts and e.importance >= min_importance), limit))
+
+    def scan_week(asset):
+        return [e for e in store.range(start, end) if after_ts <= e.timestamp < store._to_ts(week_end) and asset in e.assets]
+
+    queries = [
+        ("!asset ES", (scan_asset, "ES", 10), (store.upcoming, now, 10, "ES")),
+        ("!next 5 ⭐⭐⭐⭐⭐", (scan_next, 5, 5), (lambda: store.upcoming(now, 5, min_importance=5),)),
+        ("!week CL", (scan_week, "CL"), (store.range, now, week_end, None, None, "CL")),
+    ]
+
+    print(f"\n🔎 Requêtes sur {len(store)} annonces en mémoire ({args.weeks} semaines, moyenne de {args.repeat} appels)")
+    for label, (scan, *scan_args), (query, *query_args) in queries:
+        expected, before = timed(args.repeat, scan, *scan_args)
+        result, after = timed(args.repeat, query, *query_args)
+        assert [e.name for e in result] == [e.name for e in expected], label
+        print(f"   {label:16}: avant {before * 1e6:8.1f} µs | après {after * 1e6:6.1f} µs | x{before / after:.0f} ({len(result)} annonces)")
+
+    # Rafraîchissement: une seule annonce a changé (résultat publié)
+    changed = list(events)
+    changed[len(changed) // 2] = changed[len(changed) // 2].replace(actual="1.0%")
+
+    # Alterne version modifiée / originale: chaque appel a une annonce à remplacer
+    versions = cycle((changed, events))
+
+    def full(store):
+        for event in store.range(start, end):
+            store.remove(event)
+        store.extend(next(versions))
+
+    def incremental(store):
+        store.replace_range(start, end, next(versions))
+
+    repeat = max(2, args.repeat // 100)
+    _, before = timed(repeat, full, EventStore(events))
+    _, after = timed(repeat, incremental, EventStore(events))
+    print(f"\n🔄 Rafraîchissement (1 annonce modifiée sur {len(events)})")
+    print(f"   réindexation complète    : {before * 1000:7.2f} ms")
+    print(f"   mise à jour incrémentale : {after * 1000:7.2f} ms | x{before / after:.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Benchmark des annonces récurrentes: boucle jour par jour vs règles déclaratives
+
+Usage: python -m benchmarks.bench_recurring [--months 1 6 24] [--repeat 20]
+
+"avant" reproduit get_hardcoded_events: une boucle sur chaque jour de la
+plage, un test de jour de semaine et un appel is_trading_day par candidat,
+pour la seule règle EIA codée en dur. "après" expanse toutes les règles de
+recurring_events.json (dates candidates calculées par arithmétique
+d'ordinaux, décalages fériés en un appel TradingCalendar par règle), à froid
+puis depuis le cache par plage (exécutions hebdomadaire et quotidienne).
+"""
+import argparse
+import time
+from datetime import date, datetime, timedelta
+
+from config import RECURRING_FILE
+from models import EconomicEvent
+from recurring import RecurringCalendar
+from timeutils import NEW_YORK
+from trading_calendar import get_trading_calendar
+
+
+def hardcoded(start, days):
+    """Ancienne génération: un jour à la fois, une règle en dur"""
+    calendar = get_trading_calendar()
+    events = []
+    for i in range(days):
+        check_date = start + timedelta(days=i)
+        if check_date.weekday() == 2 and calendar.is_trading_day(check_date):
+            events.append(EconomicEvent.at(
+                datetime(check_date.year, check_date.month, check_date.day, 10, 30, tzinfo=NEW_YORK),
+                name='EIA Crude Oil Inventories',
+                country='US',
+                importance=4,
+                assets=('CL', 'ES', 'NQ', 'GC', 'BTC', 'ETH'),
+                description='US Energy Information Administration - Weekly Petroleum Status Report',
+                source='recurring'
+            ))
+    return events
+
+
+def timed(repeat, fn, *args):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn(*args)
+    return result, (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--months", type=int, nargs="+", default=[1, 6, 24])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    calendar = RecurringCalendar(RECURRING_FILE)
+    rules = calendar.rules
+    # Calendrier de bourse construit hors mesure (partagé par les deux variantes)
+    get_trading_calendar().is_trading_day(date.today())
+
+    print(f"\n🔁 Annonces récurrentes ({len(rules)} règles, moyenne de {args.repeat} appels)")
+    for months in args.months:
+        start = date.today()
+        days = months * 30
+        end = start + timedelta(days=days - 1)
+
+        old, before = timed(args.repeat, hardcoded, start, days)
+
+        def cold():
+            calendar._cache.clear()
+            return calendar.expand(start, end)
+
+        new, after = timed(args.repeat, cold)
+        eia = [e for e in new if e.name == 'EIA Crude Oil Inventories']
+        _, cached = timed(args.repeat * 100, calendar.expand, start, end)
+        print(
+            f"   {months:3} mois: avant {before * 1000:7.2f} ms ({len(old)} EIA) | "
+            f"après {after * 1000:6.2f} ms ({len(eia)} EIA, {len(new)} annonces, {after / len(rules) * 1000:.2f} ms/règle) | "
+            f"cache {cached * 1e6:5.1f} µs"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Benchmark de l'agrégation multi-sources: appels séquentiels vs parallèles sous échéance
+
+Usage: python -m benchmarks.bench_sources [--deadline 1.5] [--rows 40]
+
+Trois sources simulées (latences 0.2 s, 0.5 s, 0.8 s): "avant" les interroge
+l'une après l'autre, "après" passe par CalendarAggregator. Une quatrième
+source qui ne répond jamais est ensuite ajoutée: elle est coupée à
+l'échéance et les autres publient quand même. Mesure aussi la fusion avec
+doublons inter-sources (même annonce republiée 5 min plus tard).
+"""
+import argparse
+import asyncio
+import time
+from datetime import date, timedelta
+
+from benchmarks.fixtures import build_calendar_page
+from scraper import TradingEconomicsScraper
+from sources import CalendarAggregator, CalendarSource
+
+
+class FakeSource(CalendarSource):
+    """Source qui renvoie une liste fixe après une latence simulée"""
+
+    def __init__(self, name, events, latency):
+        self.name = name
+        self.events = [e.replace(source=name) for e in events]
+        self.latency = latency
+
+    async def fetch(self, start_date, end_date):
+        await asyncio.sleep(self.latency)
+        return self._in_range(self.events, start_date, end_date)
+
+
+async def run(args):
+    start = date.today()
+    end = start + timedelta(days=7)
+    events = TradingEconomicsScraper()._parse_html(
+        build_calendar_page(start=start, days=8, rows_per_day=args.rows)
+    )
+    # La source secondaire republie un tiers des annonces, décalées de 5 min (doublons flous)
+    shifted = [e.replace(timestamp=e.timestamp + 300) for e in events[::3]]
+
+    sources = [
+        FakeSource("tradingeconomics", events, 0.8),
+        FakeSource("recurring", events[:5], 0.2),
+        FakeSource("file", shifted, 0.5),
+    ]
+    hanging = FakeSource("hanging", events[:3], 3600)
+
+    began = time.perf_counter()
+    for source in sources:
+        await source.fetch(start, end)
+    before = time.perf_counter() - began
+
+    aggregator = CalendarAggregator(sources, deadline=args.deadline)
+    began = time.perf_counter()
+    merged, _ = await aggregator.fetch(start, end)
+    after = time.perf_counter() - began
+
+    degraded = CalendarAggregator(sources + [hanging], deadline=args.deadline)
+    began = time.perf_counter()
+    published, failed = await degraded.fetch(start, end)
+    with_hanging = time.perf_counter() - began
+
+    lists = [source._in_range(source.events, start, end) for source in sources]
+    began = time.perf_counter()
+    for _ in range(args.repeat):
+        aggregator.merge(lists)
+    merge_time = (time.perf_counter() - began) / args.repeat
+
+    print(f"🌐 {len(sources)} sources (latences {', '.join(f'{s.latency}s' for s in sources)})")
+    print(f"   avant : {before * 1000:8.1f} ms (somme des latences)")
+    print(f"   après : {after * 1000:8.1f} ms (source la plus lente)")
+    print(f"⚡ Gain: x{before / after:.1f}")
+    print(
+        f"⏱️ Avec une source bloquée: {with_hanging * 1000:.1f} ms (échéance {args.deadline}s), "
+        f"{len(published)} événements publiés, en échec: {', '.join(failed)}"
+    )
+    for name, report in degraded.last_report.items():
+        print(f"      {name:17} {report}")
+    print(f"🔀 Fusion: {sum(len(events) for events in lists)} → {len(merged)} événements en {merge_time * 1000:.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--deadline", type=float, default=1.5)
+    parser.add_argument("--rows", type=int, default=40, help="lignes par jour")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
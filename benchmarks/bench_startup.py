@@ -0,0 +1,107 @@
+"""Benchmark du démarrage du bot: imports, connexion au gateway, état prêt
+
+Usage: python -m benchmarks.bench_startup [--login 0.5] [--runs 5]
+
+Chaque mesure est faite dans un interpréteur neuf. "avant" reproduit
+l'ancien démarrage: schedulers (bs4, APScheduler, SQLite) importé avec
+main.py, puis connexion, puis préchauffage dans on_ready. "après" importe
+main.py seul, précharge schedulers dans un thread pendant la connexion et
+préchauffe en tâche de fond. La connexion au gateway est simulée par une
+attente de --login secondes. Mesure le temps avant de pouvoir se connecter
+et le temps jusqu'au scheduler démarré (semaine et jours fériés relus
+depuis un store SQLite rempli à l'avance).
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+
+def child(variant, login):
+    """Un démarrage (dans un sous-processus); affiche 'connexion_ms prêt_ms'"""
+    started = time.perf_counter()
+    if variant == "avant":
+        import main
+        import bs4
+        import schedulers
+        schedulers.sqlite_store._conn
+    else:
+        import main
+    can_login = time.perf_counter() - started
+
+    from benchmarks.fake_discord import FakeBot
+
+    async def run():
+        if variant == "après":
+            main.threading.Thread(target=main.preload, daemon=True).start()
+        await asyncio.sleep(login)
+        from schedulers import scheduler, scraper, start_scheduler
+        # Le premier rafraîchissement ne doit pas sortir sur le réseau
+        scraper.BASE_URL = "http://127.0.0.1:9/calendar"
+        await start_scheduler(FakeBot())
+        ready = time.perf_counter() - started
+        scheduler.shutdown(wait=False)
+        return ready
+
+    ready = asyncio.run(run())
+    print(f"{can_login * 1000:.1f} {ready * 1000:.1f}")
+
+
+def seed(path):
+    """Store SQLite avec la semaine courante (fixture busy_week décalée)"""
+    from benchmarks.fixtures import load_fixture
+    from scraper import TradingEconomicsScraper
+    from sqlite_store import SQLiteStore
+
+    events = TradingEconomicsScraper()._parse_html(load_fixture("busy_week"))
+    today = date.today()
+    shift = (today - date(2026, 11, 2)).days * 86400
+    store = SQLiteStore(path)
+    store.sync_range(today, today + timedelta(days=8), [e.replace(timestamp=e.timestamp + shift) for e in events])
+    store.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--login", type=float, default=0.5, help="durée simulée de la connexion au gateway (s)")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--child", choices=("avant", "après"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child, args.login)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, CHANNEL_ID="1", GUILD_ID="2", EVENTS_DB=os.path.join(tmp, "events.db"))
+        os.environ.update(env)
+        seed(env["EVENTS_DB"])
+
+        results = {}
+        for _ in range(args.runs):
+            for variant in ("avant", "après"):
+                output = subprocess.run(
+                    [sys.executable, "-m", "benchmarks.bench_startup", "--child", variant, "--login", str(args.login)],
+                    env=env, capture_output=True, text=True, check=True
+                ).stdout.split("\n")[-2]
+                results.setdefault(variant, []).append([float(value) for value in output.split()])
+
+    print(f"\n🚀 Démarrage ({args.runs} processus par variante, connexion simulée {args.login * 1000:.0f} ms, médianes)")
+    medians = {}
+    for variant, runs in results.items():
+        medians[variant] = [statistics.median(values) for values in zip(*runs)]
+        can_login, ready = medians[variant]
+        print(f"   {variant:5} : connexion possible après {can_login:7.1f} ms | scheduler prêt après {ready:7.1f} ms")
+    print(
+        f"⚡ Connexion lancée {medians['avant'][0] - medians['après'][0]:.0f} ms plus tôt, "
+        f"bot prêt {medians['avant'][1] - medians['après'][1]:.0f} ms plus tôt"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Benchmark du store SQLite: démarrage à chaud et écritures incrémentales
+
+Usage: python -m benchmarks.bench_store [--weeks 12] [--rows 40]
+
+Mesure le rechargement d'une semaine depuis le disque (démarrage à chaud),
+un premier sync_range (tout est écrit), un second sync identique (rien n'est
+réécrit) et un sync où une seule annonce a changé.
+"""
+import argparse
+import os
+import tempfile
+import time
+from datetime import date, timedelta
+
+from benchmarks.fixtures import build_calendar_page
+from scraper import TradingEconomicsScraper
+from sqlite_store import SQLiteStore
+
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--weeks", type=int, default=12, help="semaines de calendrier stockées")
+    parser.add_argument("--rows", type=int, default=40, help="lignes par jour")
+    args = parser.parse_args()
+
+    start = date.today()
+    end = start + timedelta(weeks=args.weeks)
+    content = build_calendar_page(start=start, days=args.weeks * 7, rows_per_day=args.rows)
+    events = TradingEconomicsScraper()._parse_html(content)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "events.db")
+        store = SQLiteStore(path)
+
+        (written, _), first = timed(store.sync_range, start, end, events)
+        (rewritten, _), same = timed(store.sync_range, start, end, events)
+
+        changed_events = list(events)
+        changed_events[len(changed_events) // 2] = changed_events[len(changed_events) // 2].replace(actual="1.0%")
+        (changed, _), one = timed(store.sync_range, start, end, changed_events)
+        store.close()
+
+        # Nouveau processus simulé: connexion neuve, lecture de la semaine courante
+        store = SQLiteStore(path)
+        # La connexion est ouverte au premier accès
+        _, opened = timed(lambda: store._conn)
+        week, load = timed(store.load_range, start, start + timedelta(days=8))
+        asset_week, asset_load = timed(store.load_range, start, start + timedelta(days=8), asset="ES")
+        store.close()
+
+    print(f"💾 {len(events)} annonces sur {args.weeks} semaines")
+    print(f"   premier sync       : {first * 1000:8.2f} ms ({written} écrites)")
+    print(f"   sync identique     : {same * 1000:8.2f} ms ({rewritten} écrites)")
+    print(f"   une annonce changée: {one * 1000:8.2f} ms ({changed} écrite)")
+    print(f"⚡ Démarrage à chaud: ouverture {opened * 1000:.2f} ms + semaine ({len(week)} annonces) {load * 1000:.2f} ms")
+    print(f"   filtre asset ES    : {asset_load * 1000:8.2f} ms ({len(asset_week)} annonces)")
+
+
+if __name__ == "__main__":
+    main()
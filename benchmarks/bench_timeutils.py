@@ -0,0 +1,120 @@
+"""Benchmark des conversions d'heure du parseur: strptime + ZoneInfo par ligne vs timeutils
+
+Usage: python -m benchmarks.bench_timeutils [--rows 5000] [--repeat 5]
+
+"avant" reproduit l'ancienne conversion (strptime de l'heure et de l'en-tête
+de date, datetime avec ZoneInfo("America/New_York") construit pour chaque
+ligne); "après" utilise parse_clock / parse_date_header mémoïsés et la table
+de décalages par date. Mesure la conversion seule sur les lignes de la
+fixture, puis le parsing complet de la page avec chacune des deux versions.
+"""
+import argparse
+import time
+from contextlib import contextmanager
+from datetime import date, datetime
+from zoneinfo import ZoneInfo
+
+import scraper
+from benchmarks.fixtures import build_calendar_page
+from scraper import CalendarRowExtractor, TradingEconomicsScraper
+from timeutils import local_timestamp, parse_clock, parse_date_header
+
+
+def legacy_parse_date(date_text):
+    if ',' in date_text:
+        date_text = date_text.split(',', 1)[1].strip()
+    return datetime.strptime(date_text, '%B %d, %Y')
+
+
+def legacy_parse_time(time_str):
+    time_str = time_str.strip()
+    if 'AM' in time_str or 'PM' in time_str:
+        time_obj = datetime.strptime(time_str, '%I:%M %p')
+        return time_obj.hour, time_obj.minute
+    if ':' in time_str:
+        parts = time_str.split(':')
+        return int(parts[0]), int(parts[1])
+    return 9, 0
+
+
+def legacy_timestamp(day, hour, minute):
+    return datetime(day.year, day.month, day.day, hour, minute, tzinfo=ZoneInfo("America/New_York")).timestamp()
+
+
+def legacy_convert(pairs):
+    return [
+        legacy_timestamp(legacy_parse_date(date_text), *legacy_parse_time(time_str))
+        for date_text, time_str in pairs
+    ]
+
+
+def cached_convert(pairs):
+    return [
+        local_timestamp(parse_date_header(date_text), *parse_clock(time_str))
+        for date_text, time_str in pairs
+    ]
+
+
+@contextmanager
+def legacy_scraper():
+    """Parseur complet avec l'ancienne conversion d'heure"""
+    saved = scraper.parse_clock, scraper.local_timestamp, scraper.parse_date_header
+    scraper.parse_clock, scraper.local_timestamp = legacy_parse_time, legacy_timestamp
+    scraper.parse_date_header = lambda text: legacy_parse_date(text).date()
+    try:
+        yield
+    finally:
+        scraper.parse_clock, scraper.local_timestamp, scraper.parse_date_header = saved
+
+
+def best_of(repeat, fn, *fn_args):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(*fn_args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=5000, help="lignes d'annonces dans la fixture")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    # Semaines de mars/avril: les changements d'heure US puis EU sont dans la plage
+    rows_per_day = 40
+    content = build_calendar_page(start=date(2026, 3, 2), days=-(-args.rows // rows_per_day), rows_per_day=rows_per_day)
+
+    pairs = []
+    current = None
+    for row in CalendarRowExtractor().iter_rows(content):
+        if 'date' in row.get('class', []):
+            current = row.find('td').get_text(strip=True)
+        elif current and 'calendar-row' in row.get('class', []):
+            time_str = row.find_all('td')[0].get_text(strip=True)
+            # Même normalisation que _parse_event_row
+            pairs.append((current, time_str if time_str not in ('', 'Tentative', 'All Day') else '09:00'))
+
+    before, expected = best_of(args.repeat, legacy_convert, pairs)
+    after, result = best_of(args.repeat, cached_convert, pairs)
+    assert result == expected, "conversion différente de l'ancienne"
+
+    page_scraper = TradingEconomicsScraper(parse_mode="stream")
+    with legacy_scraper():
+        page_before, events_before = best_of(args.repeat, page_scraper._parse_html, content)
+    page_after, events_after = best_of(args.repeat, page_scraper._parse_html, content)
+    assert events_before == events_after, "annonces différentes de l'ancienne conversion"
+
+    print(f"\n🕒 {len(pairs)} lignes ({len(set(t for _, t in pairs))} libellés d'heure distincts)")
+    print(f"   avant : {before * 1000:7.2f} ms ({before / len(pairs) * 1e6:.2f} µs/ligne)")
+    print(f"   après : {after * 1000:7.2f} ms ({after / len(pairs) * 1e6:.2f} µs/ligne)")
+    print(f"⚡ Gain conversion: x{before / after:.1f}")
+    print(
+        f"📄 Page complète ({len(events_after)} annonces retenues): "
+        f"{page_before * 1000:.1f} ms → {page_after * 1000:.1f} ms (x{page_before / page_after:.2f})"
+    )
+
+
+if __name__ == "__main__":
+    main()
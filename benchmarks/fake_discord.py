@@ -0,0 +1,173 @@
+"""Client Discord factice pour les benchmarks (aucun appel réseau)
+
+Reproduit la surface utilisée par le bot: bot.get_channel / get_guild,
+channel.send / get_partial_message, message.edit / delete, guild.fetch_scheduled_events / create_scheduled_event,
+event.edit / delete. Chaque appel est compté et peut simuler une latence
+(fixe + aléatoire); chaque message et Discord Event garde son heure de
+création (perf_counter).
+
+Rate-limits: route_limit=(appels, secondes) applique un bucket par route
+comme Discord (salon, events d'une guild), rate_limit_rate injecte des 429
+au hasard. Un appel refusé lève discord.HTTPException(429) avec l'en-tête
+Retry-After et ne modifie rien.
+"""
+import asyncio
+import itertools
+import random
+import time
+from collections import Counter
+import discord
+
+_ids = itertools.count(10_000)
+
+
+class FakeResponse:
+    """Réponse HTTP minimale pour construire les exceptions de discord.py"""
+
+    def __init__(self, status, reason, headers=None):
+        self.status = status
+        self.reason = reason
+        self.headers = headers or {}
+
+
+class FakeMessage:
+    def __init__(self, channel, content=None, embed=None):
+        self.id = next(_ids)
+        self.channel = channel
+        self.content = content
+        self.embed = embed
+        self.created_at = time.perf_counter()
+
+    async def edit(self, content=None, embed=None):
+        await self.channel.client._call("message.edit", self.channel.route)
+        self.content, self.embed = content, embed
+        return self
+
+    async def delete(self):
+        await self.channel.client._call("message.delete", self.channel.route)
+        if self in self.channel.messages:
+            self.channel.messages.remove(self)
+
+
+class FakeScheduledEvent:
+    def __init__(self, guild, **fields):
+        self.id = next(_ids)
+        self.guild = guild
+        self.name = fields.get('name')
+        self.description = fields.get('description')
+        self.start_time = fields.get('start_time')
+        self.end_time = fields.get('end_time')
+        self.location = fields.get('location')
+        self.created_at = time.perf_counter()
+
+    async def edit(self, **changes):
+        await self.guild.client._call("event.edit", self.guild.route)
+        for name, value in changes.items():
+            setattr(self, name, value)
+        return self
+
+    async def delete(self):
+        await self.guild.client._call("event.delete", self.guild.route)
+        self.guild.events.pop(self.id, None)
+
+
+class FakeChannel:
+    def __init__(self, client, channel_id):
+        self.client = client
+        self.id = channel_id
+        self.route = f"channel:{channel_id}"
+        self.messages = []
+
+    async def send(self, content=None, embed=None):
+        await self.client._call("channel.send", self.route)
+        message = FakeMessage(self, content, embed)
+        self.messages.append(message)
+        return message
+
+    def get_partial_message(self, message_id):
+        for message in self.messages:
+            if message.id == message_id:
+                return message
+        # Message d'une exécution précédente (ids relus du store)
+        message = FakeMessage(self)
+        message.id = message_id
+        return message
+
+
+class FakeGuild:
+    def __init__(self, client, guild_id):
+        self.client = client
+        self.id = guild_id
+        self.route = f"guild:{guild_id}:events"
+        self.events = {}
+
+    async def fetch_scheduled_events(self):
+        await self.client._call("guild.fetch_scheduled_events", self.route)
+        return list(self.events.values())
+
+    async def create_scheduled_event(self, **fields):
+        await self.client._call("guild.create_scheduled_event", self.route)
+        event = FakeScheduledEvent(self, **fields)
+        self.events[event.id] = event
+        return event
+
+
+class FakeBot:
+    """Bot factice: salons et guilds créés à la demande
+
+    latency / jitter: durée d'un appel, latency + uniforme(0, jitter) secondes.
+    route_limit: (appels, secondes) autorisés par route, None sans limite.
+    rate_limit_rate: proportion d'appels refusés au hasard (429, Retry-After
+    de retry_after secondes). seed rend l'injection reproductible.
+    """
+
+    def __init__(self, latency=0.0, jitter=0.0, route_limit=None, rate_limit_rate=0.0, retry_after=0.05, seed=None):
+        self.latency = latency
+        self.jitter = jitter
+        self.route_limit = route_limit
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self.calls = Counter()         # appels réussis par type
+        self.rate_limited = Counter()  # 429 renvoyés par type
+        self.durations = []            # durée de chaque appel, 429 compris
+        self._random = random.Random(seed)
+        self._windows = {}             # route -> (début de la fenêtre, appels acceptés)
+        self._channels = {}
+        self._guilds = {}
+
+    async def _call(self, name, route):
+        started = time.perf_counter()
+        await asyncio.sleep(self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0.0))
+        retry_after = self._throttle(route)
+        self.durations.append(time.perf_counter() - started)
+        if retry_after is not None:
+            self.rate_limited[name] += 1
+            response = FakeResponse(429, "Too Many Requests", {'Retry-After': f"{retry_after:.3f}"})
+            raise discord.HTTPException(response, {'message': "You are being rate limited.", 'code': 0})
+        self.calls[name] += 1
+
+    def _throttle(self, route):
+        """Retry-After (s) si l'appel est refusé, None s'il est accepté"""
+        if self.rate_limit_rate and self._random.random() < self.rate_limit_rate:
+            return self.retry_after
+        if self.route_limit is None:
+            return None
+        limit, per = self.route_limit
+        now = time.monotonic()
+        window_start, count = self._windows.get(route, (now, 0))
+        if now - window_start >= per:
+            window_start, count = now, 0
+        if count >= limit:
+            return window_start + per - now
+        self._windows[route] = (window_start, count + 1)
+        return None
+
+    def get_channel(self, channel_id):
+        if channel_id not in self._channels:
+            self._channels[channel_id] = FakeChannel(self, channel_id)
+        return self._channels[channel_id]
+
+    def get_guild(self, guild_id):
+        if guild_id not in self._guilds:
+            self._guilds[guild_id] = FakeGuild(self, guild_id)
+        return self._guilds[guild_id]
@@ -0,0 +1,89 @@
+"""Pages calendrier TradingEconomics synthétiques (générateur déterministe) et fixtures figées (hors ligne)"""
+import gzip
+import random
+from datetime import date, timedelta
+from pathlib import Path
+
+DATA = Path(__file__).parent / "data"
+
+EVENT_NAMES = [
+    "Core Inflation Rate MoM", "Inflation Rate YoY", "CPI s.a", "Core CPI YoY",
+    "Non Farm Payrolls", "Initial Jobless Claims", "Unemployment Rate",
+    "Fed Interest Rate Decision", "FOMC Minutes", "ECB Interest Rate Decision",
+    "BoE Interest Rate Decision", "GDP Growth Rate QoQ", "Retail Sales MoM",
+    "ISM Manufacturing PMI", "PPI MoM", "Core PCE Price Index MoM",
+    "Building Permits", "Crude Oil Inventories", "Consumer Confidence",
+    "Michigan Consumer Sentiment", "Balance of Trade", "Existing Home Sales",
+    "S&P Global Manufacturing PMI", "ZEW Economic Sentiment Index",
+    "BoJ Interest Rate Decision", "Producer Price Index", "Fed Chair Speech",
+    "Gross Domestic Product", "Personal Consumption Expenditures", "Housing Starts",
+]
+
+COUNTRIES = ["United States", "Euro Area", "United Kingdom", "Japan", "Germany", "China"]
+
+TIMES = ["All Day", "Tentative"] + [
+    f"{(h - 1) % 12 + 1:02d}:{m:02d} {'AM' if h < 12 else 'PM'}"
+    for h in range(24) for m in (0, 15, 30, 45)
+]
+
+PAGE_HEAD = """<!DOCTYPE html><html><head><title>Economic Calendar</title>
+<link rel="stylesheet" href="/css/site.css"></head><body>
+<nav class="navbar">{nav}</nav><div id="ad-top">{ads}</div>
+<div class="container"><table id="calendar" class="table table-hover"><thead>
+<tr><th>Time</th><th>Country</th><th>Event</th><th>Importance</th><th>Actual</th>
+<th>Previous</th><th>Consensus</th><th>Forecast</th></tr></thead><tbody>
+"""
+
+PAGE_TAIL = """</tbody></table></div><footer>{nav}</footer>{scripts}</body></html>"""
+
+
+def _padding(rng, size):
+    """Contenu hors calendrier (menus, pubs, scripts) pour un poids réaliste"""
+    nav = "".join(f'<li><a href="/c/{i}">Country {i}</a><ul><li><a href="/c/{i}/x">Indicator</a></li></ul></li>'
+                  for i in range(size // 2))
+    ads = "".join(f'<div class="ad"><img src="/ads/{i}.png" alt="ad"><span>Sponsored {i}</span></div>'
+                  for i in range(size // 8))
+    scripts = "".join(f"<script>var cfg{i} = {{'k': {rng.random():.6f}, 'data': [{','.join(str(j) for j in range(40))}]}};</script>"
+                      for i in range(size // 4))
+    return f"<ul>{nav}</ul>", ads, scripts
+
+
+def build_calendar_page(start=date(2026, 10, 19), days=7, rows_per_day=40, padding=400, seed=42):
+    """Construit une page HTML au format attendu par TradingEconomicsScraper"""
+    rng = random.Random(seed)
+    nav, ads, scripts = _padding(rng, padding)
+    parts = [PAGE_HEAD.format(nav=nav, ads=ads)]
+    row_id = 100000
+
+    for offset in range(days):
+        day = start + timedelta(days=offset)
+        parts.append(f'<tr class="date"><td colspan="8">{day.strftime("%A, %B %d, %Y")}</td></tr>\n')
+        for _ in range(rows_per_day):
+            row_id += 1
+            name = rng.choice(EVENT_NAMES)
+            country = rng.choice(COUNTRIES)
+            importance = rng.choice((1, 1, 2, 2, 3))
+            actual = f"{rng.uniform(-1, 5):.1f}%" if rng.random() < 0.5 else ""
+            parts.append(
+                f'<tr data-id="{row_id}" data-country="{country.lower()}" data-event="{name.lower()}" class="calendar-row">'
+                f'<td><span class="calendar-date-{importance}">{rng.choice(TIMES)}</span></td>'
+                f'<td class="calendar-iso">{country}</td>'
+                f'<td><a class="calendar-event" href="/e/{row_id}">{name}</a></td>'
+                f'<td class="calendar-importance-{importance}"></td>'
+                f'<td><span id="actual">{actual}</span></td>'
+                f'<td><span id="previous">{rng.uniform(-1, 5):.1f}%</span></td>'
+                f'<td><a id="consensus">{rng.uniform(-1, 5):.1f}%</a></td>'
+                f'<td><a id="forecast">{rng.uniform(-1, 5):.1f}%</a></td></tr>\n'
+            )
+
+    parts.append(PAGE_TAIL.format(nav=nav, scripts=scripts))
+    return "".join(parts).encode("utf-8")
+
+
+def fixture_path(name):
+    """Page figée par benchmarks.suite --record (synthétique, ou réelle avec --live)"""
+    return DATA / f"calendar_{name}.html.gz"
+
+
+def load_fixture(name):
+    return gzip.decompress(fixture_path(name).read_bytes())
@@ -0,0 +1,256 @@
+"""Suite de benchmarks du pipeline: téléchargement → parsing → embed agenda → Discord Events
+
+Usage:
+    python -m benchmarks.suite                  # mesure et compare à benchmarks/baseline.json
+    python -m benchmarks.suite --save-baseline  # enregistre les mesures comme nouvelle référence
+    python -m benchmarks.suite --record [--live]
+
+Tout tourne hors ligne: les pages calendrier sont des fixtures figées
+(benchmarks/data/*.html.gz) servies par un serveur HTTP local, et les appels
+Discord passent par un client factice. Les fixtures livrées sont des pages
+synthétiques au format TradingEconomics (build_calendar_page, graine fixe),
+pas des captures du site: --record les régénère, --record --live les
+remplace par les pages réelles téléchargées.
+
+Chaque étape est mesurée séparément: temps (meilleure de --repeat exécutions),
+mémoire allouée et conservée après l'étape, pic mémoire (tracemalloc). Une
+étape plus lente (--time-tolerance, large: les temps dépendent de la
+machine) ou plus gourmande (--memory-tolerance, le pic est reproductible)
+que la référence est une régression: la commande sort en erreur.
+"""
+import argparse
+import asyncio
+import contextlib
+import gc
+import gzip
+import http.server
+import io
+import json
+import os
+import platform
+import sys
+import threading
+import time
+import tracemalloc
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+# schedulers lit la configuration à l'import: aucun store sur disque pendant la suite
+os.environ.setdefault("CHANNEL_ID", "1")
+os.environ.setdefault("GUILD_ID", "2")
+os.environ["EVENTS_DB"] = ":memory:"
+
+import schedulers
+from benchmarks.fake_discord import FakeBot
+from benchmarks.fixtures import DATA, build_calendar_page, fixture_path, load_fixture
+from discord_events import DiscordEventManager
+from scraper import TradingEconomicsScraper
+from timeutils import UTC
+
+BASELINE = Path(__file__).parent / "baseline.json"
+
+# nom -> (premier jour, nombre de jours, lignes par jour pour les pages synthétiques)
+FIXTURES = {
+    "small_week": (date(2026, 10, 19), 7, 12),
+    "busy_week": (date(2026, 11, 2), 7, 60),
+    "three_months": (date(2026, 9, 7), 91, 40),
+}
+
+STAGES = ("fetch", "parse", "render", "discord")
+
+# En dessous de ces écarts absolus, une variation est du bruit de mesure
+MIN_TIME_DELTA_MS = 1.0
+MIN_MEMORY_DELTA_KB = 64
+
+
+def record(live):
+    """Régénère les fixtures (pages synthétiques déterministes, ou site réel avec live)"""
+    DATA.mkdir(exist_ok=True)
+    scraper = TradingEconomicsScraper()
+    for name, (start, days, rows_per_day) in FIXTURES.items():
+        end = start + timedelta(days=days - 1)
+        if live:
+            _, content, _ = asyncio.run(_fetch_live(scraper, start, end))
+        else:
+            content = build_calendar_page(start=start, days=days, rows_per_day=rows_per_day)
+        fixture_path(name).write_bytes(gzip.compress(content, 9, mtime=0))
+        print(f"💾 {name}: {start} → {end}, {len(content) / 1024:.0f} Ko")
+
+
+async def _fetch_live(scraper, start, end):
+    try:
+        return await scraper.fetch_conditional(scraper._range_params(start, end))
+    finally:
+        await scraper.close()
+
+
+def serve(pages):
+    """Serveur calendrier local: page servie selon le paramètre d1"""
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            content = pages[parse_qs(urlparse(self.path).query)['d1'][0]]
+            self.send_response(200)
+            self.send_header('Content-Length', str(len(content)))
+            self.end_headers()
+            self.wfile.write(content)
+
+        def log_message(self, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}/calendar"
+
+
+def measure(fn, repeat):
+    """(résultat, métriques) d'une étape: meilleur temps, mémoire conservée, pic
+
+    La mémoire est mesurée sur une exécution séparée, tracemalloc faussant
+    les temps.
+    """
+    times = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(repeat):
+            gc.collect()
+            start = time.perf_counter()
+            result = fn()
+            times.append(time.perf_counter() - start)
+        del result
+
+        gc.collect()
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        result = fn()
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    return result, {
+        'time_ms': round(min(times) * 1000, 3),
+        'alloc_kb': round((current - before) / 1024, 1),
+        'peak_kb': round((peak - before) / 1024, 1),
+    }
+
+
+def rebase(events, start):
+    """Décale les annonces d'un nombre entier de semaines pour qu'elles soient à venir
+
+    Les fixtures ont des dates fixes; la synchro Discord ignore le passé.
+    """
+    elapsed = time.time() - datetime(start.year, start.month, start.day, tzinfo=UTC).timestamp()
+    weeks = max(0, -(-int(elapsed) // (7 * 86400)) + 1)
+    shift = weeks * 7 * 86400
+    return [e.replace(timestamp=e.timestamp + shift) for e in events], start + timedelta(weeks=weeks)
+
+
+def run_fixture(name, url, repeat):
+    start, days, _ = FIXTURES[name]
+    end = start + timedelta(days=days - 1)
+    params = TradingEconomicsScraper._range_params(start, end)
+    scraper = TradingEconomicsScraper()
+    scraper.BASE_URL = url
+    metrics = {}
+
+    async def fetch():
+        try:
+            return (await scraper.fetch_conditional(params))[1]
+        finally:
+            await scraper.close()
+
+    content, metrics['fetch'] = measure(lambda: asyncio.run(fetch()), repeat)
+    events, metrics['parse'] = measure(lambda: scraper._parse_html(content), repeat)
+
+    events, first_day = rebase(events, start)
+    last_day = first_day + timedelta(days=days)
+    schedulers.event_store.replace_range(first_day, last_day, events)
+    def render():
+        # Rendu complet: sans le cache par empreinte
+        schedulers.render_cache.clear()
+        return schedulers.build_weekly_pages(first_day, last_day)
+
+    _, metrics['render'] = measure(render, repeat)
+
+    guild_id = int(os.environ["GUILD_ID"])
+    _, metrics['discord'] = measure(
+        lambda: asyncio.run(DiscordEventManager.create_events_for_week(FakeBot(), guild_id, events)),
+        repeat
+    )
+    return len(content), len(events), metrics
+
+
+def compare(results, baseline, time_tolerance, memory_tolerance):
+    """Affiche les mesures et retourne la liste des régressions"""
+    regressions = []
+    for name, (size, count, metrics) in results.items():
+        print(f"\n📦 {name}: {size / 1024:.0f} Ko, {count} annonces")
+        for stage in STAGES:
+            current = metrics[stage]
+            reference = baseline.get(name, {}).get(stage)
+            line = (
+                f"   {stage:8}: {current['time_ms']:9.2f} ms | conservé {current['alloc_kb']:8.1f} Ko "
+                f"| pic {current['peak_kb']:9.1f} Ko"
+            )
+            if reference:
+                ratio = current['time_ms'] / reference['time_ms'] - 1 if reference['time_ms'] else 0
+                line += f" | temps {ratio:+.0%} vs référence"
+                if (current['time_ms'] > reference['time_ms'] * (1 + time_tolerance)
+                        and current['time_ms'] - reference['time_ms'] > MIN_TIME_DELTA_MS):
+                    regressions.append(f"{name}/{stage}: {reference['time_ms']:.2f} → {current['time_ms']:.2f} ms")
+                if (current['peak_kb'] > reference['peak_kb'] * (1 + memory_tolerance)
+                        and current['peak_kb'] - reference['peak_kb'] > MIN_MEMORY_DELTA_KB):
+                    regressions.append(f"{name}/{stage}: pic {reference['peak_kb']:.0f} → {current['peak_kb']:.0f} Ko")
+            print(line)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--time-tolerance", type=float, default=1.0, help="lenteur admise vs référence (1.0 = x2)")
+    parser.add_argument("--memory-tolerance", type=float, default=0.25, help="pic mémoire admis vs référence (0.25 = +25%%)")
+    parser.add_argument("--only", choices=list(FIXTURES), action="append", help="fixture(s) à mesurer")
+    parser.add_argument("--save-baseline", action="store_true", help="enregistre les mesures comme référence")
+    parser.add_argument("--record", action="store_true", help="régénère les fixtures puis quitte")
+    parser.add_argument("--live", action="store_true", help="avec --record: télécharge les pages réelles")
+    args = parser.parse_args(argv)
+
+    if args.record:
+        record(args.live)
+        return 0
+
+    names = args.only or list(FIXTURES)
+    pages = {FIXTURES[name][0].isoformat(): load_fixture(name) for name in names}
+    server, url = serve(pages)
+    try:
+        results = {name: run_fixture(name, url, args.repeat) for name in names}
+    finally:
+        server.shutdown()
+
+    baseline = json.loads(BASELINE.read_text()) if BASELINE.exists() else {}
+    regressions = compare(results, baseline.get('fixtures', {}), args.time_tolerance, args.memory_tolerance)
+
+    if args.save_baseline:
+        saved = baseline.get('fixtures', {})
+        saved.update({name: metrics for name, (_, _, metrics) in results.items()})
+        BASELINE.write_text(json.dumps({
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'fixtures': saved,
+        }, indent=2, sort_keys=True) + "\n")
+        print(f"\n💾 Référence enregistrée dans {BASELINE}")
+        return 0
+
+    if not baseline:
+        print("\nℹ️ Pas de référence: lancer avec --save-baseline pour en créer une")
+        return 0
+    if regressions:
+        print(f"\n❌ {len(regressions)} régression(s) vs {BASELINE.name}:")
+        for regression in regressions:
+            print(f"   • {regression}")
+        return 1
+    print(f"\n✅ Aucune régression (tolérances: temps +{args.time_tolerance:.0%}, mémoire +{args.memory_tolerance:.0%})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
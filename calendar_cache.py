@@ -0,0 +1,217 @@
+import asyncio
+import time
+import aiohttp
+
+class CalendarUnavailable(Exception):
+    """Upstream en échec (ou circuit ouvert) et aucune donnée, même périmée, à servir"""
+
+class CircuitBreaker:
+    """Coupe-circuit devant TradingEconomics
+
+    Après failure_threshold échecs consécutifs le circuit s'ouvre: plus aucune
+    requête pendant reset_timeout secondes. Ensuite une seule requête d'essai
+    passe (semi-ouvert); un nouvel échec rouvre le circuit pour une durée
+    doublée, plafonnée à max_timeout.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half-open"
+
+    def __init__(self, failure_threshold=3, reset_timeout=60, max_timeout=900):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.max_timeout = max_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.open_for = reset_timeout
+        self.rejected = 0
+
+    def allow(self):
+        """True si une requête peut partir maintenant"""
+        if self.state == self.CLOSED:
+            return True
+        if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.open_for:
+            self.state = self.HALF_OPEN
+            return True
+        self.rejected += 1
+        return False
+
+    def record_success(self):
+        self.state = self.CLOSED
+        self.failures = 0
+        self.open_for = self.reset_timeout
+
+    def record_failure(self):
+        self.failures += 1
+        if self.state == self.HALF_OPEN:
+            self.open_for = min(self.open_for * 2, self.max_timeout)
+        elif self.failures < self.failure_threshold:
+            return
+        if self.state != self.OPEN:
+            print(f"🔌 Circuit TradingEconomics ouvert pour {self.open_for:.0f}s ({self.failures} échecs)")
+        self.state = self.OPEN
+        self.opened_at = time.monotonic()
+
+    def retry_in(self):
+        """Secondes avant la prochaine requête d'essai (0 si le circuit est fermé)"""
+        if self.state != self.OPEN:
+            return 0.0
+        return max(0.0, self.open_for - (time.monotonic() - self.opened_at))
+
+class _Entry:
+    __slots__ = ('fetched_at', 'events', 'validators')
+
+    def __init__(self, fetched_at, events, validators=None):
+        self.fetched_at = fetched_at
+        self.events = events
+        self.validators = validators or {}
+
+class CalendarCache:
+    """Cache TTL partagé devant TradingEconomicsScraper
+
+    Les entrées sont indexées par plage de dates (d1, d2). Une plage plus
+    étroite (days_ahead=1) est servie depuis une plage plus large déjà en
+    cache (days_ahead=7), et les appels concurrents sur une même plage
+    attendent un seul fetch.
+
+    Une entrée expirée (mais de moins de max_stale secondes) est servie
+    immédiatement pendant qu'une revalidation conditionnelle (ETag /
+    Last-Modified) tourne en arrière-plan: un 304 prolonge l'entrée sans
+    reparser. Les échecs successifs ouvrent un coupe-circuit.
+    """
+
+    def __init__(self, scraper, ttl=900, max_stale=86400, breaker=None):
+        self.scraper = scraper
+        self.ttl = ttl
+        self.max_stale = max_stale
+        self.breaker = breaker or CircuitBreaker()
+        self._entries = {}   # (d1, d2) -> _Entry
+        self._inflight = {}  # (d1, d2) -> asyncio.Task
+        self.healthy = True  # dernier fetch réussi ?
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.not_modified = 0
+        self.errors = 0
+
+    async def get_calendar_events(self, days_ahead=7):
+        """Équivalent caché de scraper.get_calendar_events_async"""
+        start_date, end_date = self.scraper.get_date_range(days_ahead)
+        return await self.get_range(start_date, end_date)
+
+    async def get_range(self, start_date, end_date):
+        """Retourne les événements de [start_date, end_date] (cache, périmé ou fetch)
+
+        Lève CalendarUnavailable si upstream échoue et qu'aucune donnée n'est en cache.
+        """
+        now = time.monotonic()
+        self._purge(now)
+
+        stale = None
+        for key, entry in self._entries.items():
+            d1, d2 = key
+            if d1 <= start_date and end_date <= d2:
+                if now - entry.fetched_at < self.ttl:
+                    self.hits += 1
+                    return self._slice(entry.events, start_date, end_date)
+                if stale is None or entry.fetched_at > stale[1].fetched_at:
+                    stale = (key, entry)
+
+        if stale is not None:
+            # Stale-while-revalidate: réponse immédiate, rafraîchissement en tâche de fond
+            self.stale_hits += 1
+            key, entry = stale
+            if key not in self._inflight:
+                self._start_fetch(key, entry)
+            return self._slice(entry.events, start_date, end_date)
+
+        for (d1, d2), task in self._inflight.items():
+            if d1 <= start_date and end_date <= d2:
+                self.coalesced += 1
+                events = await asyncio.shield(task)
+                return self._slice(events, start_date, end_date)
+
+        self.misses += 1
+        events = await asyncio.shield(self._start_fetch((start_date, end_date), None))
+        return self._slice(events, start_date, end_date)
+
+    def _start_fetch(self, key, entry):
+        """Lance (une seule fois par plage) le fetch conditionnel d'une plage"""
+        task = asyncio.ensure_future(self._fetch(key, entry))
+        self._inflight[key] = task
+        task.add_done_callback(lambda t, key=key: self._done(key, t))
+        return task
+
+    def _done(self, key, task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            task.exception()  # déjà journalisée dans _fetch; évite "exception never retrieved"
+
+    async def _fetch(self, key, entry):
+        if not self.breaker.allow():
+            self.healthy = False
+            raise CalendarUnavailable(f"circuit ouvert, nouvel essai dans {self.breaker.retry_in():.0f}s")
+
+        start_date, end_date = key
+        try:
+            events, validators = await self.scraper.fetch_range_conditional(
+                start_date, end_date, entry.validators if entry else None
+            )
+        except Exception as e:
+            self.errors += 1
+            self.healthy = False
+            self.breaker.record_failure()
+            reason = f"HTTP {e.status}" if isinstance(e, aiohttp.ClientResponseError) else repr(e)
+            print(f"❌ Erreur scraping TradingEconomics: {reason}")
+            raise CalendarUnavailable(reason) from e
+
+        self.breaker.record_success()
+        self.healthy = True
+
+        if events is None:
+            # 304: la page n'a pas changé, pas de parsing
+            self.not_modified += 1
+            entry.fetched_at = time.monotonic()
+            return entry.events
+
+        # Un résultat vide n'écrase pas une entrée connue (page sans table, mise en page cassée)
+        if events or entry is None:
+            self._entries[key] = _Entry(time.monotonic(), events, validators)
+        return events
+
+    def seed(self, start_date, end_date, events, age=0.0):
+        """Pré-remplit une plage (ex: relue depuis le disque), vieille de age secondes"""
+        if events and age < self.max_stale:
+            self._entries[(start_date, end_date)] = _Entry(time.monotonic() - age, list(events))
+
+    def invalidate(self):
+        """Vide le cache (les fetchs en cours ne sont pas annulés)"""
+        self._entries.clear()
+
+    def stats(self):
+        """Compteurs hit/miss pour vérifier la baisse du trafic upstream"""
+        total = self.hits + self.stale_hits + self.misses + self.coalesced
+        return {
+            'hits': self.hits,
+            'stale_hits': self.stale_hits,
+            'misses': self.misses,
+            'coalesced': self.coalesced,
+            'not_modified': self.not_modified,
+            'errors': self.errors,
+            'circuit': self.breaker.state,
+            'hit_rate': (self.hits + self.stale_hits + self.coalesced) / total if total else 0.0,
+            'entries': len(self._entries)
+        }
+
+    def _purge(self, now):
+        """Supprime les entrées trop vieilles pour être servies, même périmées"""
+        expired = [key for key, entry in self._entries.items() if now - entry.fetched_at >= self.max_stale]
+        for key in expired:
+            del self._entries[key]
+
+    @staticmethod
+    def _slice(events, start_date, end_date):
+        """Restreint les événements (date de Paris) à la plage demandée"""
+        return [e for e in events if start_date <= e.datetime.date() <= end_date]
@@ -0,0 +1,135 @@
+"""Classification des événements économiques en une seule passe
+
+Toutes les tables de mots-clés sont compilées une fois à l'import dans un
+automate Aho-Corasick. Un nom d'événement est parcouru une seule fois pour
+obtenir la pertinence, le nom simplifié et les assets affectés.
+
+Ajouter un indicateur = ajouter une ligne dans les tables ci-dessous.
+"""
+from collections import deque, namedtuple
+from functools import lru_cache
+
+# Mots-clés qui rendent un événement pertinent
+RELEVANT_KEYWORDS = (
+    # Taux d'intérêt
+    'interest rate', 'fomc', 'fed funds', 'federal reserve',
+    # Inflation
+    'cpi', 'consumer price', 'inflation',
+    'ppi', 'producer price',
+    'pce', 'personal consumption',
+    'core cpi', 'core inflation',
+    # Banques centrales
+    'ecb', 'european central bank',
+    'boe', 'bank of england',
+    # Croissance
+    'gdp', 'gross domestic',
+    # Emploi
+    'non farm', 'payroll', 'nfp',
+    'unemployment', 'jobless',
+    # Ventes
+    'retail sales',
+    # PMI manufacturier
+    'ism manufacturing', 'pmi manufacturing',
+)
+
+# Noms simplifiés: la première règle dont un mot-clé apparaît gagne
+NAME_RULES = (
+    (('non farm', 'payroll', 'nfp'), "NFP - Non-Farm Payroll"),
+    (('interest rate', 'fed funds', 'fomc'), "Fed Decision - Taux directeurs"),
+    # Core CPI avant CPI général
+    (('core cpi',), "Core CPI - Inflation sous-jacente USA"),
+    (('cpi', 'consumer price'), "CPI - Inflation USA"),
+    (('ppi', 'producer price'), "PPI - Prix à la production USA"),
+    (('pce', 'personal consumption'), "PCE - Indice préféré de la Fed"),
+    (('retail sales',), "Retail Sales - Ventes au détail USA"),
+    (('unemployment', 'jobless'), "Unemployment - Taux de chômage USA"),
+    (('ecb',), "ECB Decision - Taux BCE"),
+    (('boe', 'bank of england'), "BoE Decision - Taux BoE"),
+    (('gdp',), "GDP - Croissance USA"),
+    (('ism manufacturing', 'pmi manufacturing'), "ISM/PMI Manufacturing - Activité industrielle"),
+)
+
+# Assets affectés: la première règle dont un mot-clé apparaît gagne
+ASSET_RULES = (
+    (('fed', 'fomc', 'interest rate'), ("ES", "NQ", "GC", "6E", "CL", "BTC", "ETH")),
+    (('cpi', 'inflation', 'ppi', 'pce', 'core'), ("ES", "NQ", "GC", "6E", "BTC", "ETH")),
+    (('ecb',), ("6E", "ES", "NQ", "GC")),
+    (('boe', 'bank of england'), ("6B", "ES", "NQ", "GC")),
+    (('gdp',), ("ES", "NQ", "6E")),
+    (('non farm', 'payroll', 'nfp', 'unemployment', 'jobless'), ("ES", "NQ", "GC", "6E", "CL", "BTC", "ETH")),
+    (('retail sales',), ("ES", "NQ", "6E", "BTC", "ETH")),
+    (('ism', 'pmi'), ("ES", "NQ", "GC")),
+)
+
+DEFAULT_ASSETS = ("ES", "NQ")
+
+Classification = namedtuple('Classification', ['relevant', 'name', 'assets'])
+
+class _KeywordAutomaton:
+    """Automate Aho-Corasick: toutes les occurrences (chevauchantes) en une passe"""
+
+    def __init__(self, keywords):
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [()]
+
+        for keyword in keywords:
+            state = 0
+            for char in keyword:
+                if char not in self._goto[state]:
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(())
+                    self._goto[state][char] = len(self._goto) - 1
+                state = self._goto[state][char]
+            self._out[state] += (keyword,)
+
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[nxt] = self._goto[fallback].get(char, 0)
+                self._out[nxt] += self._out[self._fail[nxt]]
+
+    def find_all(self, text):
+        """Retourne l'ensemble des mots-clés présents dans text"""
+        goto, fail, out = self._goto, self._fail, self._out
+        found = set()
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if out[state]:
+                found.update(out[state])
+        return found
+
+def _compile_rules(rules):
+    return tuple((frozenset(keywords), value) for keywords, value in rules)
+
+_RELEVANT = frozenset(RELEVANT_KEYWORDS)
+_NAME_RULES = _compile_rules(NAME_RULES)
+_ASSET_RULES = _compile_rules(ASSET_RULES)
+_AUTOMATON = _KeywordAutomaton(
+    _RELEVANT.union(*(k for k, _ in _NAME_RULES), *(k for k, _ in _ASSET_RULES))
+)
+
+def _first_match(rules, found, default):
+    for keywords, value in rules:
+        if not keywords.isdisjoint(found):
+            return value
+    return default
+
+@lru_cache(maxsize=4096)
+def classify(event_name):
+    """Retourne (pertinent, nom simplifié, assets) pour un nom brut d'événement"""
+    found = _AUTOMATON.find_all(event_name.lower())
+    return Classification(
+        relevant=not _RELEVANT.isdisjoint(found),
+        name=_first_match(_NAME_RULES, found, event_name),
+        assets=_first_match(_ASSET_RULES, found, DEFAULT_ASSETS)
+    )
@@ -5,8 +5,33 @@ load_dotenv()
 
 # Discord Configuration
 DISCORD_TOKEN = os.getenv("DISCORD_TOKEN")
-CHANNEL_ID = int(os.getenv("CHANNEL_ID"))
-GUILD_ID = int(os.getenv("GUILD_ID"))
+# Salon par défaut: premier abonnement créé si aucun n'est enregistré (!subscribe pour les autres)
+CHANNEL_ID = int(os.getenv("CHANNEL_ID") or 0) or None
+GUILD_ID = int(os.getenv("GUILD_ID") or 0) or None
 
 # Timezone
 TIMEZONE = "Europe/Paris"
+
+# Cache du calendrier (secondes)
+CALENDAR_CACHE_TTL = int(os.getenv("CALENDAR_CACHE_TTL", "900"))
+
+# File de publication Discord (appels simultanés)
+PUBLISH_CONCURRENCY = int(os.getenv("PUBLISH_CONCURRENCY", "4"))
+
+# Publication en direct des résultats (actual vs consensus)
+LIVE_RELEASES = os.getenv("LIVE_RELEASES", "0") == "1"
+
+# Store SQLite (annonces, jours fériés, Discord Events) relu au démarrage
+EVENTS_DB = os.getenv("EVENTS_DB", "events.db")
+# Annonces passées conservées sur disque (jours)
+EVENTS_RETENTION_DAYS = int(os.getenv("EVENTS_RETENTION_DAYS", "30"))
+
+# Sources de calendrier: fichier local optionnel (JSON ou .ics) et échéance commune (secondes)
+CALENDAR_FILE = os.getenv("CALENDAR_FILE") or None
+# Règles des annonces récurrentes (EIA, API...), voir recurring.py
+RECURRING_FILE = os.getenv("RECURRING_FILE") or os.path.join(os.path.dirname(os.path.abspath(__file__)), "recurring_events.json")
+SOURCES_DEADLINE = float(os.getenv("SOURCES_DEADLINE", "15"))
+
+# Durées par étape (!perf) et endpoint HTTP local optionnel (127.0.0.1:METRICS_PORT/metrics)
+PERF_METRICS = os.getenv("PERF_METRICS", "1") == "1"
+METRICS_PORT = int(os.getenv("METRICS_PORT") or 0) or None
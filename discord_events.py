@@ -1,65 +1,180 @@
+import asyncio
+import hashlib
+import re
 import discord
 from datetime import datetime, timedelta
-from zoneinfo import ZoneInfo
+from publish_queue import publish_queue
+from timeutils import PARIS
+
+# Identifiant stable glissé en fin de description de chaque Discord Event
+EVENT_ID_PATTERN = re.compile(r"\[id:([^\]]+)\]")
+
+# Events créés avant l'ajout des identifiants (supprimés au premier sync)
+LEGACY_KEYWORDS = ["nfp", "cpi", "fed", "ecb", "oil", "earnings"]
 
 class DiscordEventManager:
-    
+
+    @staticmethod
+    def event_key(event_data):
+        """Identifiant stable d'une publication: source, date, pays, nom canonique, publication d'origine
+
+        Le pays sépare les homonymes (CPI US / zone euro), la publication
+        d'origine les releases d'un même nom canonique (CPI MoM / YoY): data-id
+        TradingEconomics, sinon empreinte courte du libellé brut.
+        """
+        release = event_data.row_id or hashlib.sha1(event_data.release_id.encode()).hexdigest()[:8]
+        return ":".join((
+            event_data.source,
+            event_data.datetime.date().isoformat(),
+            event_data.country,
+            event_data.name,
+            release
+        ))
+
+    @staticmethod
+    def _event_fields(event_data):
+        """Champs du Discord Event attendus pour une annonce"""
+        start_time = event_data.datetime
+        return {
+            'name': f"{event_data.flag} {event_data.name}",
+            'description': (
+                f"**Importance:** {event_data.stars}\n"
+                f"**Heure:** {event_data.time_paris} (Paris)\n"
+                f"**Assets concernés:** {', '.join(event_data.assets)}\n\n"
+                f"{event_data.description}\n\n"
+                f"[id:{DiscordEventManager.event_key(event_data)}]"
+            ),
+            'start_time': start_time,
+            'end_time': start_time + timedelta(hours=1),
+        }
+
+    @staticmethod
+    def _changed_fields(discord_event, fields):
+        """Champs qui diffèrent entre un Discord Event existant et l'annonce"""
+        return {
+            name: value for name, value in fields.items()
+            if getattr(discord_event, name) != value
+        }
+
     @staticmethod
-    async def create_events_for_week(bot, guild_id, events_dict):
-        """Crée un Discord Event pour chaque annonce de la semaine"""
+    async def create_events_for_week(bot, guild_id, events, store=None):
+        """Synchronise les Discord Events de la guild avec les annonces de la semaine
+
+        Les events existants sont rapprochés par identifiant stable: seuls les
+        créations, modifications et suppressions nécessaires sont envoyées (en
+        parallèle via publish_queue), ce qui préserve les "Intéressé" des membres.
+        Avec un store, les ids des events créés sont persistés et servent aussi
+        au rapprochement (event dont la description a été modifiée à la main).
+        """
         guild = bot.get_guild(guild_id)
         if not guild:
             print(f"❌ Guild {guild_id} introuvable")
             return
-        
-        existing_events = await guild.fetch_scheduled_events()
-        for event in existing_events:
-            if any(keyword in event.name.lower() for keyword in ["nfp", "cpi", "fed", "ecb", "oil", "earnings"]):
-                try:
-                    await event.delete()
-                except:
-                    pass
-        
-        created_count = 0
-        
-        for date_str, event_data in events_dict.items():
-            try:
-                date_obj = datetime.fromisoformat(date_str)
-                time_str = event_data.get("time_paris", "09:00")
-                
-                if time_str == "Variable":
-                    time_str = "09:00"
-                
-                hour, minute = map(int, time_str.split(":"))
-                event_datetime = datetime(
-                    date_obj.year, date_obj.month, date_obj.day,
-                    hour, minute, tzinfo=ZoneInfo("Europe/Paris")
-                )
-                
-                if event_datetime < datetime.now(ZoneInfo("Europe/Paris")):
+
+        now = datetime.now(PARIS)
+
+        desired = {}
+        collisions = 0
+        for event_data in events:
+            if event_data.timestamp >= now.timestamp():
+                key = DiscordEventManager.event_key(event_data)
+                if key in desired:
+                    collisions += 1
+                    print(f"⚠️ Discord Event en double ignoré: {key}")
                     continue
-                
-                # Créer l'événement Discord avec les bons attributs
-                discord_event = await guild.create_scheduled_event(
-                    name=f"{event_data['country']} {event_data['name']}",
-                    description=(
-                        f"**Importance:** {event_data['importance']}\n"
-                        f"**Heure:** {event_data['time_paris']} (Paris)\n"
-                        f"**Assets concernés:** {', '.join(event_data['assets'])}\n\n"
-                        f"{event_data['description']}"
-                    ),
-                    start_time=event_datetime,
-                    end_time=event_datetime + timedelta(hours=1),
+                desired[key] = event_data
+
+        route = f"guild:{guild.id}:events"
+        existing_events = await publish_queue.submit(route, guild.fetch_scheduled_events, label=f"lecture events guild {guild.id}")
+        known_ids = {discord_id: key for key, discord_id in store.discord_ids(guild.id).items()} if store else {}
+        current = {}
+        to_delete = []
+        legacy_count = 0
+
+        for discord_event in existing_events:
+            if any(keyword in discord_event.name.lower() for keyword in LEGACY_KEYWORDS):
+                legacy_count += 1
+
+            match = EVENT_ID_PATTERN.search(discord_event.description or "")
+            key = match.group(1) if match else known_ids.get(discord_event.id)
+            if key:
+                if key in desired and key not in current:
+                    current[key] = discord_event
+                elif discord_event.start_time >= now:
+                    # Annonce disparue du calendrier, ou doublon
+                    to_delete.append(discord_event)
+            elif any(keyword in discord_event.name.lower() for keyword in LEGACY_KEYWORDS):
+                to_delete.append(discord_event)
+
+        to_create = []
+        to_update = []
+        for key, event_data in desired.items():
+            fields = DiscordEventManager._event_fields(event_data)
+            if key not in current:
+                to_create.append((event_data, fields))
+                continue
+            changes = DiscordEventManager._changed_fields(current[key], fields)
+            if changes:
+                to_update.append((event_data, current[key], changes))
+
+        created_ids = {}
+
+        async def run(action, label, call, key=None):
+            try:
+                result = await publish_queue.submit(route, call, label=label)
+                if key is not None and result is not None:
+                    created_ids[key] = result.id
+                print(f"✅ Event {action}: {label}")
+                return action
+            except Exception as e:
+                print(f"❌ Erreur {action} event {label}: {e}")
+                return None
+
+        calls = []
+        for discord_event in to_delete:
+            calls.append(run("supprimé", discord_event.name, discord_event.delete))
+        for event_data, fields in to_create:
+            calls.append(run(
+                "créé",
+                f"{event_data.name} - {event_data.datetime:%Y-%m-%d %H:%M}",
+                lambda fields=fields: guild.create_scheduled_event(
+                    **fields,
                     location="Calendrier économique",
                     privacy_level=discord.PrivacyLevel.guild_only,
                     entity_type=discord.EntityType.external,
-                )
-                
-                created_count += 1
-                print(f"✅ Event créé: {event_data['name']} - {date_str} {time_str}")
-            
-            except Exception as e:
-                print(f"❌ Erreur création event {event_data.get('name', 'Unknown')}: {e}")
-        
-        print(f"✅ Total: {created_count} Discord Events créés")
-        return created_count
+                ),
+                key=DiscordEventManager.event_key(event_data)
+            ))
+        for event_data, discord_event, changes in to_update:
+            calls.append(run(
+                "modifié",
+                f"{event_data.name} ({', '.join(changes)})",
+                lambda discord_event=discord_event, changes=changes: discord_event.edit(**changes)
+            ))
+
+        results = await asyncio.gather(*calls)
+
+        if store is not None:
+            ids = {key: discord_event.id for key, discord_event in current.items()}
+            ids.update(created_ids)
+            store.save_discord_ids(guild.id, ids)
+
+        # L'ancienne méthode supprimait tous les events reconnus puis recréait tout
+        naive_calls = legacy_count + len(desired)
+        report = {
+            'created': results.count("créé"),
+            'updated': results.count("modifié"),
+            'deleted': results.count("supprimé"),
+            'unchanged': len(current) - len(to_update),
+            'failed': results.count(None),
+            'collisions': collisions,
+            'calls': len(calls),
+            'saved_calls': max(naive_calls - len(calls), 0)
+        }
+
+        print(
+            f"✅ Discord Events: {report['created']} créés, {report['updated']} modifiés, "
+            f"{report['deleted']} supprimés, {report['unchanged']} inchangés "
+            f"({report['calls']} appels, {report['saved_calls']} économisés)"
+        )
+        return report
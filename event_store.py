@@ -0,0 +1,191 @@
+import heapq
+from bisect import bisect_left, bisect_right
+from datetime import datetime, time, timedelta
+from itertools import islice
+from timeutils import PARIS
+
+class _SortedIndex:
+    """Liste d'événements triée par (timestamp, nom) avec recherche par bisection"""
+    __slots__ = ('keys', 'events')
+
+    def __init__(self):
+        self.keys = []
+        self.events = []
+
+    def insert(self, key, event):
+        pos = bisect_right(self.keys, key)
+        self.keys.insert(pos, key)
+        self.events.insert(pos, event)
+
+    def remove(self, key):
+        pos = bisect_left(self.keys, key)
+        if pos < len(self.keys) and self.keys[pos] == key:
+            del self.keys[pos]
+            del self.events[pos]
+
+    def range(self, start_ts, end_ts):
+        """Événements avec start_ts <= timestamp < end_ts"""
+        lo = bisect_left(self.keys, (start_ts,))
+        hi = bisect_left(self.keys, (end_ts,))
+        return self.events[lo:hi]
+
+    def after(self, start_ts):
+        """Itère sur les événements avec timestamp >= start_ts, dans l'ordre"""
+        events = self.events
+        return (events[pos] for pos in range(bisect_left(self.keys, (start_ts,)), len(events)))
+
+class EventStore:
+    """Stockage en mémoire de tous les événements, indexé par date/heure
+
+    L'index principal est trié par datetime; des index secondaires par pays,
+    importance et asset (index inversés asset -> annonces triées par heure)
+    permettent de filtrer une plage ou de trouver les prochaines annonces en
+    O(log n) sans reconstruire de dict à chaque appel. Un nouveau scraping
+    ne touche les index que pour les annonces ajoutées, modifiées ou
+    disparues. Plusieurs événements le même jour
+    (CPI + PPI + claims à 14h30) sont tous conservés.
+    """
+
+    TIMEZONE = PARIS
+
+    def __init__(self, events=()):
+        self._primary = _SortedIndex()
+        self._by_country = {}
+        self._by_importance = {}
+        self._by_asset = {}
+        self._keys = set()
+        self.extend(events)
+
+    def __len__(self):
+        return len(self._primary.keys)
+
+    def __iter__(self):
+        return iter(list(self._primary.events))
+
+    @staticmethod
+    def _key(event):
+        # release_id: deux publications du même nom canonique à la même heure restent distinctes
+        return (event.timestamp, event.name, event.country, event.release_id)
+
+    def _secondary(self, event):
+        """Index secondaires concernés par un événement"""
+        yield self._by_country.setdefault(event.country, _SortedIndex())
+        yield self._by_importance.setdefault(event.importance, _SortedIndex())
+        for asset in event.assets:
+            yield self._by_asset.setdefault(asset, _SortedIndex())
+
+    def add(self, event):
+        """Ajoute un événement; retourne False s'il est déjà présent"""
+        key = self._key(event)
+        if key in self._keys:
+            return False
+        self._keys.add(key)
+        self._primary.insert(key, event)
+        for index in self._secondary(event):
+            index.insert(key, event)
+        return True
+
+    def extend(self, events):
+        """Ajoute plusieurs événements; retourne le nombre réellement ajoutés"""
+        return sum(1 for event in events if self.add(event))
+
+    def remove(self, event):
+        key = self._key(event)
+        if key not in self._keys:
+            return
+        self._keys.discard(key)
+        self._primary.remove(key)
+        for index in self._secondary(event):
+            index.remove(key)
+
+    def replace_range(self, start, end, events):
+        """Aligne [start, end[ sur un nouveau scraping; retourne (ajoutés, retirés)
+
+        Les annonces inchangées restent en place: seules les nouvelles, les
+        modifiées (résultat publié, heure déplacée...) et les disparues
+        mettent à jour les index.
+        """
+        incoming = {}
+        for event in events:
+            incoming.setdefault(self._key(event), event)
+
+        removed = 0
+        for event in self.range(start, end):
+            key = self._key(event)
+            if incoming.get(key) == event:
+                del incoming[key]
+            else:
+                self.remove(event)
+                removed += 1
+        return self.extend(incoming.values()), removed
+
+    def range(self, start, end, country=None, importance=None, asset=None):
+        """Événements de [start, end[ triés par heure, filtrés via l'index le plus sélectif"""
+        start_ts, end_ts = self._to_ts(start), self._to_ts(end)
+
+        filters = []
+        if country is not None:
+            filters.append(('country', self._by_country.get(country)))
+        if importance is not None:
+            filters.append(('importance', self._by_importance.get(importance)))
+        if asset is not None:
+            filters.append(('asset', self._by_asset.get(asset)))
+
+        if not filters:
+            return self._primary.range(start_ts, end_ts)
+
+        if any(index is None for _, index in filters):
+            return []
+
+        field, index = min(filters, key=lambda f: len(f[1].keys))
+        events = index.range(start_ts, end_ts)
+        if country is not None and field != 'country':
+            events = [e for e in events if e.country == country]
+        if importance is not None and field != 'importance':
+            events = [e for e in events if e.importance == importance]
+        if asset is not None and field != 'asset':
+            events = [e for e in events if asset in e.assets]
+        return events
+
+    def upcoming(self, after, limit=5, asset=None, min_importance=None):
+        """Prochains événements à partir de after (inclus), au plus limit
+
+        Avec un asset, parcourt son index inversé; avec une importance
+        minimale seule, fusionne les index des importances concernées.
+        """
+        after_ts = self._to_ts(after)
+        if asset is not None:
+            index = self._by_asset.get(asset)
+            if index is None:
+                return []
+            events = index.after(after_ts)
+            if min_importance is not None:
+                events = (e for e in events if e.importance >= min_importance)
+        elif min_importance is not None:
+            events = heapq.merge(
+                *(index.after(after_ts) for importance, index in self._by_importance.items() if importance >= min_importance),
+                key=self._key
+            )
+        else:
+            events = self._primary.after(after_ts)
+        return list(islice(events, limit))
+
+    def assets(self):
+        """Assets ayant au moins une annonce en mémoire"""
+        return sorted(asset for asset, index in self._by_asset.items() if index.keys)
+
+    def on_date(self, day, **filters):
+        """Événements d'une journée (heure de Paris)"""
+        return self.range(day, day + timedelta(days=1), **filters)
+
+    def by_day(self, start, end, **filters):
+        """Événements de [start, end[ groupés par date ISO (ordre chronologique)"""
+        days = {}
+        for event in self.range(start, end, **filters):
+            days.setdefault(event.datetime.date().isoformat(), []).append(event)
+        return days
+
+    def _to_ts(self, value):
+        if isinstance(value, datetime):
+            return value.timestamp()
+        return datetime.combine(value, time.min, tzinfo=self.TIMEZONE).timestamp()
@@ -1,23 +1,129 @@
+import threading
 import discord
 from discord.ext import commands
-from config import DISCORD_TOKEN, CHANNEL_ID, GUILD_ID
-from schedulers import start_scheduler
+from config import DISCORD_TOKEN
 
 intents = discord.Intents.default()
 intents.message_content = True
 bot = commands.Bot(command_prefix="!", intents=intents)
 
+# Tâche de démarrage du scheduler (on_ready est rappelé à chaque reconnexion)
+startup_task = None
+
+def preload():
+    """Importe schedulers (APScheduler, scraper, stores) pendant la connexion au gateway"""
+    import schedulers
+
 @bot.event
 async def on_ready():
+    global startup_task
     print(f"✅ Bot connecté: {bot.user}")
-    start_scheduler(bot, CHANNEL_ID, GUILD_ID)
+    if startup_task is not None:
+        return
+
+    # Import différé: déjà fait par preload() si la connexion a été plus lente que lui
+    from schedulers import start_scheduler
+    startup_task = start_scheduler(bot)
     print("🚀 Bot opérationnel")
 
 @bot.command()
 async def agenda(ctx):
-    """Commande manuelle pour forcer l'envoi de l'agenda"""
+    """Commande manuelle: publie l'agenda, ou met à jour celui de la semaine déjà publié"""
     from schedulers import send_weekly_agenda
-    await send_weekly_agenda(bot, ctx.channel.id, GUILD_ID)
+    status = await send_weekly_agenda(bot, ctx.channel.id, ctx.guild.id)
+    # Agenda de la semaine déjà dans le salon: pas de nouveau message
+    if status == "unchanged":
+        await ctx.message.add_reaction("✅")
+    elif status == "edited":
+        await ctx.message.add_reaction("🔄")
+
+@bot.command()
+@commands.has_permissions(manage_guild=True)
+async def subscribe(ctx, *options):
+    """Abonne ce salon: !subscribe [ASSET ...] [importance=1-5] [lang=fr|en]"""
+    from models import Subscription
+    from schedulers import subscriptions
+    from utils import LABELS
+    assets, min_importance, language = [], 1, "fr"
+    for option in options:
+        key, _, value = option.partition("=")
+        if key == "importance" and value.isdigit():
+            min_importance = min(5, max(1, int(value)))
+        elif key == "lang" and value in LABELS:
+            language = value
+        elif not value:
+            assets.append(option)
+        else:
+            await ctx.send(f"❌ Option inconnue: `{option}`")
+            return
+    subscription = Subscription(ctx.guild.id, ctx.channel.id, tuple(assets), min_importance, language)
+    subscriptions.add(subscription)
+    await ctx.send(
+        f"✅ Salon abonné | Assets: {', '.join(subscription.assets) or 'tous'} | "
+        f"Importance ≥ {'⭐' * min_importance} | Langue: {language}"
+    )
+
+@bot.command()
+@commands.has_permissions(manage_guild=True)
+async def unsubscribe(ctx):
+    """Désabonne ce salon"""
+    from schedulers import subscriptions
+    if subscriptions.remove(ctx.channel.id):
+        await ctx.send("✅ Salon désabonné")
+    else:
+        await ctx.send("ℹ️ Ce salon n'est pas abonné")
+
+# Réponses des commandes de recherche: au plus 3 messages
+MAX_QUERY_MESSAGES = 3
+
+async def send_event_list(ctx, title, events, empty):
+    """Répond avec une liste d'annonces (ou le message empty si elle est vide)"""
+    from utils import format_event_list
+    if not events:
+        await ctx.send(empty)
+        return
+    messages = format_event_list(title, events)
+    for message in messages[:MAX_QUERY_MESSAGES]:
+        await ctx.send(message)
+    if len(messages) > MAX_QUERY_MESSAGES:
+        await ctx.send("… liste tronquée: préciser un asset (`!week ES`) ou un nombre (`!next 10`)")
+
+@bot.command(name="asset")
+async def asset_command(ctx, asset: str, count: int = 10):
+    """Prochaines annonces d'un asset: !asset ES [n]"""
+    from schedulers import known_assets, upcoming_events
+    asset = asset.upper()
+    await send_event_list(
+        ctx, f"🎯 Prochaines annonces **{asset}**", upcoming_events(min(count, 50), asset=asset),
+        f"ℹ️ Aucune annonce à venir pour `{asset}` (assets suivis: {', '.join(known_assets())})"
+    )
+
+@bot.command(name="next")
+async def next_command(ctx, count: int = 5, min_importance: int = None):
+    """Prochaines annonces: !next [n] [importance minimale 1-5]"""
+    from schedulers import upcoming_events
+    title = "⏭️ Prochaines annonces" + (f" ({'⭐' * min_importance} et plus)" if min_importance else "")
+    await send_event_list(
+        ctx, title, upcoming_events(min(count, 50), min_importance=min_importance),
+        "ℹ️ Aucune annonce à venir"
+    )
+
+@bot.command(name="week")
+async def week_command(ctx, asset: str = None):
+    """Annonces des 7 prochains jours, pour un asset: !week [CL]"""
+    from schedulers import week_events
+    asset = asset.upper() if asset else None
+    await send_event_list(
+        ctx, "📅 7 prochains jours" + (f" — **{asset}**" if asset else ""), week_events(asset),
+        "ℹ️ Aucune annonce cette semaine" + (f" pour `{asset}`" if asset else "")
+    )
+
+@bot.command()
+async def perf(ctx):
+    """Durées par étape (p50/p95/max), caches et file Discord"""
+    from schedulers import perf_report
+    from utils import format_perf_report
+    await ctx.send(format_perf_report(perf_report()))
 
 @bot.command()
 async def test(ctx):
@@ -25,4 +131,5 @@ async def test(ctx):
     await ctx.send("✅ Bot fonctionnel!")
 
 if __name__ == "__main__":
+    threading.Thread(target=preload, name="preload", daemon=True).start()
     bot.run(DISCORD_TOKEN)
@@ -1,12 +1,55 @@
-from datetime import datetime, date
-from zoneinfo import ZoneInfo
+from datetime import datetime, date, timedelta
+from timeutils import UTC
 
 class MarketHolidays:
-    """Gestion des jours fériés des marchés US et UK"""
+    """Gestion des jours fériés des marchés US et UK
+    
+    Les tables sont calculées une seule fois par année puis mémoïsées:
+    is_market_holiday est une simple lecture de dict.
+    """
+    
+    MARKETS = ("US", "UK")
+    
+    # année -> {"US": {date: nom}, "UK": {date: nom}, "ALL": {date: [noms]}}
+    _tables = {}
     
     @staticmethod
     def get_us_holidays(year):
         """Retourne les jours fériés US (NYSE fermée)"""
+        return dict(MarketHolidays._year_table(year)["US"])
+    
+    @staticmethod
+    def get_uk_holidays(year):
+        """Retourne les jours fériés UK (LSE fermée)"""
+        return dict(MarketHolidays._year_table(year)["UK"])
+    
+    @staticmethod
+    def _year_table(year):
+        """Table mémoïsée des jours fériés d'une année"""
+        table = MarketHolidays._tables.get(year)
+        if table is None:
+            table = MarketHolidays.preload(
+                year,
+                MarketHolidays._compute_us_holidays(year),
+                MarketHolidays._compute_uk_holidays(year)
+            )
+        return table
+    
+    @staticmethod
+    def preload(year, us_holidays, uk_holidays):
+        """Installe la table d'une année (calculée ou relue depuis le disque)"""
+        combined = {}
+        for holidays in (us_holidays, uk_holidays):
+            for day, name in holidays.items():
+                combined.setdefault(day, []).append(name)
+        
+        table = {"US": us_holidays, "UK": uk_holidays, "ALL": combined}
+        MarketHolidays._tables[year] = table
+        return table
+    
+    @staticmethod
+    def _compute_us_holidays(year):
+        """Calcule les jours fériés US (NYSE fermée)"""
         holidays = {
             # Jours fixes
             date(year, 1, 1): "New Year's Day 🇺🇸",
@@ -31,14 +74,13 @@ class MarketHolidays:
         
         # Good Friday (Pâques - 2 jours)
         easter = MarketHolidays._get_easter(year)
-        good_friday = date(easter.year, easter.month, easter.day - 2) if easter.day > 2 else date(easter.year, easter.month - 1, easter.day + 28)
-        holidays[good_friday] = "Good Friday 🇺🇸"
+        holidays[easter - timedelta(days=2)] = "Good Friday 🇺🇸"
         
         return holidays
     
     @staticmethod
-    def get_uk_holidays(year):
-        """Retourne les jours fériés UK (LSE fermée)"""
+    def _compute_uk_holidays(year):
+        """Calcule les jours fériés UK (LSE fermée)"""
         holidays = {
             # Jours fixes
             date(year, 1, 1): "New Year's Day 🇬🇧",
@@ -48,8 +90,8 @@ class MarketHolidays:
         
         # Easter
         easter = MarketHolidays._get_easter(year)
-        good_friday = date(easter.year, easter.month, easter.day - 2) if easter.day > 2 else date(easter.year, easter.month - 1, easter.day + 28)
-        easter_monday = date(easter.year, easter.month, easter.day + 1)
+        good_friday = easter - timedelta(days=2)
+        easter_monday = easter + timedelta(days=1)
         
         holidays[good_friday] = "Good Friday 🇬🇧"
         holidays[easter_monday] = "Easter Monday 🇬🇧"
@@ -71,19 +113,38 @@ class MarketHolidays:
         if isinstance(check_date, datetime):
             check_date = check_date.date()
         
-        year = check_date.year
-        us_holidays = MarketHolidays.get_us_holidays(year)
-        uk_holidays = MarketHolidays.get_uk_holidays(year)
-        
-        holidays_info = []
-        
-        if check_date in us_holidays:
-            holidays_info.append(us_holidays[check_date])
+        return list(MarketHolidays._year_table(check_date.year)["ALL"].get(check_date, ()))
+    
+    @staticmethod
+    def is_holiday(check_date, market):
+        """Vérifie si une date est fériée sur un marché donné ("US" ou "UK")"""
+        if isinstance(check_date, datetime):
+            check_date = check_date.date()
         
-        if check_date in uk_holidays:
-            holidays_info.append(uk_holidays[check_date])
+        return check_date in MarketHolidays._year_table(check_date.year)[market]
+    
+    @staticmethod
+    def holidays_between(start, end, market="ALL"):
+        """Retourne les jours fériés de [start, end[ triés par date
         
-        return holidays_info
+        Chaque élément: {'date': date, 'holidays': [noms]}
+        """
+        if isinstance(start, datetime):
+            start = start.date()
+        if isinstance(end, datetime):
+            end = end.date()
+        
+        result = []
+        for year in range(start.year, end.year + 1):
+            table = MarketHolidays._year_table(year)[market]
+            for day in sorted(table):
+                if start <= day < end:
+                    names = table[day]
+                    result.append({
+                        'date': day,
+                        'holidays': list(names) if market == "ALL" else [names]
+                    })
+        return result
     
     @staticmethod
     def _get_nth_weekday(year, month, weekday, n):
@@ -106,8 +167,6 @@ class MarketHolidays:
     @staticmethod
     def _get_last_weekday(year, month, weekday):
         """Retourne le dernier jour de la semaine d'un mois"""
-        from datetime import timedelta
-        
         # Commencer par le dernier jour du mois
         if month == 12:
             last_day = date(year + 1, 1, 1)
@@ -146,29 +205,5 @@ class MarketHolidays:
     @staticmethod
     def get_upcoming_holidays(days_ahead=30):
         """Retourne les jours fériés à venir"""
-        today = datetime.now(ZoneInfo("UTC")).date()
-        year = today.year
-        
-        us_holidays = MarketHolidays.get_us_holidays(year)
-        uk_holidays = MarketHolidays.get_uk_holidays(year)
-        
-        # Si on est en fin d'année, inclure aussi l'année suivante
-        if today.month >= 11:
-            us_holidays.update(MarketHolidays.get_us_holidays(year + 1))
-            uk_holidays.update(MarketHolidays.get_uk_holidays(year + 1))
-        
-        upcoming = []
-        
-        for i in range(days_ahead):
-            check_date = date(today.year, today.month, today.day)
-            from datetime import timedelta
-            check_date = today + timedelta(days=i)
-            
-            holidays = MarketHolidays.is_market_holiday(check_date)
-            if holidays:
-                upcoming.append({
-                    'date': check_date,
-                    'holidays': holidays
-                })
-        
-        return upcoming
+        today = datetime.now(UTC).date()
+        return MarketHolidays.holidays_between(today, today + timedelta(days=days_ahead))
@@ -0,0 +1,151 @@
+"""Durées par étape (spans) et diagnostics du bot
+
+Chaque étape (fetch, parse, classify, merge, render, appels Discord...) est
+chronométrée dans un span; les dernières durées de chaque étape sont gardées
+dans une fenêtre glissante pour calculer p50/p95/max (commande !perf,
+endpoint HTTP local optionnel). Désactivé, un span est un objet partagé qui
+ne fait rien: le coût se limite à un appel de méthode.
+"""
+import json
+import threading
+import time
+from collections import deque
+
+def percentiles(values):
+    """p50 / p95 / max d'une série (0.0 si vide)"""
+    if not values:
+        return {'p50': 0.0, 'p95': 0.0, 'max': 0.0}
+    ordered = sorted(values)
+    return {
+        'p50': ordered[len(ordered) // 2],
+        'p95': ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+        'max': ordered[-1]
+    }
+
+class _Span:
+    __slots__ = ('metrics', 'name', 'started')
+
+    def __init__(self, metrics, name):
+        self.metrics = metrics
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.metrics.record(self.name, time.perf_counter() - self.started)
+        return False
+
+class _Accumulator:
+    """Somme les durées d'une fonction appelée en boucle, enregistrée en un seul échantillon"""
+    __slots__ = ('metrics', 'name', 'total')
+
+    def __init__(self, metrics, name):
+        self.metrics = metrics
+        self.name = name
+        self.total = 0.0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.metrics.record(self.name, self.total)
+        return False
+
+    def wrap(self, fn):
+        def timed(*args):
+            started = time.perf_counter()
+            try:
+                return fn(*args)
+            finally:
+                self.total += time.perf_counter() - started
+        return timed
+
+class _Disabled:
+    """Span / accumulateur inactif (partagé)"""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def wrap(self, fn):
+        return fn
+
+_DISABLED = _Disabled()
+
+class Metrics:
+    """Fenêtres glissantes de durées par étape, compteurs et dernières valeurs (gauges)"""
+
+    def __init__(self, enabled=True, window=500):
+        self.enabled = enabled
+        self.window = window
+        self._samples = {}
+        self._counts = {}
+        self._gauges = {}
+        # Le parsing enregistre depuis les threads de l'executor
+        self._lock = threading.Lock()
+
+    def span(self, name):
+        """with metrics.span("fetch"): ... (fonctionne aussi autour d'un await)"""
+        if not self.enabled:
+            return _DISABLED
+        return _Span(self, name)
+
+    def accumulate(self, name):
+        """with metrics.accumulate("classify") as timer: f = timer.wrap(f) ..."""
+        if not self.enabled:
+            return _DISABLED
+        return _Accumulator(self, name)
+
+    def record(self, name, seconds):
+        if not self.enabled:
+            return
+        with self._lock:
+            samples = self._samples.get(name)
+            if samples is None:
+                samples = self._samples[name] = deque(maxlen=self.window)
+            samples.append(seconds)
+            self._counts[name] = self._counts.get(name, 0) + 1
+
+    def gauge(self, name, value):
+        """Dernière valeur observée (taille du dernier scraping...)"""
+        if self.enabled:
+            self._gauges[name] = value
+
+    def stats(self):
+        """{'stages': {étape: {count, p50, p95, max}}, 'gauges': {...}} (secondes)"""
+        with self._lock:
+            samples = {name: list(values) for name, values in self._samples.items()}
+            counts = dict(self._counts)
+        return {
+            'stages': {
+                name: dict(count=counts[name], **percentiles(values))
+                for name, values in sorted(samples.items())
+            },
+            'gauges': dict(self._gauges)
+        }
+
+    async def serve(self, port, report, host="127.0.0.1"):
+        """Endpoint HTTP local: GET /metrics -> JSON de report()"""
+        from aiohttp import web
+
+        async def handle(request):
+            return web.Response(
+                text=json.dumps(report(), ensure_ascii=False, default=str),
+                content_type="application/json"
+            )
+
+        app = web.Application()
+        app.router.add_get("/metrics", handle)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        await web.TCPSite(runner, host, port).start()
+        print(f"📈 Métriques exposées sur http://{host}:{port}/metrics")
+        return runner
+
+# Instance partagée (scraper, sources, schedulers, publish_queue)
+metrics = Metrics()
@@ -0,0 +1,119 @@
+"""Modèles: annonce économique compacte et abonnement d'un salon
+
+Une annonce est un objet immuable à slots: importance entière, horodatage
+epoch UTC, codes pays et assets internés, assets en tuple. Drapeau, étoiles
+et heure de Paris ne sont calculés qu'à l'affichage.
+"""
+import sys
+from dataclasses import asdict, dataclass, replace
+from datetime import datetime
+from timeutils import PARIS
+
+# Code pays -> drapeau affiché
+FLAGS = {"US": "🇺🇸", "EA": "🇪🇺", "GB": "🇬🇧", "JP": "🇯🇵", "WW": "🌍"}
+FLAG_CODES = {flag: code for code, flag in FLAGS.items()}
+
+def country_code(country_text):
+    """Code pays à partir du libellé TradingEconomics ("United States", "Euro Area"...)"""
+    country_lower = country_text.lower()
+
+    if 'united states' in country_lower or 'usa' in country_lower:
+        return "US"
+    elif 'euro' in country_lower or 'europe' in country_lower:
+        return "EA"
+    elif 'united kingdom' in country_lower or 'uk' in country_lower:
+        return "GB"
+    elif 'japan' in country_lower:
+        return "JP"
+
+    return "WW"
+
+@dataclass(frozen=True, slots=True)
+class EconomicEvent:
+    name: str
+    country: str            # code pays (voir FLAGS)
+    importance: int         # nombre d'étoiles (1-5)
+    timestamp: float        # epoch UTC
+    assets: tuple = ()
+    description: str = ""
+    source: str = "tradingeconomics"
+    row_id: str = None      # data-id de la ligne TradingEconomics
+    actual: str = None
+    previous: str = None
+    consensus: str = None
+    forecast: str = None
+
+    def __post_init__(self):
+        # Codes répétés sur des milliers d'annonces: une seule chaîne en mémoire
+        object.__setattr__(self, 'country', sys.intern(self.country))
+        object.__setattr__(self, 'source', sys.intern(self.source))
+        object.__setattr__(self, 'assets', tuple(sys.intern(asset) for asset in self.assets))
+
+    @classmethod
+    def at(cls, when, **fields):
+        """Construit une annonce à partir d'un datetime avec fuseau"""
+        return cls(timestamp=when.timestamp(), **fields)
+
+    @property
+    def release_id(self):
+        """Publication d'origine: data-id TradingEconomics, sinon libellé brut
+
+        Le nom canonique regroupe plusieurs publications (Initial / Continuing
+        Jobless Claims, CPI MoM / YoY) qui peuvent tomber à la même heure.
+        """
+        return self.row_id or self.description or self.name
+
+    # --- Affichage (calculé à la demande) ----------------------------------
+
+    @property
+    def datetime(self):
+        """Heure de l'annonce (Europe/Paris)"""
+        return datetime.fromtimestamp(self.timestamp, PARIS)
+
+    @property
+    def time_paris(self):
+        return self.datetime.strftime('%H:%M')
+
+    @property
+    def flag(self):
+        return FLAGS.get(self.country, FLAGS["WW"])
+
+    @property
+    def stars(self):
+        return "⭐" * self.importance
+
+    # --- Conversions -------------------------------------------------------
+
+    def replace(self, **changes):
+        """Copie modifiée (l'annonce elle-même est immuable)"""
+        return replace(self, **changes)
+
+    def to_dict(self):
+        """Champs bruts sérialisables en JSON (valeurs None omises)"""
+        return {name: value for name, value in asdict(self).items() if value is not None}
+
+    @classmethod
+    def from_dict(cls, fields):
+        return cls(**dict(fields, assets=tuple(fields.get('assets', ()))))
+
+@dataclass(frozen=True, slots=True)
+class Subscription:
+    """Salon abonné à l'agenda, avec ses filtres"""
+    guild_id: int
+    channel_id: int
+    assets: tuple = ()          # vide: toutes les annonces
+    min_importance: int = 1     # nombre d'étoiles minimum
+    language: str = "fr"
+
+    def __post_init__(self):
+        object.__setattr__(self, 'assets', tuple(sorted({sys.intern(asset.upper()) for asset in self.assets})))
+
+    @property
+    def filter_key(self):
+        """Abonnements aux filtres identiques: même rendu partagé"""
+        return (self.assets, self.min_importance, self.language)
+
+    def matches(self, event):
+        if event.importance < self.min_importance:
+            return False
+        return not self.assets or any(asset in self.assets for asset in event.assets)
@@ -0,0 +1,210 @@
+import asyncio
+import random
+import time
+from collections import deque
+import discord
+from metrics import metrics, percentiles
+
+class _RouteBucket:
+    """État de rate-limit d'une route Discord (salon, events d'une guild...)"""
+    __slots__ = ('blocked_until', 'in_flight')
+
+    def __init__(self):
+        self.blocked_until = 0.0
+        self.in_flight = 0
+
+class PublishQueue:
+    """File d'envoi centrale pour tous les appels Discord sortants
+
+    Les appels (channel.send, create_scheduled_event, event.delete...) sont
+    exécutés par un pool de workers, à tour de rôle entre les routes: une
+    guild qui crée cinquante Discord Events ne retarde pas le message d'agenda
+    des autres guilds. Chaque route a son propre bucket: un 429
+    bloque uniquement cette route pendant retry_after. La route est alors
+    retirée de la rotation (aucun worker n'attend pour elle) et y revient à
+    l'expiration du délai, son appel en tête. Les erreurs transitoires (5xx,
+    réseau) sont rejouées de la même façon avec un backoff exponentiel.
+    """
+
+    def __init__(self, concurrency=4, per_route_concurrency=2, max_retries=5, base_delay=1.0):
+        self.concurrency = concurrency
+        self.per_route_concurrency = per_route_concurrency
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self._loop = None
+        self._pending = {}       # route -> appels en attente (FIFO)
+        self._rotation = deque()  # routes pouvant exécuter un appel, à tour de rôle
+        self._queued = set()      # routes présentes dans _rotation
+        self._ready = None        # nombre d'entrées de _rotation
+        self._workers = []
+        self._buckets = {}
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.retries = 0
+        self.rate_limited = 0
+        self._latencies = deque(maxlen=500)
+        self._waits = deque(maxlen=500)
+
+    def configure(self, concurrency=None, per_route_concurrency=None, max_retries=None):
+        """Ajuste les paramètres (avant le premier envoi)"""
+        if concurrency is not None:
+            self.concurrency = concurrency
+        if per_route_concurrency is not None:
+            self.per_route_concurrency = per_route_concurrency
+        if max_retries is not None:
+            self.max_retries = max_retries
+
+    def _ensure_workers(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Première utilisation (ou nouvelle boucle): files et buckets neufs
+            self._loop = loop
+            self._pending = {}
+            self._rotation = deque()
+            self._queued = set()
+            self._ready = asyncio.Semaphore(0)
+            self._workers = []
+            self._buckets = {}
+        self._workers = [w for w in self._workers if not w.done()]
+        while len(self._workers) < self.concurrency:
+            self._workers.append(asyncio.ensure_future(self._worker()))
+
+    def _bucket(self, route):
+        bucket = self._buckets.get(route)
+        if bucket is None:
+            bucket = self._buckets[route] = _RouteBucket()
+        return bucket
+
+    async def submit(self, route, call, label=None):
+        """Met un appel en file et attend son résultat
+
+        route: clé du bucket (ex: "channel:123", "guild:456:events")
+        call: fonction sans argument retournant la coroutine à exécuter
+        """
+        self._ensure_workers()
+        future = asyncio.get_running_loop().create_future()
+        self.submitted += 1
+        self._pending.setdefault(route, deque()).append((call, label or route, time.monotonic(), future, 0))
+        self._schedule(route)
+        return await future
+
+    def _dispatchable(self, route):
+        bucket = self._bucket(route)
+        return (
+            bool(self._pending.get(route))
+            and bucket.in_flight < self.per_route_concurrency
+            and bucket.blocked_until <= time.monotonic()
+        )
+
+    def _schedule(self, route):
+        """Remet une route en fin de rotation si elle peut exécuter un appel maintenant"""
+        if route not in self._queued and self._dispatchable(route):
+            self._queued.add(route)
+            self._rotation.append(route)
+            self._ready.release()
+
+    def _unblock(self, route):
+        """Fin du retry_after d'une route: retour en rotation"""
+        remaining = self._bucket(route).blocked_until - time.monotonic()
+        if remaining > 0:
+            self._loop.call_later(remaining, self._unblock, route)
+        else:
+            self._schedule(route)
+
+    def _next(self):
+        """Prochain appel: route en tête de rotation, ou None si elle est bloquée ou saturée entre-temps"""
+        route = self._rotation.popleft()
+        self._queued.discard(route)
+        if not self._dispatchable(route):
+            # Entrée périmée: la route revient en rotation quand elle redevient disponible
+            return None
+        pending = self._pending[route]
+        item = pending.popleft()
+        if not pending:
+            del self._pending[route]
+        return route, item
+
+    async def _worker(self):
+        while True:
+            await self._ready.acquire()
+            entry = self._next()
+            if entry is None:
+                continue
+            route, (call, label, enqueued_at, future, attempt) = entry
+            if attempt == 0:
+                self._waits.append(time.monotonic() - enqueued_at)
+
+            bucket = self._bucket(route)
+            bucket.in_flight += 1
+            # Une autre place sur la route: elle reprend sa place en fin de rotation
+            self._schedule(route)
+            try:
+                with metrics.span(f"discord.{route.split(':', 1)[0]}"):
+                    result = await call()
+            except Exception as e:
+                retry_after = self._retry_after(e, attempt)
+                if retry_after is None or attempt >= self.max_retries:
+                    self._finish(future, enqueued_at, error=e)
+                else:
+                    # Route mise de côté pendant retry_after, l'appel repart en tête de sa file
+                    self.retries += 1
+                    bucket.blocked_until = max(bucket.blocked_until, time.monotonic() + retry_after)
+                    self._pending.setdefault(route, deque()).appendleft((call, label, enqueued_at, future, attempt + 1))
+                    self._loop.call_later(retry_after, self._unblock, route)
+                    print(f"⏳ Retry {attempt + 1}/{self.max_retries} {label} dans {retry_after:.1f}s ({e})")
+            else:
+                self._finish(future, enqueued_at, result=result)
+            finally:
+                bucket.in_flight -= 1
+                self._schedule(route)
+
+    def _finish(self, future, enqueued_at, result=None, error=None):
+        if error is None:
+            self.completed += 1
+            if not future.done():
+                future.set_result(result)
+        else:
+            self.failed += 1
+            if not future.done():
+                future.set_exception(error)
+        self._latencies.append(time.monotonic() - enqueued_at)
+
+    def _retry_after(self, error, attempt):
+        """Délai avant de rejouer un appel, ou None si l'erreur est définitive"""
+        if isinstance(error, discord.RateLimited):
+            self.rate_limited += 1
+            return error.retry_after
+        if isinstance(error, discord.HTTPException):
+            if error.status == 429:
+                self.rate_limited += 1
+                headers = getattr(error.response, 'headers', None) or {}
+                try:
+                    return float(headers.get('Retry-After', self.base_delay))
+                except (TypeError, ValueError):
+                    return self.base_delay
+            if error.status < 500:
+                return None
+        elif not isinstance(error, (OSError, asyncio.TimeoutError)):
+            return None
+        # Erreur serveur ou réseau: backoff exponentiel avec jitter
+        return self.base_delay * (2 ** attempt) * (0.5 + random.random())
+
+    def stats(self):
+        """Profondeur de file, latences (p50/p95/max) et compteurs"""
+        return {
+            'depth': sum(len(pending) for pending in self._pending.values()),
+            'routes': len(self._pending),
+            'blocked': sum(1 for bucket in self._buckets.values() if bucket.blocked_until > time.monotonic()),
+            'workers': len(self._workers),
+            'submitted': self.submitted,
+            'completed': self.completed,
+            'failed': self.failed,
+            'retries': self.retries,
+            'rate_limited': self.rate_limited,
+            'latency': percentiles(self._latencies),
+            'queue_wait': percentiles(self._waits)
+        }
+
+# File partagée par schedulers.py et discord_events.py
+publish_queue = PublishQueue()
@@ -0,0 +1,222 @@
+"""Annonces récurrentes décrites par des règles façon RRULE (fichier de données)
+
+Chaque règle donne une récurrence, une heure locale et le comportement les
+jours fériés de son marché:
+
+    FREQ=WEEKLY;BYDAY=WE        chaque mercredi
+    FREQ=MONTHLY;BYDAY=1FR      premier vendredi du mois (-1FR: le dernier)
+    FREQ=MONTHLY;BYMONTHDAY=15  le 15 du mois
+
+    skip        l'occurrence est supprimée
+    previous    avancée à la séance précédente (NFP d'un vendredi férié)
+    next        reportée à la séance suivante
+    week_delay  décalée d'une séance par jour férié depuis le lundi (EIA, API)
+
+Les exceptions connues d'une règle (calendrier officiel qui s'en écarte)
+sont listées dans "overrides": date donnée par la règle, après décalage
+férié → date réelle, ou null si l'annonce n'a pas lieu.
+
+L'expansion d'une plage travaille sur des listes de dates passées en bloc à
+TradingCalendar (vectorisé avec NumPy quand il est installé) et est mise en
+cache par plage: les exécutions hebdomadaires et quotidiennes relisent le
+cache, un backfill de plusieurs mois se calcule en une passe par règle.
+"""
+import json
+import os
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date, timedelta
+from zoneinfo import ZoneInfo
+from models import EconomicEvent
+from timeutils import local_timestamp
+from trading_calendar import get_trading_calendar
+
+WEEKDAYS = {"MO": 0, "TU": 1, "WE": 2, "TH": 3, "FR": 4, "SA": 5, "SU": 6}
+HOLIDAY_MODES = ("skip", "previous", "next", "week_delay")
+
+# Marge de candidats autour d'une plage: un décalage férié peut y faire entrer une occurrence
+_MARGIN = timedelta(days=7)
+
+def parse_rrule(spec):
+    """(fréquence, [(rang, jour de semaine)], [jours du mois]) d'une règle "FREQ=...;BYDAY=..." """
+    parts = dict(part.split("=", 1) for part in spec.upper().replace(" ", "").split(";") if part)
+    freq = parts.get("FREQ")
+    if freq not in ("WEEKLY", "MONTHLY"):
+        raise ValueError(f"FREQ non supportée: {spec}")
+
+    byday = []
+    for token in filter(None, parts.get("BYDAY", "").split(",")):
+        rank, weekday = token[:-2], token[-2:]
+        if weekday not in WEEKDAYS:
+            raise ValueError(f"BYDAY invalide: {token}")
+        byday.append((int(rank) if rank else 0, WEEKDAYS[weekday]))
+    bymonthday = [int(day) for day in filter(None, parts.get("BYMONTHDAY", "").split(","))]
+
+    if freq == "WEEKLY" and (not byday or any(rank for rank, _ in byday)):
+        raise ValueError(f"FREQ=WEEKLY attend BYDAY=MO,TU...: {spec}")
+    if freq == "MONTHLY" and not (bymonthday or all(rank for rank, _ in byday) and byday):
+        raise ValueError(f"FREQ=MONTHLY attend BYDAY=1FR (rang) ou BYMONTHDAY: {spec}")
+    return freq, tuple(byday), tuple(bymonthday)
+
+@dataclass(frozen=True, slots=True)
+class RecurringRule:
+    """Une annonce récurrente et sa règle"""
+    name: str
+    country: str
+    importance: int
+    assets: tuple
+    description: str
+    rrule: str
+    hour: int
+    minute: int
+    zone: ZoneInfo
+    market: str = "US"
+    holiday: str = "skip"
+    overrides: tuple = ()  # ((date de la règle, date réelle ou None), ...)
+
+    @classmethod
+    def from_dict(cls, entry):
+        hour, minute = (int(part) for part in entry['time'].split(":"))
+        holiday = entry.get('holiday', "skip")
+        if holiday not in HOLIDAY_MODES:
+            raise ValueError(f"{entry['name']}: holiday doit valoir {', '.join(HOLIDAY_MODES)}")
+        parse_rrule(entry['rrule'])
+        overrides = tuple(sorted(
+            (date.fromisoformat(day), date.fromisoformat(moved) if moved else None)
+            for day, moved in entry.get('overrides', {}).items()
+        ))
+        return cls(
+            name=entry['name'],
+            country=entry.get('country', "US"),
+            importance=int(entry.get('importance', 3)),
+            assets=tuple(entry.get('assets', ())),
+            description=entry.get('description', entry['name']),
+            rrule=entry['rrule'],
+            hour=hour,
+            minute=minute,
+            zone=ZoneInfo(entry.get('timezone', "America/New_York")),
+            market=entry.get('market', "US"),
+            holiday=holiday,
+            overrides=overrides
+        )
+
+    # --- Expansion ---------------------------------------------------------
+
+    def candidates(self, start, end):
+        """Dates de la récurrence dans [start, end] (avant décalage férié), triées"""
+        freq, byday, bymonthday = parse_rrule(self.rrule)
+        first, last = start.toordinal(), end.toordinal()
+        ordinals = []
+        if freq == "WEEKLY":
+            for _, weekday in byday:
+                # date.fromordinal(1) est un lundi
+                ordinals.extend(range(first + (weekday - (first - 1)) % 7, last + 1, 7))
+        else:
+            year, month = start.year, start.month
+            while (year, month) <= (end.year, end.month):
+                ordinals.extend(self._month_days(year, month, byday, bymonthday))
+                year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+        return [date.fromordinal(o) for o in sorted(set(ordinals)) if first <= o <= last]
+
+    @staticmethod
+    def _month_days(year, month, byday, bymonthday):
+        first = date(year, month, 1).toordinal()
+        last = (date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1)).toordinal() - 1
+        for rank, weekday in byday:
+            if rank > 0:
+                ordinal = first + (weekday - (first - 1)) % 7 + 7 * (rank - 1)
+            else:
+                ordinal = last - ((last - 1) - weekday) % 7 + 7 * (rank + 1)
+            if first <= ordinal <= last:
+                yield ordinal
+        for day in bymonthday:
+            ordinal = (last + day + 1) if day < 0 else (first + day - 1)
+            if first <= ordinal <= last:
+                yield ordinal
+
+    def shift(self, days):
+        """Applique la règle des jours fériés à une liste de dates (calculs en bloc)"""
+        if not days:
+            return []
+        calendar = get_trading_calendar(self.market)
+        open_days = calendar.is_trading_day(days)
+
+        if self.holiday == "skip":
+            return [day for day, is_open in zip(days, open_days) if is_open]
+        if self.holiday == "next":
+            return calendar.add_trading_days(days, 0)
+        if self.holiday == "previous":
+            previous = calendar.previous_trading_day(days)
+            return [day if is_open else moved for day, is_open, moved in zip(days, open_days, previous)]
+
+        # week_delay: une séance de retard par jour de semaine fermé entre le lundi et le jour
+        mondays = [day - timedelta(days=day.weekday()) for day in days]
+        sessions = calendar.trading_days_between(mondays, [day + timedelta(days=1) for day in days])
+        delays = [min(day.weekday(), 4) + 1 - open_count for day, open_count in zip(days, sessions)]
+        shifted = list(days)
+        for delay in set(delays) - {0}:
+            positions = [i for i, value in enumerate(delays) if value == delay]
+            moved = calendar.add_trading_days([days[i] for i in positions], delay)
+            for i, day in zip(positions, moved):
+                shifted[i] = day
+        return shifted
+
+    def expand(self, start, end):
+        """Annonces de la règle dans [start, end] (dates locales de la règle, bornes incluses)"""
+        # Marge élargie à l'exception la plus éloignée de sa date de règle
+        margin = max([_MARGIN] + [abs(moved - day) for day, moved in self.overrides if moved])
+        days = self.shift(self.candidates(start - margin, end + margin))
+        if self.overrides:
+            overrides = dict(self.overrides)
+            days = [overrides.get(day, day) for day in days]
+            days = [day for day in days if day is not None]
+        return [
+            EconomicEvent(
+                name=self.name,
+                country=self.country,
+                importance=self.importance,
+                timestamp=local_timestamp(day, self.hour, self.minute, self.zone),
+                assets=self.assets,
+                description=self.description,
+                source="recurring"
+            )
+            for day in days if start <= day <= end
+        ]
+
+class RecurringCalendar:
+    """Règles d'un fichier JSON, expansions mises en cache par plage
+
+    Le fichier est relu quand il change sur disque (le cache est alors vidé).
+    """
+
+    def __init__(self, path, cache_size=64):
+        self.path = path
+        self.cache_size = cache_size
+        self._mtime = None
+        self._rules = []
+        self._cache = OrderedDict()
+
+    @property
+    def rules(self):
+        mtime = os.stat(self.path).st_mtime
+        if mtime != self._mtime:
+            with open(self.path, encoding="utf-8") as f:
+                self._rules = [RecurringRule.from_dict(entry) for entry in json.load(f)]
+            self._mtime = mtime
+            self._cache.clear()
+        return self._rules
+
+    def expand(self, start, end):
+        """Annonces de toutes les règles dans [start, end], triées par heure"""
+        rules = self.rules
+        key = (start, end)
+        events = self._cache.get(key)
+        if events is not None:
+            self._cache.move_to_end(key)
+            return events
+
+        events = tuple(sorted((event for rule in rules for event in rule.expand(start, end)), key=lambda e: e.timestamp))
+        self._cache[key] = events
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return events
@@ -0,0 +1,208 @@
+import asyncio
+import re
+import time
+from collections import deque
+from datetime import datetime, timedelta
+from email.utils import parsedate_to_datetime
+from apscheduler.jobstores.base import JobLookupError
+from apscheduler.triggers.date import DateTrigger
+from metrics import percentiles
+from timeutils import PARIS, UTC, to_timestamp
+
+NUMBER_PATTERN = re.compile(r"^([-+−]?\d+(?:[.,]\d+)?)\s*([%KMBT]?)", re.IGNORECASE)
+
+def parse_value(text):
+    """Convertit "3.2%", "-150K", "1.2B" en float (None si non numérique)"""
+    match = NUMBER_PATTERN.match((text or '').strip())
+    if not match:
+        return None
+    number = float(match.group(1).replace('−', '-').replace(',', '.'))
+    return number * {'K': 1e3, 'M': 1e6, 'B': 1e9, 'T': 1e12}.get(match.group(2).upper(), 1)
+
+def format_release(event, values):
+    """Message Discord d'une publication: actual vs consensus et surprise"""
+    actual = values.get('actual')
+    consensus = values.get('consensus') or values.get('forecast')
+    lines = [
+        f"📢 **{event.flag} {event.name}** ({event.time_paris} Paris)",
+        f"Actuel: **{actual}** | Consensus: {consensus or 'n/a'} | Précédent: {values.get('previous') or 'n/a'}"
+    ]
+
+    actual_value, consensus_value = parse_value(actual), parse_value(consensus)
+    if actual_value is not None and consensus_value is not None:
+        surprise = actual_value - consensus_value
+        if surprise > 0:
+            lines.append(f"📈 Surprise: +{surprise:g} au-dessus du consensus")
+        elif surprise < 0:
+            lines.append(f"📉 Surprise: {surprise:g} sous le consensus")
+        else:
+            lines.append("➖ Conforme au consensus")
+
+    lines.append(f"📊 Assets: `{' '.join(event.assets[:5])}`")
+    return "\n".join(lines)
+
+class ReleasePoller:
+    """Suivi en direct des publications: poll adaptatif autour de l'heure prévue
+
+    Un job par créneau (toutes les annonces d'une même heure partagent la même
+    page) démarre START_BEFORE secondes avant l'heure: poll lent, puis toutes
+    les FAST_INTERVAL secondes à partir de T-10 s jusqu'à ce que la valeur
+    actual apparaisse. Les requêtes sont conditionnelles (ETag/Last-Modified)
+    et seules les lignes suivies sont parsées.
+    """
+
+    START_BEFORE = 120    # s avant l'heure prévue
+    SLOW_INTERVAL = 30    # s entre deux polls avant T-10 s
+    FAST_INTERVAL = 2     # s entre deux polls à partir de T-10 s
+    LATE_INTERVAL = 10    # s entre deux polls après T+2 min
+    GIVE_UP_AFTER = 900   # s après l'heure prévue
+
+    def __init__(self, scheduler, scraper):
+        self.scheduler = scheduler
+        self.scraper = scraper
+        self._func = None
+        self._args = ()
+        self._jobs = {}  # job_id -> (heure de démarrage, row_ids, créneau epoch)
+        self._watching = set()  # job_ids dont le suivi est en cours
+        self.lags = deque(maxlen=200)
+        self.polls = 0
+        self.not_modified = 0
+
+    def bind(self, func, args=()):
+        """Coroutine appelée pour publier: func(*args, event, message)"""
+        self._func = func
+        self._args = tuple(args)
+
+    def sync(self, events, start=None, end=None, now=None):
+        """Planifie un suivi par créneau horaire; ne touche qu'aux créneaux modifiés
+
+        Seuls les créneaux de [start, end[ peuvent être retirés (plage du
+        rafraîchissement); sans plage, events fait référence pour tous. Un
+        créneau en cours de suivi n'est ni retiré ni replanifié.
+        """
+        if self._func is None:
+            return
+
+        now = now or datetime.now(PARIS)
+        start_ts = to_timestamp(start) if start is not None else float("-inf")
+        end_ts = to_timestamp(end) if end is not None else float("inf")
+        slots = {}
+        for event in events:
+            if event.row_id and not event.actual and event.timestamp > now.timestamp():
+                slots.setdefault(event.datetime, []).append(event)
+
+        desired = {f"release:{slot.isoformat()}": (slot, slot_events) for slot, slot_events in slots.items()}
+
+        for job_id in list(self._jobs):
+            if job_id not in desired and job_id not in self._watching and start_ts <= self._jobs[job_id][2] < end_ts:
+                self._remove(job_id)
+
+        for job_id, (slot, slot_events) in desired.items():
+            row_ids = frozenset(e.row_id for e in slot_events)
+            run_time = max(slot - timedelta(seconds=self.START_BEFORE), now + timedelta(seconds=1))
+            if job_id in self._watching or (job_id in self._jobs and self._jobs[job_id][1] == row_ids):
+                continue
+            self.scheduler.add_job(
+                self.watch,
+                DateTrigger(run_date=run_time),
+                args=[slot_events],
+                id=job_id,
+                replace_existing=True,
+                misfire_grace_time=self.START_BEFORE
+            )
+            self._jobs[job_id] = (run_time, row_ids, slot.timestamp())
+
+    def _remove(self, job_id):
+        self._jobs.pop(job_id, None)
+        try:
+            self.scheduler.remove_job(job_id)
+        except JobLookupError:
+            pass
+
+    def _interval(self, target):
+        """Intervalle avant le prochain poll selon la distance à l'heure prévue"""
+        remaining = (target - datetime.now(target.tzinfo)).total_seconds()
+        if remaining > 10:
+            return min(self.SLOW_INTERVAL, remaining - 10)
+        if remaining > -120:
+            return self.FAST_INTERVAL
+        return self.LATE_INTERVAL
+
+    async def watch(self, events):
+        """Poll la page du jour jusqu'à la publication de chaque annonce du créneau"""
+        target = events[0].datetime
+        job_id = f"release:{target.isoformat()}"
+        # Créneau marqué en cours jusqu'à la fin du suivi: une synchro pendant la fenêtre ne le replanifie pas
+        self._watching.add(job_id)
+        try:
+            await self._watch(target, events)
+        finally:
+            self._watching.discard(job_id)
+            self._jobs.pop(job_id, None)
+
+    async def _watch(self, target, events):
+        pending = {event.row_id: event for event in events}
+        day = target.astimezone(UTC).date().isoformat()
+        params = {'d1': day, 'd2': day}
+        validators = {}
+        last_empty_poll = time.time()
+
+        while pending and (datetime.now(target.tzinfo) - target).total_seconds() < self.GIVE_UP_AFTER:
+            try:
+                poll_time = time.time()
+                self.polls += 1
+                status, content, validators = await self.scraper.fetch_conditional(params, validators)
+                if status == 304:
+                    self.not_modified += 1
+                else:
+                    values = await self.scraper.parse_release_values_async(content, set(pending))
+                    for row_id, row_values in values.items():
+                        if row_values.get('actual') and row_id in pending:
+                            await self._publish(pending.pop(row_id), row_values, validators, last_empty_poll, poll_time)
+                # Page inchangée (304) ou sans nouvelle valeur: dernier instant connu sans publication
+                last_empty_poll = poll_time
+            except Exception as e:
+                print(f"⚠️ Erreur suivi publication {target:%H:%M}: {e!r}")
+
+            await asyncio.sleep(self._interval(target))
+
+        for event in pending.values():
+            print(f"⚠️ Pas de valeur publiée pour {event.name} ({target:%H:%M})")
+
+    async def _publish(self, event, values, validators, last_empty_poll, detected_at):
+        """Poste la publication et mesure le délai mise à jour de la page → message"""
+        await self._func(*self._args, event, format_release(event, values))
+        posted_at = time.time()
+
+        # Last-Modified donne l'heure de mise à jour; à défaut, le dernier poll sans valeur la borne
+        updated_at = last_empty_poll
+        if validators.get('last_modified'):
+            try:
+                updated_at = max(updated_at, parsedate_to_datetime(validators['last_modified']).timestamp())
+            except (TypeError, ValueError):
+                pass
+
+        lag = {
+            'update_to_post': posted_at - updated_at,
+            'detect_to_post': posted_at - detected_at,
+            'scheduled_to_post': posted_at - event.timestamp
+        }
+        self.lags.append(lag)
+        print(
+            f"⏱️ Publication {event.name}: ≤{lag['update_to_post']:.1f}s après mise à jour "
+            f"({lag['detect_to_post']:.2f}s détection → Discord, T+{lag['scheduled_to_post']:.1f}s)"
+        )
+
+    def stats(self):
+        """Délais mise à jour → message (p50/p95/max) et compteurs de polls"""
+        delays = [lag['update_to_post'] for lag in self.lags]
+        result = {
+            'scheduled': len(self._jobs) - len(self._watching),
+            'watching': len(self._watching),
+            'polls': self.polls,
+            'not_modified': self.not_modified,
+            'published': len(delays)
+        }
+        if delays:
+            result.update(percentiles(delays))
+        return result
@@ -0,0 +1,141 @@
+import heapq
+import time
+from collections import deque
+from datetime import datetime, timedelta
+from apscheduler.jobstores.base import JobLookupError
+from apscheduler.triggers.date import DateTrigger
+from metrics import percentiles
+from timeutils import PARIS, to_timestamp
+
+class ReminderScheduler:
+    """Rappels par annonce (T-60 / T-5 min) planifiés en jobs DateTrigger
+
+    sync() compare les annonces d'une plage aux jobs déjà planifiés et n'ajoute,
+    ne remplace ou ne retire que ce qui a changé dans cette plage. Les prochains rappels sont
+    gardés dans une file triée par heure (heap) pour consultation.
+    """
+
+    OFFSETS = (60, 5)  # minutes avant l'annonce
+    MISFIRE_GRACE = 120  # secondes
+
+    def __init__(self, scheduler, offsets=OFFSETS):
+        self.scheduler = scheduler
+        self.offsets = offsets
+        self._func = None
+        self._args = ()
+        self._jobs = {}   # job_id -> heure de déclenchement
+        self._events = {}  # job_id -> annonce passée au job
+        self._heap = []   # (heure, job_id), entrées périmées ignorées à la lecture
+        self.latencies = deque(maxlen=200)
+
+    def bind(self, func, args=()):
+        """Coroutine appelée pour chaque rappel: func(*args, event, minutes_before, target_time)"""
+        self._func = func
+        self._args = tuple(args)
+
+    @staticmethod
+    def job_id(event, minutes_before):
+        # Un job par publication: CPI MoM et YoY à la même heure ont chacune leur rappel
+        return f"reminder:{minutes_before}:{event.source}:{event.datetime.date().isoformat()}:{event.release_id}"
+
+    def sync(self, events, start=None, end=None, now=None):
+        """Met les jobs de rappel en phase avec les annonces de [start, end[; retourne (ajoutés, modifiés, retirés)
+
+        Un job est remplacé si son heure ou l'annonce (nom, assets, importance...) a changé. Seuls les rappels d'annonces de la plage peuvent être retirés: le
+        rafraîchissement du jour ne touche pas aux rappels des jours suivants.
+        Sans plage, events fait référence pour tous les rappels.
+        """
+        if self._func is None:
+            return (0, 0, 0)
+
+        now = now or datetime.now(PARIS)
+        start_ts = to_timestamp(start) if start is not None else float("-inf")
+        end_ts = to_timestamp(end) if end is not None else float("inf")
+        desired = {}
+        for event in events:
+            for minutes_before in self.offsets:
+                run_time = event.datetime - timedelta(minutes=minutes_before)
+                if run_time > now:
+                    desired[self.job_id(event, minutes_before)] = (run_time, event, minutes_before)
+
+        added = updated = removed = 0
+
+        for job_id in list(self._jobs):
+            if job_id not in desired and start_ts <= self._events[job_id].timestamp < end_ts:
+                self._remove(job_id)
+                removed += 1
+
+        for job_id, (run_time, event, minutes_before) in desired.items():
+            scheduled = self._jobs.get(job_id)
+            if scheduled == run_time and self._events[job_id] == event:
+                continue
+            if scheduled is not None:
+                self._remove(job_id)
+                updated += 1
+            else:
+                added += 1
+            self.scheduler.add_job(
+                self._run,
+                DateTrigger(run_date=run_time),
+                args=[event, minutes_before, run_time],
+                id=job_id,
+                replace_existing=True,
+                misfire_grace_time=self.MISFIRE_GRACE
+            )
+            self._jobs[job_id] = run_time
+            self._events[job_id] = event
+            if scheduled != run_time:
+                heapq.heappush(self._heap, (run_time, job_id))
+
+        if added or updated or removed:
+            print(f"⏰ Rappels: {added} ajoutés, {updated} modifiés, {removed} retirés ({len(self._jobs)} planifiés)")
+        return (added, updated, removed)
+
+    def upcoming(self, n=5):
+        """Les n prochains rappels planifiés: [(heure, job_id)]"""
+        # Entrées périmées (job retiré, déplacé ou exécuté) purgées en tête de file
+        while self._heap and self._jobs.get(self._heap[0][1]) != self._heap[0][0]:
+            heapq.heappop(self._heap)
+        if len(self._heap) > 2 * len(self._jobs) + 64:
+            self._heap = [(t, job_id) for job_id, t in self._jobs.items()]
+            heapq.heapify(self._heap)
+
+        # Parcours du tas par ordre croissant (frontière des indices): seules les entrées lues sont triées
+        result = []
+        seen = set()
+        frontier = [(self._heap[0], 0)] if self._heap else []
+        while frontier and len(result) < n:
+            entry, index = heapq.heappop(frontier)
+            if self._jobs.get(entry[1]) == entry[0] and entry[1] not in seen:
+                seen.add(entry[1])
+                result.append(entry)
+            for child in (2 * index + 1, 2 * index + 2):
+                if child < len(self._heap):
+                    heapq.heappush(frontier, (self._heap[child], child))
+        return result
+
+    def _remove(self, job_id):
+        self._jobs.pop(job_id, None)
+        self._events.pop(job_id, None)
+        try:
+            self.scheduler.remove_job(job_id)
+        except JobLookupError:
+            pass
+
+    async def _run(self, event, minutes_before, target_time):
+        job_id = self.job_id(event, minutes_before)
+        self._jobs.pop(job_id, None)
+        self._events.pop(job_id, None)
+
+        await self._func(*self._args, event, minutes_before, target_time)
+
+        latency = time.time() - target_time.timestamp()
+        self.latencies.append(latency)
+        print(f"⏱️ Rappel T-{minutes_before} {event.name}: posté {latency:.2f}s après l'heure cible")
+
+    def stats(self):
+        """Latence heure cible → message posté (p50/p95/max, secondes)"""
+        result = {'scheduled': len(self._jobs), 'sent': len(self.latencies)}
+        if self.latencies:
+            result.update(percentiles(self.latencies))
+        return result
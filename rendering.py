@@ -0,0 +1,144 @@
+"""Rendu des agendas: cache par empreinte du contenu et pagination Discord
+
+Un rendu (pages d'embeds ou de texte) est indexé par l'empreinte de ce qu'il
+affiche: annonces, jours fériés, langue, état du calendrier. Un contenu
+identique n'est pas reconstruit; chaque page a sa propre empreinte pour que
+la publication n'édite que les messages qui changent.
+"""
+import hashlib
+import json
+from collections import OrderedDict
+from dataclasses import dataclass
+import discord
+
+# Limites Discord
+MAX_FIELDS = 25
+MAX_EMBED_CHARS = 6000
+MAX_FIELD_NAME = 256
+MAX_FIELD_VALUE = 1024
+MAX_MESSAGE_CHARS = 2000
+
+def digest(*parts):
+    """Empreinte stable d'un contenu (tuples, chaînes, nombres)"""
+    return hashlib.sha1(repr(parts).encode()).hexdigest()
+
+def event_signature(event):
+    """Ce qui est affiché d'une annonce"""
+    return (event.timestamp, event.country, event.name, event.importance, event.assets, event.description)
+
+@dataclass(frozen=True, slots=True)
+class Page:
+    """Un message: texte et/ou embed, avec l'empreinte de son contenu"""
+    content: str = None
+    embed: discord.Embed = None
+    digest: str = ""
+
+    @classmethod
+    def of(cls, content=None, embed=None):
+        payload = json.dumps(embed.to_dict(), sort_keys=True, ensure_ascii=False) if embed is not None else ""
+        return cls(content, embed, digest(content, payload))
+
+@dataclass(frozen=True, slots=True)
+class Rendered:
+    """Rendu complet: empreinte du contenu affiché et pages dans l'ordre d'envoi"""
+    digest: str
+    pages: tuple
+
+    @classmethod
+    def text(cls, content):
+        return cls(digest("text", content), (Page.of(content),))
+
+    @classmethod
+    def embeds(cls, key, embeds):
+        return cls(key, tuple(Page.of(embed=embed) for embed in embeds))
+
+def split_lines(lines, limit=MAX_FIELD_VALUE):
+    """Regroupe des lignes (avec leur \\n) en blocs d'au plus limit caractères
+
+    Les lignes ne sont jamais coupées, sauf une ligne seule plus longue que
+    la limite (tronquée avec "…").
+    """
+    chunks, current, size = [], [], 0
+    for line in lines:
+        if len(line) > limit:
+            line = line[:limit - 1] + "…"
+        if current and size + len(line) > limit:
+            chunks.append("".join(current))
+            current, size = [], 0
+        current.append(line)
+        size += len(line)
+    if current:
+        chunks.append("".join(current))
+    return chunks
+
+def paginate(fields, title, description=None, footer=None, color=None):
+    """Embeds respectant les limites Discord (25 champs, 6000 caractères)
+
+    fields: [(nom, valeur)] dont chaque valeur fait au plus 1024 caractères
+    (voir split_lines). La description n'est que sur la première page; le
+    titre est numéroté (1/3) quand il y a plusieurs pages.
+    """
+    # Titre numéroté et pied de page sur chaque page
+    reserved = len(title) + len(" (99/99)") + len(footer or "")
+    pages, current, size = [], [], 0
+    for name, value in fields:
+        name = name[:MAX_FIELD_NAME]
+        budget = MAX_EMBED_CHARS - reserved - (len(description or "") if not pages else 0)
+        if current and (len(current) == MAX_FIELDS or size + len(name) + len(value) > budget):
+            pages.append(current)
+            current, size = [], 0
+        current.append((name, value))
+        size += len(name) + len(value)
+    if current or not pages:
+        pages.append(current)
+
+    embeds = []
+    for index, page_fields in enumerate(pages):
+        embed = discord.Embed(
+            title=title if len(pages) == 1 else f"{title} ({index + 1}/{len(pages)})",
+            color=color,
+            description=description if index == 0 else None
+        )
+        for name, value in page_fields:
+            embed.add_field(name=name, value=value, inline=False)
+        if footer:
+            embed.set_footer(text=footer)
+        embeds.append(embed)
+    return embeds
+
+class RenderCache:
+    """Rendus récents indexés par empreinte (LRU)"""
+
+    def __init__(self, size=128):
+        self.size = size
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, render):
+        """Rendu de key, construit par render() s'il n'est pas en cache"""
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+        self.misses += 1
+        entry = self._entries[key] = render()
+        if len(self._entries) > self.size:
+            self._entries.popitem(last=False)
+        return entry
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
+
+# Cache partagé (schedulers, utils)
+render_cache = RenderCache()
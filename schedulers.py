@@ -1,188 +1,496 @@
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
-from datetime import datetime
-from zoneinfo import ZoneInfo
+from apscheduler.triggers.interval import IntervalTrigger
+import asyncio
+import time
+from collections import Counter
+from datetime import datetime, timedelta
 from discord_events import DiscordEventManager
 from scraper import TradingEconomicsScraper
-from utils import get_hardcoded_events
+from calendar_cache import CalendarCache
+from sources import CalendarAggregator, TradingEconomicsSource, RecurringSource, FileSource
+from event_store import EventStore
+from sqlite_store import SQLiteStore
+from subscriptions import SubscriptionRegistry
+from recurring import RecurringCalendar
+from models import Subscription
+from config import (
+    CALENDAR_CACHE_TTL, PUBLISH_CONCURRENCY, LIVE_RELEASES, EVENTS_DB, EVENTS_RETENTION_DAYS, CALENDAR_FILE, RECURRING_FILE,
+    SOURCES_DEADLINE, PERF_METRICS, METRICS_PORT, CHANNEL_ID, GUILD_ID
+)
+from metrics import metrics
+from publish_queue import publish_queue
+from rendering import MAX_FIELD_VALUE, Rendered, digest, event_signature, paginate, render_cache, split_lines
+from reminders import ReminderScheduler
+from release_poller import ReleasePoller
+from utils import format_daily_reminder, labels
 from market_holidays import MarketHolidays
+from timeutils import PARIS
 import discord
 
 scheduler = AsyncIOScheduler()
 scraper = TradingEconomicsScraper()
+calendar_cache = CalendarCache(scraper, ttl=CALENDAR_CACHE_TTL)
+# Par ordre de priorité pour la fusion des doublons
+aggregator = CalendarAggregator(
+    [TradingEconomicsSource(calendar_cache), RecurringSource(RecurringCalendar(RECURRING_FILE))]
+    + ([FileSource(CALENDAR_FILE)] if CALENDAR_FILE else []),
+    deadline=SOURCES_DEADLINE
+)
+event_store = EventStore()
+sqlite_store = SQLiteStore(EVENTS_DB)
+subscriptions = SubscriptionRegistry(sqlite_store, GUILD_ID, CHANNEL_ID)
+reminders = ReminderScheduler(scheduler)
+release_poller = ReleasePoller(scheduler, scraper)
 
-async def send_weekly_agenda(bot, channel_id, guild_id):
-    """Envoie le message de l'agenda + crée les Discord Events"""
-    channel = bot.get_channel(channel_id)
+async def refresh_events(days_ahead):
+    """Met à jour event_store (toutes les sources en parallèle) et retourne la plage [début, fin["""
+    start_date, end_date = scraper.get_date_range(days_ahead)
+    
+    # Une source en échec garde ses annonces déjà connues
+    events, failed = await aggregator.fetch(
+        start_date, end_date, previous=event_store.range(start_date, end_date + timedelta(days=1))
+    )
+    end_date += timedelta(days=1)
+    event_store.replace_range(start_date, end_date, events)
     
-    print("📅 Début scraping TradingEconomics...")
+    # Écriture incrémentale sur disque (seules les annonces modifiées sont réécrites)
+    if len(failed) < len(aggregator.sources):
+        written, deleted = sqlite_store.sync_range(start_date, end_date, event_store.range(start_date, end_date))
+        if written or deleted:
+            print(f"💾 Store disque: {written} annonces écrites, {deleted} supprimées")
+        purged = sqlite_store.purge_before(start_date - timedelta(days=EVENTS_RETENTION_DAYS))
+        if purged:
+            print(f"🧹 Store disque: {purged} annonces de plus de {EVENTS_RETENTION_DAYS} jours supprimées")
     
-    hardcoded_events = get_hardcoded_events()
-    scraped_events = scraper.get_calendar_events(days_ahead=7)
+    # Rappels par annonce: seuls les jobs qui changent sont touchés
+    reminders.sync(event_store.range(start_date, end_date), start_date, end_date)
+    release_poller.sync(event_store.range(start_date, end_date), start_date, end_date)
+    
+    return start_date, end_date
+
+def warm_start(days_ahead=7):
+    """Recharge la semaine et les jours fériés depuis le disque (avant tout scraping)"""
+    started = time.perf_counter()
+    
+    holidays = sqlite_store.load_holidays()
+    for year, tables in holidays.items():
+        if "US" in tables and "UK" in tables:
+            MarketHolidays.preload(year, tables["US"], tables["UK"])
+    for year in {datetime.now(PARIS).year + offset for offset in (0, 1)} - set(holidays):
+        table = MarketHolidays._year_table(year)
+        sqlite_store.save_holidays(year, {"US": table["US"], "UK": table["UK"]})
+    
+    start_date, end_date = scraper.get_date_range(days_ahead)
+    end_date += timedelta(days=1)
+    events = sqlite_store.load_range(start_date, end_date)
+    event_store.replace_range(start_date, end_date, events)
+    
+    # Un scraping récent sert aussi de cache: !agenda n'attend pas le réseau
+    synced_at = sqlite_store.last_sync(start_date, end_date)
+    if synced_at is not None:
+        calendar_cache.seed(
+            start_date, end_date - timedelta(days=1),
+            [e for e in events if e.source != 'recurring'],
+            age=time.time() - synced_at
+        )
     
-    all_events = {**hardcoded_events, **scraped_events}
+    print(f"💾 Démarrage à chaud: {len(events)} annonces relues en {(time.perf_counter() - started) * 1000:.1f} ms")
+    return len(events)
+
+async def send_event_reminder(bot, event, minutes_before, target_time):
+    """Envoie le rappel d'une annonce aux salons concernés (job DateTrigger à T-minutes_before)"""
+    content = format_daily_reminder(event, minutes_before)
+    await fan_out(bot, subscriptions.matching(event), lambda channel, _: send_to_channel(channel, content))
+
+async def send_release(bot, event, message):
+    """Publie un résultat (actual vs consensus) dès sa détection dans les salons concernés"""
+    await fan_out(bot, subscriptions.matching(event), lambda channel, _: send_to_channel(channel, message))
+
+async def send_to_channel(channel, content=None, embed=None):
+    """Envoie un message via la file de publication (rate-limit, retries)"""
+    return await publish_queue.submit(
+        f"channel:{channel.id}",
+        lambda: channel.send(content, embed=embed),
+        label=f"message #{channel.id}"
+    )
+
+async def send_pages(channel, rendered):
+    """Envoie les pages d'un rendu dans l'ordre; retourne les messages"""
+    return [await send_to_channel(channel, page.content, embed=page.embed) for page in rendered.pages]
+
+async def fan_out(bot, targets, deliver):
+    """Publie en parallèle pour plusieurs abonnements; un salon en échec n'arrête pas les autres
+
+    deliver(channel, subscription): coroutine de publication d'un salon.
+    Retourne {abonnement: résultat de deliver} pour les salons réussis.
+    """
+    async def run(subscription):
+        channel = bot.get_channel(subscription.channel_id)
+        if channel is None:
+            raise LookupError(f"salon introuvable (guild {subscription.guild_id})")
+        return await deliver(channel, subscription)
+
+    results = await asyncio.gather(*(run(subscription) for subscription in targets), return_exceptions=True)
+    delivered = {}
+    for subscription, result in zip(targets, results):
+        if isinstance(result, Exception):
+            print(f"❌ Envoi impossible #{subscription.channel_id}: {result}")
+        else:
+            delivered[subscription] = result
+    return delivered
+
+async def send_weekly_agendas(bot):
+    """Agenda hebdomadaire de tous les abonnés: un scraping, un rendu par filtre, envois en parallèle"""
+    with metrics.span("agenda"):
+        await _send_weekly_agendas(bot, subscriptions.all())
+
+async def send_weekly_agenda(bot, channel_id, guild_id):
+    """Agenda d'un salon (!agenda) + Discord Events de sa guild
+
+    Retourne "posted", "edited" ou "unchanged" (voir publish_agenda), None en cas d'échec.
+    """
+    subscription = subscriptions.get(channel_id) or Subscription(guild_id, channel_id)
+    with metrics.span("agenda"):
+        return (await _send_weekly_agendas(bot, [subscription])).get(subscription)
+
+async def _send_weekly_agendas(bot, targets):
+    print(f"📅 Début scraping TradingEconomics ({len(targets)} salon(s))...")
     
-    print(f"📊 Total événements: {len(all_events)}")
+    start_date, end_date = await refresh_events(days_ahead=7)
+    all_events = event_store.range(start_date, end_date)
+    healthy = calendar_cache.healthy
     
-    await DiscordEventManager.create_events_for_week(bot, guild_id, all_events)
+    print(f"📊 Total événements: {len(all_events)} | Cache: {calendar_cache.stats()}")
     
-    if not all_events:
-        await channel.send("❌ Aucun événement économique majeur cette semaine")
-        return
+    # Messages d'abord: la création des Discord Events ne les retarde pas
+    statuses = await publish_agendas(bot, targets, start_date, end_date, healthy)
+    counts = Counter(statuses.values())
+    print(
+        f"✅ Agenda: {counts['posted']} publié(s), {counts['edited']} édité(s), {counts['unchanged']} inchangé(s) "
+        f"sur {len(targets)} salon(s) | Publication: {publish_queue.stats()}"
+    )
     
-    embed = discord.Embed(
-        title="📅 Agenda Économique - Semaine du " + datetime.now(ZoneInfo("Europe/Paris")).strftime("%d/%m/%Y"),
-        color=discord.Color.blue(),
-        description="Toutes les annonces sont créées en Discord Events ⬇️\n*Clique 'Participer' pour recevoir des notifications*"
+    # Sans calendrier à jour, la réconciliation supprimerait des Discord Events valides
+    if healthy:
+        guilds = {}
+        for subscription in targets:
+            guilds.setdefault(subscription.guild_id, []).append(subscription)
+        # Filtres de la guild: ceux de tous ses salons abonnés, pas seulement des salons servis ici
+        by_guild = subscriptions.by_guild()
+        results = await asyncio.gather(*(
+            DiscordEventManager.create_events_for_week(
+                bot, guild_id,
+                SubscriptionRegistry.select(all_events, by_guild.get(guild_id, guild_targets)),
+                store=sqlite_store
+            )
+            for guild_id, guild_targets in guilds.items()
+        ), return_exceptions=True)
+        for guild_id, result in zip(guilds, results):
+            if isinstance(result, Exception):
+                print(f"❌ Discord Events guild {guild_id}: {result}")
+    return statuses
+
+async def publish_agendas(bot, targets, start_date, end_date, healthy=True):
+    """Un rendu par combinaison de filtres, partagé par les salons concernés, publiés en parallèle
+
+    Retourne {abonnement: "posted" | "edited" | "unchanged"}.
+    """
+    week = _week_start(start_date).isoformat()
+    rendered = {}
+    for subscription in targets:
+        if subscription.filter_key not in rendered:
+            rendered[subscription.filter_key] = _agenda_message(start_date, end_date, healthy, subscription)
+    return await fan_out(
+        bot, targets, lambda channel, subscription: publish_agenda(channel, week, rendered[subscription.filter_key])
     )
+
+async def publish_agenda(channel, week, rendered):
+    """Publie l'agenda d'un salon en réutilisant les messages de la semaine
+
+    Contenu identique au dernier publié: rien n'est envoyé ("unchanged").
+    Même semaine: seules les pages modifiées sont éditées, les pages en plus
+    envoyées, celles en trop supprimées ("edited"). Nouvelle semaine:
+    nouveaux messages ("posted").
+    """
+    previous = sqlite_store.agenda_messages(channel.id)
+    if previous is None or previous[0] != week:
+        messages = await send_pages(channel, rendered)
+        posted = [(message.id, page.digest) for message, page in zip(messages, rendered.pages)]
+        status = "posted"
+    elif previous[1] == rendered.digest:
+        return "unchanged"
+    else:
+        posted = []
+        known = previous[2]
+        for index, page in enumerate(rendered.pages):
+            if index >= len(known):
+                message_id = (await send_to_channel(channel, page.content, embed=page.embed)).id
+            elif known[index][1] != page.digest:
+                message_id = await _edit_message(channel, known[index][0], page)
+            else:
+                message_id = known[index][0]
+            posted.append((message_id, page.digest))
+        for message_id, _ in known[len(rendered.pages):]:
+            await _delete_message(channel, message_id)
+        status = "edited"
+    sqlite_store.save_agenda_messages(channel.id, week, rendered.digest, posted)
+    return status
+
+async def _edit_message(channel, message_id, page):
+    """Édite un message publié; s'il a été supprimé entre-temps, en envoie un nouveau"""
+    message = channel.get_partial_message(message_id)
+    try:
+        await publish_queue.submit(
+            f"channel:{channel.id}",
+            lambda: message.edit(content=page.content, embed=page.embed),
+            label=f"édition #{channel.id}"
+        )
+        return message_id
+    except discord.NotFound:
+        return (await send_to_channel(channel, page.content, embed=page.embed)).id
+
+async def _delete_message(channel, message_id):
+    message = channel.get_partial_message(message_id)
+    try:
+        await publish_queue.submit(f"channel:{channel.id}", message.delete, label=f"suppression #{channel.id}")
+    except discord.NotFound:
+        pass
+
+def _week_start(day):
+    return day - timedelta(days=day.weekday())
+
+def _agenda_message(start_date, end_date, healthy, subscription):
+    """Rendu de l'agenda pour un filtre d'abonnement (texte si aucune annonce)"""
+    text = labels(subscription.language)
+    if not any(subscription.matches(event) for event in event_store.range(start_date, end_date)):
+        return Rendered.text(text["no_events"] if healthy else text["unavailable"])
+    return build_weekly_pages(start_date, end_date, healthy=healthy, subscription=subscription)
+
+def build_weekly_pages(start_date, end_date, healthy=True, subscription=None):
+    """Agenda de [start_date, end_date[ (event_store, filtré par l'abonnement) en pages d'embeds
+
+    Le rendu est mis en cache par empreinte des annonces et jours fériés affichés.
+    """
+    with metrics.span("render"):
+        days = _filtered_days(start_date, end_date, subscription)
+        language = subscription.language if subscription else "fr"
+        with metrics.span("holidays"):
+            day_holidays = {
+                date_str: MarketHolidays.is_market_holiday(datetime.fromisoformat(date_str).date())
+                for date_str in days
+            }
+            upcoming_holidays = MarketHolidays.get_upcoming_holidays(days_ahead=7)
+        key = digest(
+            "weekly", language, healthy, start_date,
+            [(date_str, day_holidays[date_str], [event_signature(e) for e in day_events]) for date_str, day_events in days.items()],
+            [(holiday['date'], holiday['holidays']) for holiday in upcoming_holidays]
+        )
+        return render_cache.get(
+            key, lambda: Rendered.embeds(key, _weekly_embeds(start_date, days, day_holidays, upcoming_holidays, healthy, language))
+        )
+
+def _filtered_days(start_date, end_date, subscription):
+    days = event_store.by_day(start_date, end_date)
+    if subscription is None:
+        return days
+    filtered = {}
+    for date_str, day_events in days.items():
+        day_events = [event for event in day_events if subscription.matches(event)]
+        if day_events:
+            filtered[date_str] = day_events
+    return filtered
+
+def _weekly_embeds(start_date, days, day_holidays, upcoming_holidays, healthy, language):
+    text = labels(language)
+    description = text["weekly_description"]
+    if not healthy:
+        description += text["stale"]
     
-    sorted_events = sorted(all_events.items(), key=lambda x: x[0])
-    
-    for date_str, event_data in sorted_events:
-        day_name = datetime.fromisoformat(date_str).strftime("%A")
-        day_fr = {
-            "Monday": "Lundi",
-            "Tuesday": "Mardi",
-            "Wednesday": "Mercredi",
-            "Thursday": "Jeudi",
-            "Friday": "Vendredi",
-            "Saturday": "Samedi",
-            "Sunday": "Dimanche"
-        }.get(day_name, day_name)
+    fields = []
+    for date_str, day_events in days.items():
+        day_name = text["days"][datetime.fromisoformat(date_str).weekday()]
         
+        lines = [
+            f"⏰ **{event_data.time_paris}** - {event_data.flag} {event_data.name}\n"
+            f"   {event_data.stars} | Assets: {', '.join(event_data.assets)}\n"
+            for event_data in day_events
+        ]
         # Vérifier si c'est un jour férié
-        date_obj = datetime.fromisoformat(date_str).date()
-        holidays = MarketHolidays.is_market_holiday(date_obj)
-        holiday_indicator = ""
+        holidays = day_holidays[date_str]
         if holidays:
-            holiday_names = " | ".join(holidays)
-            holiday_indicator = f"\n🔴 **JOUR FÉRIÉ:** {holiday_names}"
-        
-        value = (
-            f"⏰ **{event_data['time_paris']}** - {event_data['country']} {event_data['name']}\n"
-            f"   {event_data['importance']} | Assets: {', '.join(event_data['assets'])}\n"
-            f"{holiday_indicator}"
-        )
+            lines.append(f"🔴 **{text['holiday']}:** {' | '.join(holidays)}")
         
-        embed.add_field(
-            name=f"📆 {day_fr} ({date_str})",
-            value=value,
-            inline=False
-        )
+        # Limite Discord: 1024 caractères par champ, une journée chargée continue dans le champ suivant
+        for index, value in enumerate(split_lines(lines)):
+            fields.append((f"📆 {day_name} ({date_str})" + (" …" if index else ""), value))
     
     # Ajouter une section pour les jours fériés cette semaine
-    upcoming_holidays = MarketHolidays.get_upcoming_holidays(days_ahead=7)
     if upcoming_holidays:
-        holidays_text = ""
+        lines = []
         for holiday_info in upcoming_holidays:
             date_str = holiday_info['date'].strftime('%d/%m')
-            day_name = holiday_info['date'].strftime('%A')
-            day_fr = {
-                "Monday": "Lun",
-                "Tuesday": "Mar",
-                "Wednesday": "Mer",
-                "Thursday": "Jeu",
-                "Friday": "Ven",
-                "Saturday": "Sam",
-                "Sunday": "Dim"
-            }.get(day_name, day_name)
-            holidays_str = " & ".join(holiday_info['holidays'])
-            holidays_text += f"• **{day_fr} {date_str}:** {holidays_str}\n"
-        
-        embed.add_field(
-            name="🚨 Jours Fériés Cette Semaine",
-            value=holidays_text + "\n⚠️ Marchés potentiellement fermés ou volatilité réduite",
-            inline=False
-        )
+            day_name = text["days_short"][holiday_info['date'].weekday()]
+            lines.append(f"• **{day_name} {date_str}:** {' & '.join(holiday_info['holidays'])}\n")
+        lines.append("\n" + text["holidays_warning"])
+        fields.extend((text["holidays_week"], value) for value in split_lines(lines))
     
-    embed.set_footer(text="🔔 Rappels quotidiens à 7h pour chaque annonce | Données: TradingEconomics")
-    await channel.send(embed=embed)
-    print("✅ Message agenda envoyé")
+    return paginate(
+        fields,
+        title=text["weekly_title"] + start_date.strftime("%d/%m/%Y"),
+        description=description,
+        footer=text["footer"],
+        color=discord.Color.blue()
+    )
 
-async def send_daily_reminder(bot, channel_id):
-    """Envoie le rappel quotidien des annonces du jour"""
-    channel = bot.get_channel(channel_id)
+async def send_daily_reminder(bot):
+    """Envoie le rappel quotidien des annonces du jour à tous les abonnés"""
+    await refresh_events(days_ahead=1)
     
-    hardcoded_events = get_hardcoded_events()
-    scraped_events = scraper.get_calendar_events(days_ahead=1)
-    all_events = {**hardcoded_events, **scraped_events}
-    
-    today = datetime.now(ZoneInfo("Europe/Paris")).date()
-    today_str = today.isoformat()
-    today_events = {k: v for k, v in all_events.items() if k == today_str}
+    today = datetime.now(PARIS).date()
+    today_events = event_store.on_date(today)
     
     # Vérifier si c'est un jour férié
     holidays = MarketHolidays.is_market_holiday(today)
     
-    # Si c'est un jour férié SANS événement économique, envoyer un message spécial
-    if holidays and not today_events:
-        embed = discord.Embed(
-            title="🔴 Jour Férié - Marchés Fermés",
-            color=discord.Color.red(),
-            description=datetime.now(ZoneInfo("Europe/Paris")).strftime("%A %d %B %Y")
-        )
-        
-        holidays_text = "\n".join(holidays)
-        embed.add_field(
-            name="🚨 Jours Fériés",
-            value=holidays_text + "\n\n⚠️ **Les marchés US et/ou UK sont fermés aujourd'hui**\n📊 Volatilité réduite attendue",
-            inline=False
-        )
-        
-        await channel.send(embed=embed)
-        print(f"✅ Alerte jour férié envoyée: {', '.join(holidays)}")
-        return
+    # Un rendu par combinaison de filtres
+    rendered = {}
+    for filter_key, group in subscriptions.groups().items():
+        pages = _daily_pages(today, [e for e in today_events if group[0].matches(e)], holidays, group[0].language)
+        if pages is not None:
+            rendered[filter_key] = pages
     
+    targets = [subscription for subscription in subscriptions.all() if subscription.filter_key in rendered]
+    if targets:
+        sent = await fan_out(bot, targets, lambda channel, subscription: send_pages(channel, rendered[subscription.filter_key]))
+        print(f"✅ Rappel quotidien envoyé à {len(sent)} salon(s) ({len(today_events)} annonces)")
+
+def _daily_pages(today, today_events, holidays, language):
+    """Rendu du rappel quotidien (mis en cache par empreinte), ou None s'il n'y a rien à envoyer"""
     # Si pas d'événement et pas de jour férié, ne rien envoyer
+    if not today_events and not holidays:
+        return None
+    key = digest("daily", language, today, holidays, [event_signature(e) for e in today_events])
+    return render_cache.get(key, lambda: Rendered.embeds(key, _daily_embeds(today, today_events, holidays, language)))
+
+def _daily_embeds(today, today_events, holidays, language):
+    text = labels(language)
+    description = datetime.now(PARIS).strftime("%A %d %B %Y")
+    
+    # Si c'est un jour férié SANS événement économique, envoyer un message spécial
     if not today_events:
-        return
+        holidays_text = "\n".join(holidays)
+        return paginate(
+            [(text["holidays"], holidays_text + "\n\n" + text["closed"])],
+            title=text["closed_title"],
+            description=description,
+            color=discord.Color.red()
+        )
     
     # Si événements économiques, les afficher (avec alerte férié si applicable)
-    embed = discord.Embed(
-        title="🔔 Annonces Économiques Aujourd'hui",
-        color=discord.Color.gold() if not holidays else discord.Color.orange(),
-        description=datetime.now(ZoneInfo("Europe/Paris")).strftime("%A %d %B %Y")
-    )
+    fields = []
     
     # Ajouter alerte jour férié si applicable
     if holidays:
         holidays_text = " & ".join(holidays)
-        embed.add_field(
-            name="🔴 ATTENTION - Jour Férié",
-            value=f"{holidays_text}\n⚠️ **Marchés potentiellement fermés ou volatilité réduite**",
-            inline=False
-        )
+        fields.append((text["attention"], f"{holidays_text}\n**{text['holidays_warning']}**"))
     
-    for date_str, event_data in today_events.items():
-        embed.add_field(
-            name=f"{event_data['country']} {event_data['name']} - {event_data['time_paris']}",
-            value=(
-                f"**Importance:** {event_data['importance']}\n"
-                f"**Assets:** {', '.join(event_data['assets'])}\n"
-                f"{event_data['description']}"
-            ),
-            inline=False
+    for event_data in today_events:
+        value = (
+            f"**{text['importance']}:** {event_data.stars}\n"
+            f"**Assets:** {', '.join(event_data.assets)}\n"
+            f"{event_data.description}"
         )
+        fields.append((f"{event_data.flag} {event_data.name} - {event_data.time_paris}", value[:MAX_FIELD_VALUE]))
     
-    await channel.send(embed=embed)
-    print(f"✅ Rappel quotidien envoyé ({len(today_events)} annonces)")
+    return paginate(
+        fields,
+        title=text["daily_title"],
+        description=description,
+        color=discord.Color.gold() if not holidays else discord.Color.orange()
+    )
+
+def upcoming_events(limit=5, asset=None, min_importance=None):
+    """Prochaines annonces depuis le store en mémoire (!asset, !next), sans scraping"""
+    with metrics.span("query"):
+        return event_store.upcoming(datetime.now(PARIS), limit, asset=asset, min_importance=min_importance)
 
-def start_scheduler(bot, channel_id, guild_id):
-    """Démarre le planificateur"""
+def week_events(asset=None):
+    """Annonces des 7 prochains jours depuis le store en mémoire (!week), sans scraping"""
+    with metrics.span("query"):
+        now = datetime.now(PARIS)
+        return event_store.range(now, now.date() + timedelta(days=7), asset=asset)
+
+def known_assets():
+    return event_store.assets()
+
+def perf_report():
+    """Diagnostics pour !perf et l'endpoint /metrics: durées par étape, caches, files"""
+    report = metrics.stats()
+    report.update({
+        'cache': calendar_cache.stats(),
+        'publish': publish_queue.stats(),
+        'render': render_cache.stats(),
+        'sources': aggregator.last_report,
+        'reminders': reminders.stats(),
+        'releases': release_poller.stats(),
+        'store': {'events': len(event_store)},
+        'subscriptions': {'channels': len(subscriptions), 'renders': len(subscriptions.groups())}
+    })
+    return report
+
+def start_scheduler(bot):
+    """Enregistre les jobs et lance le démarrage en tâche de fond (retourne la tâche)
+
+    Appelé depuis on_ready: rend la main immédiatement, l'état est préchauffé
+    par _startup avant le démarrage du scheduler. Les jobs servent tous les
+    salons abonnés (SubscriptionRegistry).
+    """
+    publish_queue.configure(concurrency=PUBLISH_CONCURRENCY)
+    metrics.enabled = PERF_METRICS
+    if PERF_METRICS and METRICS_PORT:
+        asyncio.ensure_future(metrics.serve(METRICS_PORT, perf_report))
+    reminders.bind(send_event_reminder, args=[bot])
+    if LIVE_RELEASES:
+        release_poller.bind(send_release, args=[bot])
     
     scheduler.add_job(
-        send_weekly_agenda,
+        send_weekly_agendas,
         CronTrigger(day_of_week="mon", hour=7, minute=0, timezone="Europe/Paris"),
-        args=[bot, channel_id, guild_id],
+        args=[bot],
         id="weekly_agenda"
     )
     
     scheduler.add_job(
         send_daily_reminder,
         CronTrigger(hour=7, minute=0, timezone="Europe/Paris"),
-        args=[bot, channel_id],
+        args=[bot],
         id="daily_reminder"
     )
     
-    scheduler.start()
-    print("✅ Scheduler démarré")
+    # Rafraîchit le store (et donc les rappels) au démarrage puis régulièrement
+    scheduler.add_job(
+        refresh_events,
+        IntervalTrigger(hours=2),
+        args=[7],
+        id="refresh_events",
+        next_run_time=datetime.now(PARIS)
+    )
+    
+    return asyncio.ensure_future(_startup())
+
+async def _startup(days_ahead=7):
+    """Préchauffage après on_ready: semaine et jours fériés depuis le disque, rappels, scheduler"""
+    # on_ready se termine avant tout travail
+    await asyncio.sleep(0)
+    with metrics.span("startup"):
+        # Rappels replanifiés immédiatement à partir des données sur disque
+        warm_start(days_ahead)
+        print(f"📬 {subscriptions.load()} salon(s) abonné(s)")
+        start_date, end_date = scraper.get_date_range(days_ahead)
+        end_date += timedelta(days=1)
+        reminders.sync(event_store.range(start_date, end_date), start_date, end_date)
+        
+        # Le premier rafraîchissement (next_run_time) part dès le démarrage du scheduler
+        scheduler.start()
+    print("✅ Scheduler démarré (état préchauffé)")
@@ -1,40 +1,291 @@
-import requests
-from bs4 import BeautifulSoup
+import asyncio
+import codecs
+import aiohttp
+from concurrent.futures import ThreadPoolExecutor
+from html.parser import HTMLParser
 from datetime import datetime, timedelta
-from zoneinfo import ZoneInfo
+from classifier import classify
+from metrics import metrics
+from models import EconomicEvent, country_code
+from timeutils import UTC, local_timestamp, parse_clock, parse_date_header
+
+# Étoiles selon la classe calendar-importance-N de TradingEconomics
+IMPORTANCE_STARS = {3: 5, 2: 4, 1: 3}
+
+# Colonnes de résultat, à partir de la 5e cellule d'une calendar-row
+RELEASE_COLUMNS = ('actual', 'previous', 'consensus', 'forecast')
+
+class _StreamNode:
+    """Nœud minimal (tr/td) exposant le sous-ensemble de l'API bs4 utilisé au parsing"""
+    __slots__ = ('attrs', 'children', 'parts')
+    
+    def __init__(self, attrs):
+        self.attrs = {k: v or '' for k, v in attrs}
+        if 'class' in self.attrs:
+            self.attrs['class'] = self.attrs['class'].split()
+        self.children = []
+        self.parts = []
+    
+    def get(self, key, default=None):
+        return self.attrs.get(key, default)
+    
+    def find(self, name):
+        return self.children[0] if self.children else None
+    
+    def find_all(self, name):
+        return self.children
+    
+    def get_text(self, strip=True):
+        return "".join(self.parts)
+
+class CalendarRowExtractor(HTMLParser):
+    """Extrait en streaming les lignes du tbody de table#calendar
+    
+    Une seule ligne est en mémoire à la fois: aucun arbre du document n'est
+    construit. Le texte des tables imbriquées dans une cellule est rattaché
+    à la cellule, comme get_text() le ferait.
+    
+    HTMLParser découpe le texte là où un bloc de feed() se termine: les
+    morceaux d'un même nœud texte sont accumulés bruts et strippés une seule
+    fois à la balise suivante (comme bs4 strippe chaque nœud texte).
+    """
+    
+    def __init__(self, row_ids=None):
+        super().__init__(convert_charrefs=True)
+        # Si fourni, seules les lignes dont data-id est dans row_ids sont construites
+        self.row_ids = row_ids
+        self.found_table = False
+        self._rows = []
+        self._depth = 0  # profondeur de <table> à partir de table#calendar
+        self._in_tbody = False
+        self._row = None
+        self._cell = None
+        self._text = []  # morceaux bruts du nœud texte en cours
+    
+    def iter_rows(self, content, chunk_size=65536):
+        """Itère sur les lignes d'un document (bytes UTF-8) en le lisant par blocs"""
+        decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        for i in range(0, len(content), chunk_size):
+            self.feed(decoder.decode(content[i:i + chunk_size]))
+            yield from self._drain()
+        self.feed(decoder.decode(b'', final=True))
+        self.close()
+        self._end_row()
+        yield from self._drain()
+    
+    def _drain(self):
+        rows, self._rows = self._rows, []
+        return rows
+    
+    def _flush_text(self):
+        text = "".join(self._text).strip()
+        self._text = []
+        if text and self._cell is not None:
+            self._cell.parts.append(text)
+    
+    def _end_row(self):
+        self._flush_text()
+        if self._row is not None:
+            self._rows.append(self._row)
+        self._row = None
+        self._cell = None
+    
+    def handle_starttag(self, tag, attrs):
+        if self._text:
+            self._flush_text()
+        if self._depth == 0:
+            if tag == 'table' and ('id', 'calendar') in attrs:
+                self._depth = 1
+                self.found_table = True
+            return
+        
+        if tag == 'table':
+            self._depth += 1
+        if self._depth != 1:
+            return
+        
+        if tag == 'tbody':
+            self._in_tbody = True
+        elif tag == 'tr' and self._in_tbody:
+            self._end_row()
+            if self.row_ids is None or dict(attrs).get('data-id') in self.row_ids:
+                self._row = _StreamNode(attrs)
+        elif tag == 'td' and self._row is not None:
+            self._cell = _StreamNode(attrs)
+            self._row.children.append(self._cell)
+    
+    def handle_endtag(self, tag):
+        if self._text:
+            self._flush_text()
+        if self._depth == 0:
+            return
+        
+        if tag == 'table':
+            self._depth -= 1
+            if self._depth == 0:
+                self._end_row()
+                self._in_tbody = False
+            return
+        if self._depth != 1:
+            return
+        
+        if tag == 'td':
+            self._cell = None
+        elif tag == 'tr':
+            self._end_row()
+        elif tag == 'tbody':
+            self._end_row()
+            self._in_tbody = False
+    
+    def handle_data(self, data):
+        if self._cell is not None:
+            self._text.append(data)
 
 class TradingEconomicsScraper:
     BASE_URL = "https://tradingeconomics.com/calendar"
+    TIMEOUT = 10
     
-    def __init__(self):
+    def __init__(self, parse_mode="stream"):
+        # "stream": extraction ligne à ligne sans arbre / "strainer": soupe limitée
+        # à table#calendar / "full": soupe du document complet
+        self.parse_mode = parse_mode
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
+        # Session HTTP keep-alive partagée entre les runs (créée à la demande)
+        self._session = None
+        self._session_loop = None
+        # Le parsing BeautifulSoup tourne hors de la boucle Discord
+        self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="te-parse")
     
-    def get_calendar_events(self, days_ahead=7):
-        """Scrape le calendrier économique de TradingEconomics"""
+    async def _get_session(self):
+        """Retourne la session aiohttp de la boucle courante (pool keep-alive)"""
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._session_loop is not loop:
+            connector = aiohttp.TCPConnector(limit=4, keepalive_timeout=60, ttl_dns_cache=300)
+            self._session = aiohttp.ClientSession(
+                headers=self.headers,
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.TIMEOUT)
+            )
+            self._session_loop = loop
+        return self._session
+    
+    async def close(self):
+        """Ferme la session HTTP si elle appartient à la boucle courante"""
+        if self._session and not self._session.closed and self._session_loop is asyncio.get_running_loop():
+            await self._session.close()
+        self._session = None
+        self._session_loop = None
+    
+    @staticmethod
+    def get_date_range(days_ahead=7):
+        """Retourne la plage (d1, d2) demandée à TradingEconomics"""
+        today = datetime.now(UTC).date()
+        return today, today + timedelta(days=days_ahead)
+    
+    async def get_calendar_events_async(self, days_ahead=7):
+        """Scrape le calendrier économique de TradingEconomics sans bloquer la boucle"""
+        start_date, end_date = self.get_date_range(days_ahead)
+        return await self.fetch_range_async(start_date, end_date)
+    
+    @staticmethod
+    def _range_params(start_date, end_date):
+        return {
+            'd1': start_date.strftime('%Y-%m-%d'),
+            'd2': end_date.strftime('%Y-%m-%d')
+        }
+    
+    async def fetch_range_async(self, start_date, end_date):
+        """Scrape une plage de dates explicite (d1 → d2)"""
         try:
-            today = datetime.now(ZoneInfo("UTC"))
-            end_date = today + timedelta(days=days_ahead)
-            
-            params = {
-                'd1': today.strftime('%Y-%m-%d'),
-                'd2': end_date.strftime('%Y-%m-%d')
-            }
-            
-            response = requests.get(self.BASE_URL, params=params, headers=self.headers, timeout=10)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            return self._parse_calendar(soup)
+            events, _ = await self.fetch_range_conditional(start_date, end_date)
+            return events
         
         except Exception as e:
-            print(f"❌ Erreur scraping TradingEconomics: {e}")
-            return {}
+            print(f"❌ Erreur scraping TradingEconomics: {e!r}")
+            return []
+    
+    async def fetch_range_conditional(self, start_date, end_date, validators=None):
+        """Scrape une plage si elle a changé depuis les validateurs donnés
+        
+        Retourne (événements, validateurs); événements vaut None sur un 304.
+        Les erreurs réseau / HTTP sont propagées (gérées par CalendarCache).
+        """
+        status, content, validators = await self.fetch_conditional(
+            self._range_params(start_date, end_date), validators
+        )
+        if status == 304:
+            return None, validators
+        
+        loop = asyncio.get_running_loop()
+        events = await loop.run_in_executor(self._executor, self._parse_html, content)
+        metrics.gauge("scrape_events", len(events))
+        return events, validators
+    
+    async def fetch_conditional(self, params, validators=None):
+        """GET conditionnel (If-None-Match / If-Modified-Since)
+        
+        Retourne (status, contenu, validateurs): contenu vaut None sur un 304.
+        """
+        validators = validators or {}
+        headers = {}
+        if validators.get('etag'):
+            headers['If-None-Match'] = validators['etag']
+        if validators.get('last_modified'):
+            headers['If-Modified-Since'] = validators['last_modified']
+        
+        session = await self._get_session()
+        with metrics.span("fetch"):
+            async with session.get(self.BASE_URL, params=params, headers=headers) as response:
+                if response.status == 304:
+                    return 304, None, validators
+                response.raise_for_status()
+                content = await response.read()
+        metrics.gauge("scrape_bytes", len(content))
+        return response.status, content, {
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified')
+            }
+    
+    def get_calendar_events(self, days_ahead=7):
+        """Version synchrone (scripts) - ne pas appeler depuis la boucle du bot"""
+        async def _run():
+            try:
+                return await self.get_calendar_events_async(days_ahead)
+            finally:
+                await self.close()
+        
+        return asyncio.run(_run())
+    
+    def _parse_html(self, content):
+        """Parse le calendrier selon parse_mode (exécuté dans l'executor)"""
+        with metrics.span("parse"):
+            return self._parse_content(content)
+    
+    def _parse_content(self, content):
+        if self.parse_mode == "stream":
+            extractor = CalendarRowExtractor()
+            events = self._parse_rows(extractor.iter_rows(content))
+            if not extractor.found_table:
+                print("⚠️ Table calendrier introuvable")
+            return events
+        
+        # bs4 n'est chargé qu'au premier parsing en mode "strainer" / "full"
+        from bs4 import BeautifulSoup, SoupStrainer
+        
+        # Ne matérialise que table#calendar (pas la nav, les scripts, les pubs...)
+        parse_only = SoupStrainer('table', attrs={'id': 'calendar'}) if self.parse_mode == "strainer" else None
+        soup = BeautifulSoup(content, 'html.parser', parse_only=parse_only)
+        try:
+            return self._parse_calendar(soup)
+        finally:
+            # Libère l'arbre tout de suite plutôt qu'au prochain passage du GC
+            soup.decompose()
     
     def _parse_calendar(self, soup):
         """Parse le HTML du calendrier"""
-        events = {}
+        events = []
         
         calendar_table = soup.find('table', {'id': 'calendar'})
         
@@ -47,29 +298,35 @@ class TradingEconomicsScraper:
             print("⚠️ Tbody introuvable")
             return events
             
-        rows = tbody.find_all('tr')
+        return self._parse_rows(tbody.find_all('tr'))
+    
+    def _parse_rows(self, rows):
+        """Parse les lignes du tbody (soupe bs4 ou extraction en streaming)
+        
+        Retourne tous les événements pertinents, dans l'ordre de la page
+        """
+        events = []
         current_date = None
         
-        for row in rows:
-            if 'date' in row.get('class', []):
-                date_cell = row.find('td')
-                if date_cell:
-                    date_text = date_cell.get_text(strip=True)
-                    current_date = self._parse_date(date_text)
-                continue
-            
-            if current_date and 'calendar-row' in row.get('class', []):
-                event = self._parse_event_row(row, current_date)
-                if event:
-                    date_key = event['datetime'].date().isoformat()
-                    
-                    if date_key not in events or event['importance'] == "⭐⭐⭐⭐⭐":
-                        events[date_key] = event
+        with metrics.accumulate("classify") as timer:
+            classify_name = timer.wrap(classify)
+            for row in rows:
+                if 'date' in row.get('class', []):
+                    date_cell = row.find('td')
+                    if date_cell:
+                        date_text = date_cell.get_text(strip=True)
+                        current_date = self._parse_date(date_text)
+                    continue
+                
+                if current_date and 'calendar-row' in row.get('class', []):
+                    event = self._parse_event_row(row, current_date, classify_name)
+                    if event:
+                        events.append(event)
         
         return events
     
-    def _parse_event_row(self, row, event_date):
-        """Parse une ligne d'événement"""
+    def _parse_event_row(self, row, event_date, classify_name=classify):
+        """Parse une ligne d'événement (classify_name: classify, éventuellement chronométré)"""
         try:
             cells = row.find_all('td')
             
@@ -98,204 +355,72 @@ class TradingEconomicsScraper:
             if importance_level < 2:
                 return None
             
-            if not self._is_relevant_event(event_name):
+            classification = classify_name(event_name)
+            if not classification.relevant:
                 return None
             
-            hour, minute = self._parse_time(time_str)
-            event_datetime = datetime(
-                event_date.year, event_date.month, event_date.day,
-                hour, minute, tzinfo=ZoneInfo("America/New_York")
-            )
-            
-            event_datetime_paris = event_datetime.astimezone(ZoneInfo("Europe/Paris"))
-            
-            importance_stars = {
-                3: "⭐⭐⭐⭐⭐",
-                2: "⭐⭐⭐⭐",
-                1: "⭐⭐⭐"
-            }[importance_level]
+            hour, minute = parse_clock(time_str)
             
-            country_text = country_cell.get_text(strip=True)
-            country_flag = self._get_country_flag(country_text)
-            
-            simplified_name = self._simplify_event_name(event_name)
-            assets = self._get_affected_assets(event_name)
-            
-            return {
-                'name': simplified_name,
-                'time_paris': event_datetime_paris.strftime('%H:%M'),
-                'country': country_flag,
-                'importance': importance_stars,
-                'assets': assets,
-                'description': event_name,
-                'datetime': event_datetime_paris
-            }
+            return EconomicEvent(
+                timestamp=local_timestamp(event_date, hour, minute),
+                name=classification.name,
+                country=country_code(country_cell.get_text(strip=True)),
+                importance=IMPORTANCE_STARS[importance_level],
+                assets=classification.assets,
+                description=event_name,
+                row_id=row.get('data-id'),
+                **self._release_values(cells)
+            )
         
         except Exception as e:
             print(f"⚠️ Erreur parsing row: {e}")
             return None
     
-    def _parse_date(self, date_text):
-        """Parse le texte de date"""
-        try:
-            if ',' in date_text:
-                parts = date_text.split(',', 1)
-                date_text = parts[1].strip()
-            
-            return datetime.strptime(date_text, '%B %d, %Y')
-        except:
-            return datetime.now(ZoneInfo("UTC"))
+    @staticmethod
+    def _release_values(cells):
+        """Colonnes actual / previous / consensus / forecast d'une ligne (None si vides)"""
+        return {
+            column: (cells[index].get_text(strip=True) if len(cells) > index else '') or None
+            for index, column in enumerate(RELEASE_COLUMNS, start=4)
+        }
     
-    def _parse_time(self, time_str):
-        """Parse l'heure"""
-        try:
-            time_str = time_str.strip()
-            
-            if 'AM' in time_str or 'PM' in time_str:
-                time_obj = datetime.strptime(time_str, '%I:%M %p')
-                return time_obj.hour, time_obj.minute
-            
-            if ':' in time_str:
-                parts = time_str.split(':')
-                return int(parts[0]), int(parts[1])
-            
-            return 9, 0
+    def parse_release_values(self, content, row_ids):
+        """Lit uniquement les lignes row_ids d'une page: {row_id: {actual, previous, ...}}
         
-        except:
-            return 9, 0
+        L'extraction s'arrête dès que toutes les lignes demandées ont été vues.
+        """
+        pending = set(row_ids)
+        values = {}
+        for row in CalendarRowExtractor(row_ids=pending.copy()).iter_rows(content, chunk_size=16384):
+            row_id = row.get('data-id')
+            values[row_id] = self._release_values(row.find_all('td'))
+            pending.discard(row_id)
+            if not pending:
+                break
+        return values
+    
+    async def parse_release_values_async(self, content, row_ids):
+        """parse_release_values dans l'executor de parsing, sans bloquer la boucle"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self.parse_release_values, content, row_ids)
+    
+    def _parse_date(self, date_text):
+        """Parse le texte de date (voir timeutils.parse_date_header)"""
+        return parse_date_header(date_text) or datetime.now(UTC).date()
     
     def _is_relevant_event(self, event_name):
-        """Vérifie si l'événement est pertinent - AMÉLIORÉ avec nouveaux indicateurs"""
-        relevant_keywords = [
-            # Taux d'intérêt (ANCIEN)
-            'interest rate', 'fomc', 'fed funds', 'federal reserve',
-            
-            # Inflation - ÉTENDU avec nouveaux indicateurs
-            'cpi', 'consumer price', 'inflation',
-            'ppi', 'producer price',  # NOUVEAU
-            'pce', 'personal consumption',  # NOUVEAU
-            'core cpi', 'core inflation',  # NOUVEAU
-            
-            # Banques centrales (ANCIEN + NOUVEAU)
-            'ecb', 'european central bank',
-            'boe', 'bank of england',  # NOUVEAU
-            
-            # Croissance (ANCIEN)
-            'gdp', 'gross domestic',
-            
-            # Emploi (ANCIEN + NOUVEAU)
-            'non farm', 'payroll', 'nfp',
-            'unemployment', 'jobless',  # NOUVEAU
-            
-            # Ventes (NOUVEAU)
-            'retail sales',  # NOUVEAU
-            
-            # PMI manufacturier (NOUVEAU)
-            'ism manufacturing', 'pmi manufacturing'  # NOUVEAU
-        ]
-        
-        event_lower = event_name.lower()
-        return any(keyword in event_lower for keyword in relevant_keywords)
+        """Vérifie si l'événement est pertinent (voir classifier.RELEVANT_KEYWORDS)"""
+        return classify(event_name).relevant
     
     def _simplify_event_name(self, name):
-        """Simplifie le nom de l'événement - AMÉLIORÉ"""
-        name_lower = name.lower()
-        
-        # Emploi
-        if 'non farm' in name_lower or 'payroll' in name_lower or 'nfp' in name_lower:
-            return "NFP - Non-Farm Payroll"
-        
-        # Taux d'intérêt
-        if 'interest rate' in name_lower or 'fed funds' in name_lower or 'fomc' in name_lower:
-            return "Fed Decision - Taux directeurs"
-        
-        # CPI (vérifier Core CPI avant CPI général)
-        if 'core cpi' in name_lower:
-            return "Core CPI - Inflation sous-jacente USA"
-        elif 'cpi' in name_lower or 'consumer price' in name_lower:
-            return "CPI - Inflation USA"
-        
-        # PPI - NOUVEAU
-        if 'ppi' in name_lower or 'producer price' in name_lower:
-            return "PPI - Prix à la production USA"
-        
-        # PCE - NOUVEAU (indicateur préféré de la Fed)
-        if 'pce' in name_lower or 'personal consumption' in name_lower:
-            return "PCE - Indice préféré de la Fed"
-        
-        # Retail Sales - NOUVEAU
-        if 'retail sales' in name_lower:
-            return "Retail Sales - Ventes au détail USA"
-        
-        # Unemployment - NOUVEAU
-        if 'unemployment' in name_lower or 'jobless' in name_lower:
-            return "Unemployment - Taux de chômage USA"
-        
-        # Banques centrales
-        if 'ecb' in name_lower:
-            return "ECB Decision - Taux BCE"
-        if 'boe' in name_lower or 'bank of england' in name_lower:
-            return "BoE Decision - Taux BoE"
-        
-        # GDP
-        if 'gdp' in name_lower:
-            return "GDP - Croissance USA"
-        
-        # PMI/ISM - NOUVEAU
-        if 'ism manufacturing' in name_lower or 'pmi manufacturing' in name_lower:
-            return "ISM/PMI Manufacturing - Activité industrielle"
-        
-        return name
-    
-    def _get_country_flag(self, country_text):
-        """Retourne le drapeau selon le pays"""
-        country_lower = country_text.lower()
-        
-        if 'united states' in country_lower or 'usa' in country_lower:
-            return "🇺🇸"
-        elif 'euro' in country_lower or 'europe' in country_lower:
-            return "🇪🇺"
-        elif 'united kingdom' in country_lower or 'uk' in country_lower:
-            return "🇬🇧"
-        elif 'japan' in country_lower:
-            return "🇯🇵"
-        
-        return "🌍"
+        """Simplifie le nom de l'événement (voir classifier.NAME_RULES)"""
+        return classify(name).name
     
     def _get_affected_assets(self, event_name):
-        """Détermine les assets affectés - AMÉLIORÉ"""
-        name_lower = event_name.lower()
-        
-        # Fed / Taux d'intérêt
-        if 'fed' in name_lower or 'fomc' in name_lower or 'interest rate' in name_lower:
-            return ["ES", "NQ", "GC", "6E", "CL", "BTC", "ETH"]
-        
-        # Inflation (CPI, PPI, PCE, Core) - ÉTENDU
-        elif any(kw in name_lower for kw in ['cpi', 'inflation', 'ppi', 'pce', 'core']):
-            return ["ES", "NQ", "GC", "6E", "BTC", "ETH"]
-        
-        # ECB
-        elif 'ecb' in name_lower:
-            return ["6E", "ES", "NQ", "GC"]
-        
-        # BoE - NOUVEAU
-        elif 'boe' in name_lower or 'bank of england' in name_lower:
-            return ["6B", "ES", "NQ", "GC"]
-        
-        # GDP
-        elif 'gdp' in name_lower:
-            return ["ES", "NQ", "6E"]
-        
-        # NFP / Emploi - ÉTENDU
-        elif any(kw in name_lower for kw in ['non farm', 'payroll', 'nfp', 'unemployment', 'jobless']):
-            return ["ES", "NQ", "GC", "6E", "CL", "BTC", "ETH"]
-        
-        # Retail Sales - NOUVEAU
-        elif 'retail sales' in name_lower:
-            return ["ES", "NQ", "6E", "BTC", "ETH"]
-        
-        # PMI/ISM - NOUVEAU
-        elif 'ism' in name_lower or 'pmi' in name_lower:
-            return ["ES", "NQ", "GC"]
-        
-        return ["ES", "NQ"]
+        """Détermine les assets affectés (voir classifier.ASSET_RULES)"""
+        return list(classify(event_name).assets)
+
+if __name__ == "__main__":
+    import sys
+    from backfill import main
+    sys.exit(main())
@@ -0,0 +1,243 @@
+"""Sources de calendrier et agrégation multi-sources
+
+Chaque source expose fetch(start_date, end_date) (dates incluses, heure de
+Paris) et renvoie une liste d'événements au format du scraper. Les sources
+sont interrogées en parallèle sous une échéance unique: la latence totale est
+celle de la source la plus lente, et une source en retard ou en erreur
+n'empêche pas les autres de publier.
+"""
+import asyncio
+import json
+import os
+import time
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+from classifier import classify
+from metrics import metrics
+from models import EconomicEvent, FLAGS, FLAG_CODES, country_code
+from timeutils import PARIS, UTC
+
+class CalendarSource(ABC):
+    """Interface d'une source de calendrier"""
+
+    name = "source"
+
+    @abstractmethod
+    async def fetch(self, start_date, end_date):
+        """Événements de [start_date, end_date] (dates de Paris, bornes incluses)"""
+
+    @staticmethod
+    def _in_range(events, start_date, end_date):
+        return [e for e in events if start_date <= e.datetime.date() <= end_date]
+
+class TradingEconomicsSource(CalendarSource):
+    """Calendrier TradingEconomics via CalendarCache (TTL, 304, coupe-circuit)"""
+
+    name = "tradingeconomics"
+
+    def __init__(self, cache):
+        self.cache = cache
+
+    async def fetch(self, start_date, end_date):
+        return await self.cache.get_range(start_date, end_date)
+
+class RecurringSource(CalendarSource):
+    """Annonces récurrentes absentes de TradingEconomics (EIA du mercredi...)
+
+    Les règles sont celles d'un RecurringCalendar (fichier de données); la
+    plage est élargie d'un jour car les règles sont en heure locale du marché.
+    """
+
+    name = "recurring"
+
+    def __init__(self, calendar):
+        self.calendar = calendar
+
+    async def fetch(self, start_date, end_date):
+        events = self.calendar.expand(start_date - timedelta(days=1), end_date + timedelta(days=1))
+        return self._in_range(events, start_date, end_date)
+
+class FileSource(CalendarSource):
+    """Fichier local JSON ou ICS, relu uniquement quand il change sur disque
+
+    JSON: liste d'objets {name, country (libellé, code ou drapeau), datetime
+    (ISO, Paris si sans fuseau), importance (1-5 ou étoiles), assets, description}. ICS: VEVENT avec
+    SUMMARY, DTSTART, LOCATION (pays) et DESCRIPTION.
+    """
+
+    name = "file"
+
+    def __init__(self, path):
+        self.path = path
+        self._mtime = None
+        self._events = []
+
+    async def fetch(self, start_date, end_date):
+        mtime = os.stat(self.path).st_mtime
+        if mtime != self._mtime:
+            self._events = await asyncio.to_thread(self._load)
+            self._mtime = mtime
+        return self._in_range(self._events, start_date, end_date)
+
+    def _load(self):
+        with open(self.path, encoding="utf-8") as f:
+            content = f.read()
+        if self.path.lower().endswith(".ics"):
+            entries = self._parse_ics(content)
+        else:
+            entries = json.loads(content)
+        return [self._event(entry) for entry in entries]
+
+    def _event(self, entry):
+        """Convertit une entrée du fichier en EconomicEvent"""
+        when = entry['datetime']
+        if isinstance(when, str):
+            when = datetime.fromisoformat(when)
+        if when.tzinfo is None:
+            when = when.replace(tzinfo=PARIS)
+
+        classification = classify(entry['name'])
+        importance = entry.get('importance', 4)
+        if isinstance(importance, str):
+            importance = importance.count("⭐")
+
+        country = entry.get('country', 'WW')
+        country = FLAG_CODES.get(country) or (country if country in FLAGS else country_code(country))
+
+        return EconomicEvent.at(
+            when,
+            name=classification.name,
+            country=country,
+            importance=importance,
+            assets=tuple(entry.get('assets') or classification.assets),
+            description=entry.get('description', entry['name']),
+            source=self.name
+        )
+
+    @staticmethod
+    def _parse_ics(content):
+        """VEVENT d'un fichier iCalendar -> entrées {name, country, datetime, description}"""
+        # Lignes repliées (RFC 5545): une ligne commençant par un espace prolonge la précédente
+        lines = []
+        for line in content.splitlines():
+            if line[:1] in (" ", "\t") and lines:
+                lines[-1] += line[1:]
+            else:
+                lines.append(line)
+
+        entries = []
+        current = None
+        for line in lines:
+            if line == "BEGIN:VEVENT":
+                current = {}
+            elif line == "END:VEVENT":
+                if current and 'name' in current and 'datetime' in current:
+                    entries.append(current)
+                current = None
+            elif current is not None and ":" in line:
+                head, value = line.split(":", 1)
+                prop, *params = head.split(";")
+                value = value.replace("\\n", "\n").replace("\\,", ",").replace("\\;", ";")
+                if prop == "SUMMARY":
+                    current['name'] = value
+                elif prop == "DESCRIPTION":
+                    current['description'] = value
+                elif prop == "LOCATION":
+                    current['country'] = value
+                elif prop == "DTSTART":
+                    current['datetime'] = FileSource._ics_datetime(value, params)
+        return entries
+
+    @staticmethod
+    def _ics_datetime(value, params):
+        tzid = next((p.split("=", 1)[1] for p in params if p.startswith("TZID=")), None)
+        if "T" not in value:
+            # Journée entière: même convention que le scraper (09:00)
+            return datetime.strptime(value, "%Y%m%d").replace(hour=9, tzinfo=ZoneInfo(tzid) if tzid else PARIS)
+        if value.endswith("Z"):
+            return datetime.strptime(value, "%Y%m%dT%H%M%SZ").replace(tzinfo=UTC)
+        return datetime.strptime(value, "%Y%m%dT%H%M%S").replace(tzinfo=ZoneInfo(tzid) if tzid else PARIS)
+
+class CalendarAggregator:
+    """Interroge toutes les sources en parallèle et fusionne leurs résultats
+
+    Les sources sont données par ordre de priorité: en cas de doublon (même
+    pays, même nom canonique, heures à moins de tolerance d'écart, sources
+    différentes) l'événement de la source prioritaire est conservé.
+    """
+
+    def __init__(self, sources, deadline=15.0, tolerance=timedelta(minutes=15)):
+        self.sources = list(sources)
+        self.deadline = deadline
+        self.tolerance = tolerance
+        self.last_report = {}
+
+    async def fetch(self, start_date, end_date, previous=()):
+        """Événements fusionnés de [start_date, end_date] et noms des sources en échec
+
+        previous: événements déjà connus; ceux d'une source en échec sont
+        conservés à sa place plutôt que de disparaître de l'agenda.
+        """
+        started = time.perf_counter()
+        tasks = {
+            asyncio.ensure_future(self._timed(source, start_date, end_date)): source
+            for source in self.sources
+        }
+        done, pending = await asyncio.wait(tasks, timeout=self.deadline)
+        for task in pending:
+            task.cancel()
+
+        report = {}
+        results = []
+        failed = []
+        for task, source in tasks.items():
+            if task in pending:
+                report[source.name] = {'status': 'timeout'}
+            elif task.exception() is not None:
+                report[source.name] = {'status': f"erreur: {task.exception()}"}
+            else:
+                events, elapsed = task.result()
+                report[source.name] = {'status': 'ok', 'events': len(events), 'seconds': round(elapsed, 3)}
+                results.append(events)
+                continue
+
+            failed.append(source.name)
+            kept = [e for e in previous if e.source == source.name]
+            results.append(CalendarSource._in_range(kept, start_date, end_date))
+            print(f"⚠️ Source {source.name} indisponible ({report[source.name]['status']}), {len(kept)} annonces conservées")
+
+        with metrics.span("merge"):
+            merged = self.merge(results)
+        report['total'] = {'events': len(merged), 'seconds': round(time.perf_counter() - started, 3)}
+        self.last_report = report
+        return merged, failed
+
+    @staticmethod
+    async def _timed(source, start_date, end_date):
+        started = time.perf_counter()
+        events = await source.fetch(start_date, end_date)
+        return events, time.perf_counter() - started
+
+    @staticmethod
+    def canonical(name):
+        """Nom canonique pour le rapprochement (mêmes règles que le scraper)"""
+        return classify(name).name.casefold()
+
+    def merge(self, event_lists):
+        """Fusionne des listes d'événements (par priorité décroissante), doublons inter-sources retirés"""
+        merged = []
+        tolerance = self.tolerance.total_seconds()
+        buckets = {}  # (pays, nom canonique) -> événements retenus
+        for events in event_lists:
+            for event in events:
+                bucket = buckets.setdefault((event.country, self.canonical(event.name)), [])
+                if any(
+                    kept.source != event.source and abs(kept.timestamp - event.timestamp) <= tolerance
+                    for kept in bucket
+                ):
+                    continue
+                bucket.append(event)
+                merged.append(event)
+        merged.sort(key=lambda e: e.timestamp)
+        return merged
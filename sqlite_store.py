@@ -0,0 +1,320 @@
+import json
+import sqlite3
+import time
+from datetime import date, datetime
+from models import EconomicEvent, Subscription
+from timeutils import PARIS
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    key TEXT PRIMARY KEY,
+    ts REAL NOT NULL,
+    country TEXT NOT NULL,
+    name TEXT NOT NULL,
+    importance INTEGER,
+    source TEXT,
+    payload TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_events_ts ON events(ts);
+
+CREATE TABLE IF NOT EXISTS event_assets (
+    key TEXT NOT NULL REFERENCES events(key) ON DELETE CASCADE,
+    asset TEXT NOT NULL,
+    ts REAL NOT NULL,
+    PRIMARY KEY (asset, ts, key)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS holidays (
+    year INTEGER NOT NULL,
+    market TEXT NOT NULL,
+    day TEXT NOT NULL,
+    name TEXT NOT NULL,
+    PRIMARY KEY (year, market, day)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS syncs (
+    start TEXT NOT NULL,
+    end TEXT NOT NULL,
+    synced_at REAL NOT NULL,
+    PRIMARY KEY (start, end)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS discord_events (
+    guild_id INTEGER NOT NULL,
+    event_key TEXT NOT NULL,
+    discord_id INTEGER NOT NULL,
+    PRIMARY KEY (guild_id, event_key)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS subscriptions (
+    channel_id INTEGER PRIMARY KEY,
+    guild_id INTEGER NOT NULL,
+    assets TEXT NOT NULL,
+    min_importance INTEGER NOT NULL,
+    language TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS agenda_messages (
+    channel_id INTEGER PRIMARY KEY,
+    week TEXT NOT NULL,
+    digest TEXT NOT NULL,
+    pages TEXT NOT NULL
+);
+"""
+
+class SQLiteStore:
+    """Persistance SQLite des annonces, jours fériés, Discord Events créés, abonnements et messages d'agenda
+
+    Mode WAL (lectures non bloquées par l'écriture), index sur l'heure et sur
+    les assets, upserts groupés dans une transaction. Une ligne n'est réécrite
+    que si son contenu a changé: un nouveau scraping ne touche que les
+    annonces modifiées, ajoutées ou disparues de la plage.
+    """
+
+    TIMEZONE = PARIS
+
+    def __init__(self, path="events.db"):
+        self.path = path
+        # Ouverte au premier accès: le module peut être importé hors du thread
+        # qui utilisera la connexion (préchargement pendant la connexion Discord)
+        self._connection = None
+
+    @property
+    def _conn(self):
+        if self._connection is None:
+            self._connection = sqlite3.connect(self.path, isolation_level=None)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            self._connection.execute("PRAGMA foreign_keys=ON")
+            self._connection.executescript(SCHEMA)
+        return self._connection
+
+    def close(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    # --- Annonces ----------------------------------------------------------
+
+    @staticmethod
+    def event_key(event):
+        """Identifiant d'une annonce: source, heure, pays, nom, publication d'origine
+
+        Comme dans EventStore, deux publications homonymes le même jour à des
+        heures différentes, ou à la même heure (CPI MoM / YoY), sont conservées.
+        """
+        return ":".join((event.source, event.datetime.isoformat(), event.country, event.name, event.release_id))
+
+    @staticmethod
+    def _payload(event):
+        return json.dumps(event.to_dict(), ensure_ascii=False, sort_keys=True)
+
+    @staticmethod
+    def _event(payload):
+        return EconomicEvent.from_dict(json.loads(payload))
+
+    def _upsert(self, rows):
+        """Écrit les annonces absentes ou dont le contenu a changé"""
+        if not rows:
+            return 0
+
+        payloads = {key: self._payload(event) for key, event in rows.items()}
+        stamps = [event.timestamp for event in rows.values()]
+        existing = dict(self._conn.execute(
+            "SELECT key, payload FROM events WHERE ts >= ? AND ts <= ?", (min(stamps), max(stamps))
+        ))
+        changed = [key for key, payload in payloads.items() if existing.get(key) != payload]
+        if not changed:
+            return 0
+
+        now = time.time()
+        self._conn.executemany(
+            """
+            INSERT INTO events (key, ts, country, name, importance, source, payload, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(key) DO UPDATE SET
+                ts = excluded.ts, importance = excluded.importance,
+                payload = excluded.payload, updated_at = excluded.updated_at
+            """,
+            [
+                (key, rows[key].timestamp, rows[key].country, rows[key].name,
+                 rows[key].importance, rows[key].source, payloads[key], now)
+                for key in changed
+            ]
+        )
+
+        # Index des assets reconstruit uniquement pour les annonces écrites
+        self._conn.executemany("DELETE FROM event_assets WHERE key = ?", [(key,) for key in changed])
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO event_assets (key, asset, ts) VALUES (?, ?, ?)",
+            [
+                (key, asset, rows[key].timestamp)
+                for key in changed for asset in rows[key].assets
+            ]
+        )
+        return len(changed)
+
+    def sync_range(self, start, end, events):
+        """Aligne [start, end[ sur un nouveau scraping: upsert + suppression des disparues
+
+        Retourne (écrites, supprimées).
+        """
+        rows = {}
+        for event in events:
+            rows.setdefault(self.event_key(event), event)
+
+        with self._transaction():
+            written = self._upsert(rows)
+            stale = [
+                (key,) for (key,) in self._conn.execute(
+                    "SELECT key FROM events WHERE ts >= ? AND ts < ?", (self._to_ts(start), self._to_ts(end))
+                ) if key not in rows
+            ]
+            self._conn.executemany("DELETE FROM events WHERE key = ?", stale)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO syncs (start, end, synced_at) VALUES (?, ?, ?)",
+                (start.isoformat(), end.isoformat(), time.time())
+            )
+        return written, len(stale)
+
+    def last_sync(self, start, end):
+        """Horodatage (epoch) du dernier sync_range couvrant [start, end[, ou None"""
+        row = self._conn.execute(
+            "SELECT MAX(synced_at) FROM syncs WHERE start <= ? AND end >= ?",
+            (start.isoformat(), end.isoformat())
+        ).fetchone()
+        return row[0]
+
+    def load_range(self, start, end, asset=None):
+        """Annonces de [start, end[ triées par heure (filtre asset via son index)"""
+        bounds = (self._to_ts(start), self._to_ts(end))
+        if asset is None:
+            cursor = self._conn.execute(
+                "SELECT payload FROM events WHERE ts >= ? AND ts < ? ORDER BY ts, name", bounds
+            )
+        else:
+            cursor = self._conn.execute(
+                """
+                SELECT e.payload FROM event_assets a JOIN events e ON e.key = a.key
+                WHERE a.asset = ? AND a.ts >= ? AND a.ts < ? ORDER BY a.ts, e.name
+                """,
+                (asset,) + bounds
+            )
+        return [self._event(payload) for (payload,) in cursor]
+
+    def purge_before(self, day):
+        """Supprime les annonces antérieures à une date (index des assets en cascade) et les plages terminées"""
+        with self._transaction():
+            deleted = self._conn.execute("DELETE FROM events WHERE ts < ?", (self._to_ts(day),)).rowcount
+            self._conn.execute("DELETE FROM syncs WHERE end <= ?", (day.isoformat(),))
+        return deleted
+
+    # --- Jours fériés ------------------------------------------------------
+
+    def save_holidays(self, year, tables):
+        """Enregistre les tables {"US": {date: nom}, "UK": {...}} d'une année"""
+        with self._transaction():
+            self._conn.execute("DELETE FROM holidays WHERE year = ?", (year,))
+            self._conn.executemany(
+                "INSERT INTO holidays (year, market, day, name) VALUES (?, ?, ?, ?)",
+                [
+                    (year, market, day.isoformat(), name)
+                    for market, holidays in tables.items() for day, name in holidays.items()
+                ]
+            )
+
+    def load_holidays(self):
+        """Tables enregistrées: {année: {"US": {date: nom}, "UK": {date: nom}}}"""
+        tables = {}
+        for year, market, day, name in self._conn.execute("SELECT year, market, day, name FROM holidays"):
+            tables.setdefault(year, {}).setdefault(market, {})[date.fromisoformat(day)] = name
+        return tables
+
+    # --- Discord Events ----------------------------------------------------
+
+    def save_discord_ids(self, guild_id, ids):
+        """Remplace la correspondance identifiant d'annonce -> id du Discord Event d'une guild"""
+        with self._transaction():
+            self._conn.execute("DELETE FROM discord_events WHERE guild_id = ?", (guild_id,))
+            self._conn.executemany(
+                "INSERT INTO discord_events (guild_id, event_key, discord_id) VALUES (?, ?, ?)",
+                [(guild_id, key, discord_id) for key, discord_id in ids.items()]
+            )
+
+    def discord_ids(self, guild_id):
+        """{identifiant d'annonce: id du Discord Event} pour une guild"""
+        return dict(self._conn.execute(
+            "SELECT event_key, discord_id FROM discord_events WHERE guild_id = ?", (guild_id,)
+        ))
+
+    # --- Abonnements -------------------------------------------------------
+
+    def save_subscription(self, subscription):
+        """Ajoute ou remplace l'abonnement d'un salon"""
+        with self._transaction():
+            self._conn.execute(
+                "INSERT OR REPLACE INTO subscriptions (channel_id, guild_id, assets, min_importance, language) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (subscription.channel_id, subscription.guild_id, ",".join(subscription.assets),
+                 subscription.min_importance, subscription.language)
+            )
+
+    def delete_subscription(self, channel_id):
+        """Supprime l'abonnement d'un salon; retourne True s'il existait"""
+        with self._transaction():
+            return self._conn.execute("DELETE FROM subscriptions WHERE channel_id = ?", (channel_id,)).rowcount > 0
+
+    def load_subscriptions(self):
+        """Tous les abonnements enregistrés"""
+        return [
+            Subscription(guild_id, channel_id, tuple(filter(None, assets.split(","))), min_importance, language)
+            for channel_id, guild_id, assets, min_importance, language in self._conn.execute(
+                "SELECT channel_id, guild_id, assets, min_importance, language FROM subscriptions ORDER BY guild_id, channel_id"
+            )
+        ]
+
+    # --- Messages d'agenda publiés ----------------------------------------
+
+    def save_agenda_messages(self, channel_id, week, digest, pages):
+        """Messages de l'agenda publié dans un salon: [(id du message, empreinte de la page)]"""
+        with self._transaction():
+            self._conn.execute(
+                "INSERT OR REPLACE INTO agenda_messages (channel_id, week, digest, pages) VALUES (?, ?, ?, ?)",
+                (channel_id, week, digest, json.dumps(pages))
+            )
+
+    def agenda_messages(self, channel_id):
+        """(semaine, empreinte, [(id du message, empreinte de la page)]) du dernier agenda publié, ou None"""
+        row = self._conn.execute(
+            "SELECT week, digest, pages FROM agenda_messages WHERE channel_id = ?", (channel_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        week, digest, pages = row
+        return week, digest, [tuple(page) for page in json.loads(pages)]
+
+    # --- Interne -----------------------------------------------------------
+
+    def _transaction(self):
+        return _Transaction(self._conn)
+
+    def _to_ts(self, value):
+        if isinstance(value, datetime):
+            return value.timestamp()
+        return datetime.combine(value, datetime.min.time(), tzinfo=self.TIMEZONE).timestamp()
+
+class _Transaction:
+    """BEGIN IMMEDIATE ... COMMIT (ROLLBACK en cas d'erreur)"""
+    __slots__ = ('conn',)
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        self.conn.execute("BEGIN IMMEDIATE")
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        self.conn.execute("ROLLBACK" if exc_type else "COMMIT")
+        return False
@@ -0,0 +1,87 @@
+from models import Subscription
+
+class SubscriptionRegistry:
+    """Salons abonnés à l'agenda (guild, salon, assets, importance, langue)
+
+    Un seul processus sert toutes les guilds: le calendrier est scrapé une
+    fois, chaque rendu est partagé par les abonnements aux filtres identiques
+    (groups) et les annonces ne sont filtrées qu'une fois par groupe.
+    Les abonnements sont persistés dans le store SQLite.
+    """
+
+    def __init__(self, store=None, default_guild_id=None, default_channel_id=None):
+        self.store = store
+        # Salon créé comme premier abonnement quand aucun n'est enregistré (config)
+        self.default = (default_guild_id, default_channel_id)
+        self._subscriptions = None  # channel_id -> Subscription, chargé au premier accès
+        self._groups = None
+
+    def load(self):
+        """Relit les abonnements; sans aucun abonnement, crée celui du salon par défaut"""
+        subscriptions = self.store.load_subscriptions() if self.store is not None else []
+        self._subscriptions = {subscription.channel_id: subscription for subscription in subscriptions}
+        self._groups = None
+        if not self._subscriptions and all(self.default):
+            self.add(Subscription(*self.default))
+        return len(self._subscriptions)
+
+    @property
+    def _by_channel(self):
+        if self._subscriptions is None:
+            self.load()
+        return self._subscriptions
+
+    def __len__(self):
+        return len(self._by_channel)
+
+    def add(self, subscription):
+        """Ajoute ou remplace l'abonnement d'un salon"""
+        self._by_channel[subscription.channel_id] = subscription
+        self._groups = None
+        if self.store is not None:
+            self.store.save_subscription(subscription)
+
+    def remove(self, channel_id):
+        """Retire l'abonnement d'un salon; retourne l'abonnement retiré ou None"""
+        subscription = self._by_channel.pop(channel_id, None)
+        if subscription is not None:
+            self._groups = None
+            if self.store is not None:
+                self.store.delete_subscription(channel_id)
+        return subscription
+
+    def get(self, channel_id):
+        return self._by_channel.get(channel_id)
+
+    def all(self):
+        return list(self._by_channel.values())
+
+    def groups(self):
+        """{filter_key: [abonnements]}: un rendu par groupe"""
+        if self._groups is None:
+            groups = {}
+            for subscription in self._by_channel.values():
+                groups.setdefault(subscription.filter_key, []).append(subscription)
+            self._groups = groups
+        return self._groups
+
+    def by_guild(self):
+        """{guild_id: [abonnements]} (Discord Events: une synchro par guild)"""
+        guilds = {}
+        for subscription in self._by_channel.values():
+            guilds.setdefault(subscription.guild_id, []).append(subscription)
+        return guilds
+
+    def matching(self, event):
+        """Abonnements concernés par une annonce (filtre évalué une fois par groupe)"""
+        return [
+            subscription
+            for subscriptions in self.groups().values() if subscriptions[0].matches(event)
+            for subscription in subscriptions
+        ]
+
+    @staticmethod
+    def select(events, subscriptions):
+        """Annonces retenues par au moins un des abonnements (ex: ceux d'une guild)"""
+        filters = list({subscription.filter_key: subscription for subscription in subscriptions}.values())
+        return [event for event in events if any(subscription.matches(event) for subscription in filters)]
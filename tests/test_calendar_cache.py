@@ -0,0 +1,114 @@
+import asyncio
+
+import pytest
+from aiohttp import web
+
+from benchmarks.fixtures import build_calendar_page
+from calendar_cache import CalendarCache, CalendarUnavailable, CircuitBreaker
+from scraper import TradingEconomicsScraper
+
+ETAG = '"calendar-v1"'
+
+
+class Upstream:
+    """Serveur TradingEconomics local (aiohttp): ETag, 304, panne à la demande"""
+
+    def __init__(self, content):
+        self.content = content
+        self.failing = False
+        self.requests = 0
+        self.not_modified = 0
+
+    async def handle(self, request):
+        self.requests += 1
+        if self.failing:
+            return web.Response(status=503)
+        if request.headers.get('If-None-Match') == ETAG:
+            self.not_modified += 1
+            return web.Response(status=304)
+        return web.Response(body=self.content, headers={'ETag': ETAG})
+
+
+async def serve(scenario, **cache_options):
+    """Lance le serveur local et exécute scenario(upstream, cache, start, end)"""
+    scraper = TradingEconomicsScraper()
+    start, end = scraper.get_date_range(7)
+    upstream = Upstream(build_calendar_page(start=start, days=8, rows_per_day=12))
+    app = web.Application()
+    app.router.add_get("/calendar", upstream.handle)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    scraper.BASE_URL = f"http://127.0.0.1:{port}/calendar"
+    try:
+        await scenario(upstream, CalendarCache(scraper, **cache_options), start, end)
+    finally:
+        await scraper.close()
+        await runner.cleanup()
+
+
+async def revalidated(cache):
+    """Attend la fin des revalidations lancées en arrière-plan"""
+    await asyncio.gather(*cache._inflight.values(), return_exceptions=True)
+
+
+def test_expired_entry_is_revalidated_with_etag():
+    async def scenario(upstream, cache, start, end):
+        events = await cache.get_range(start, end)
+        assert events and upstream.requests == 1
+
+        # TTL écoulé: réponse immédiate depuis le cache, revalidation conditionnelle → 304
+        assert await cache.get_range(start, end) == events
+        await revalidated(cache)
+        assert (upstream.requests, upstream.not_modified, cache.not_modified) == (2, 1, 1)
+        assert cache.healthy
+
+    asyncio.run(serve(scenario, ttl=0))
+
+
+def test_stale_data_is_served_while_upstream_is_down():
+    async def scenario(upstream, cache, start, end):
+        events = await cache.get_range(start, end)
+        upstream.failing = True
+
+        assert await cache.get_range(start, end) == events
+        await revalidated(cache)
+        assert not cache.healthy and cache.errors == 1
+        # Toujours servi depuis la dernière donnée valide
+        assert await cache.get_range(start, end) == events
+        await revalidated(cache)
+        assert cache.errors == 2
+
+    asyncio.run(serve(scenario, ttl=0))
+
+
+def test_circuit_opens_then_recovers_half_open():
+    async def scenario(upstream, cache, start, end):
+        upstream.failing = True
+        for _ in range(2):
+            with pytest.raises(CalendarUnavailable):
+                await cache.get_range(start, end)
+        assert cache.breaker.state == CircuitBreaker.OPEN
+
+        # Circuit ouvert: aucune requête ne part
+        with pytest.raises(CalendarUnavailable):
+            await cache.get_range(start, end)
+        assert upstream.requests == 2 and cache.breaker.rejected == 1
+
+        # Semi-ouvert: l'essai échoue, le circuit se rouvre pour une durée doublée
+        await asyncio.sleep(0.25)
+        with pytest.raises(CalendarUnavailable):
+            await cache.get_range(start, end)
+        assert cache.breaker.state == CircuitBreaker.OPEN and cache.breaker.open_for == 0.4
+        assert upstream.requests == 3
+
+        # Semi-ouvert: l'essai réussit, le circuit se referme
+        upstream.failing = False
+        await asyncio.sleep(0.45)
+        assert await cache.get_range(start, end)
+        assert cache.breaker.state == CircuitBreaker.CLOSED and cache.healthy
+        assert upstream.requests == 4
+
+    asyncio.run(serve(scenario, breaker=CircuitBreaker(failure_threshold=2, reset_timeout=0.2)))
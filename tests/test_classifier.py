@@ -0,0 +1,49 @@
+import json
+import random
+
+import pytest
+
+import classifier
+from benchmarks.bench_classifier import CORPUS
+from benchmarks.fixtures import EVENT_NAMES
+
+CORPUS_ENTRIES = json.loads(CORPUS.read_text(encoding="utf-8"))
+
+
+def keyword_loop(event_name):
+    """Référence: recherche mot-clé par mot-clé, comme les anciennes fonctions du scraper"""
+    lower = event_name.lower()
+
+    def first_match(rules, default):
+        for keywords, value in rules:
+            if any(keyword in lower for keyword in keywords):
+                return value
+        return default
+
+    return (
+        any(keyword in lower for keyword in classifier.RELEVANT_KEYWORDS),
+        first_match(classifier.NAME_RULES, event_name),
+        first_match(classifier.ASSET_RULES, classifier.DEFAULT_ASSETS),
+    )
+
+
+@pytest.mark.parametrize("entry", CORPUS_ENTRIES, ids=lambda entry: entry["name"] or "<vide>")
+def test_matches_frozen_corpus(entry):
+    result = classifier.classify.__wrapped__(entry["name"])
+    assert (result.relevant, result.name, result.assets) == (entry["relevant"], entry["canonical"], tuple(entry["assets"]))
+
+
+def test_matches_keyword_loop():
+    # Noms du corpus et des pages synthétiques, plus des mots-clés qui se chevauchent ou s'imbriquent
+    names = [entry["name"] for entry in CORPUS_ENTRIES] + EVENT_NAMES + [
+        "Core CPI", "cpipce", "Nonfarm Payrolls", "non farm payrolls fomc", "bank of englandecb",
+        "BoE Interest Rate Decision", "ISM Manufacturing PMI", "pmi manufacturing", "Fed Chair Powell Speech",
+    ]
+    keywords = list(classifier.RELEVANT_KEYWORDS) + [k for rules in (classifier.NAME_RULES, classifier.ASSET_RULES) for ks, _ in rules for k in ks]
+    rng = random.Random(0)
+    for _ in range(500):
+        # Mots-clés collés / tronqués au hasard: chevauchements que l'automate doit résoudre
+        names.append("".join(rng.choice(keywords)[rng.randrange(3):] + rng.choice(("", " ", "x")) for _ in range(rng.randint(1, 4))))
+
+    for name in names:
+        assert tuple(classifier.classify.__wrapped__(name)) == keyword_loop(name), name
@@ -0,0 +1,35 @@
+import asyncio
+from datetime import datetime, timedelta
+
+from benchmarks.fake_discord import FakeBot
+from discord_events import DiscordEventManager
+from models import EconomicEvent
+from timeutils import PARIS
+
+GUILD = 2
+
+
+def cpi():
+    """CPI MoM et YoY: même nom canonique, même heure, deux publications"""
+    when = (datetime.now(PARIS) + timedelta(days=2)).replace(hour=14, minute=30, second=0, microsecond=0)
+    return [
+        EconomicEvent.at(when, name="CPI - Inflation USA", country="US", importance=5, description="Inflation Rate MoM", row_id="201"),
+        EconomicEvent.at(when, name="CPI - Inflation USA", country="US", importance=5, description="Inflation Rate YoY", row_id="202"),
+    ]
+
+
+def sync(bot, events):
+    return asyncio.run(DiscordEventManager.create_events_for_week(bot, GUILD, events))
+
+
+def test_one_discord_event_per_release():
+    bot = FakeBot()
+    report = sync(bot, cpi())
+    assert (report['created'], report['collisions']) == (2, 0)
+    assert sync(bot, cpi())['unchanged'] == 2
+
+
+def test_duplicate_release_is_counted():
+    first, _ = cpi()
+    assert sync(FakeBot(), [first, first])['collisions'] == 1
+
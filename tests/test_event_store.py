@@ -0,0 +1,59 @@
+from datetime import date, datetime
+
+from event_store import EventStore
+from models import EconomicEvent
+from reminders import ReminderScheduler
+from sqlite_store import SQLiteStore
+from timeutils import NEW_YORK
+
+RELEASE = datetime(2026, 11, 5, 8, 30, tzinfo=NEW_YORK)
+
+
+def claims():
+    """Deux publications du même nom canonique, à la même heure"""
+    return [
+        EconomicEvent.at(RELEASE, name="Unemployment - Taux de chômage USA", country="US", importance=4,
+                         description="Initial Jobless Claims", row_id="101"),
+        EconomicEvent.at(RELEASE, name="Unemployment - Taux de chômage USA", country="US", importance=3,
+                         description="Continuing Jobless Claims", row_id="102"),
+    ]
+
+
+def test_store_keeps_releases_sharing_a_canonical_name():
+    store = EventStore()
+    assert store.extend(claims()) == 2
+    assert store.replace_range(date(2026, 11, 5), date(2026, 11, 6), claims()) == (0, 0)
+    assert [e.description for e in store.on_date(date(2026, 11, 5))] == ["Initial Jobless Claims", "Continuing Jobless Claims"]
+
+
+def test_replace_range_updates_one_release_only():
+    store = EventStore(claims())
+    updated = [claims()[0].replace(actual="220K"), claims()[1]]
+    assert store.replace_range(date(2026, 11, 5), date(2026, 11, 6), updated) == (1, 1)
+    assert sorted(e.actual or "" for e in store) == ["", "220K"]
+
+
+def test_sqlite_keeps_releases_sharing_a_canonical_name():
+    store = SQLiteStore(":memory:")
+    assert store.sync_range(date(2026, 11, 5), date(2026, 11, 6), claims()) == (2, 0)
+    assert {e.description for e in store.load_range(date(2026, 11, 5), date(2026, 11, 6))} == {
+        "Initial Jobless Claims", "Continuing Jobless Claims"
+    }
+
+
+def test_sqlite_purge_drops_past_events_and_their_assets():
+    store = SQLiteStore(":memory:")
+    later = [event.replace(timestamp=event.timestamp + 7 * 86400) for event in claims()]
+    store.sync_range(date(2026, 11, 5), date(2026, 11, 6), claims())
+    store.sync_range(date(2026, 11, 12), date(2026, 11, 13), later)
+
+    assert store.purge_before(date(2026, 11, 12)) == 2
+    assert store.load_range(date(2026, 11, 1), date(2026, 11, 6), asset="ES") == []
+    assert store._conn.execute("SELECT COUNT(*) FROM event_assets WHERE ts < ?", (later[0].timestamp,)).fetchone()[0] == 0
+    assert store.last_sync(date(2026, 11, 5), date(2026, 11, 6)) is None
+    assert len(store.load_range(date(2026, 11, 12), date(2026, 11, 13))) == 2
+
+
+def test_reminder_job_per_release():
+    first, second = claims()
+    assert ReminderScheduler.job_id(first, 5) != ReminderScheduler.job_id(second, 5)
@@ -0,0 +1,66 @@
+import asyncio
+import time
+
+import discord
+import pytest
+
+from publish_queue import PublishQueue
+
+
+def test_rate_limited_route_does_not_hold_workers():
+    async def scenario():
+        queue = PublishQueue(concurrency=2, base_delay=0.01)
+        attempts = {}
+
+        def limited(index):
+            async def call():
+                attempts[index] = attempts.get(index, 0) + 1
+                if attempts[index] == 1:
+                    raise discord.RateLimited(0.5)
+                return index
+            return call
+
+        async def other(index):
+            await asyncio.sleep(0.01)
+            return index
+
+        started = time.monotonic()
+        blocked = asyncio.gather(*(queue.submit("channel:1", limited(i)) for i in range(6)))
+        await asyncio.sleep(0.05)
+        # Route 1 en attente de son retry_after: les workers servent les autres routes
+        assert await asyncio.gather(*(queue.submit(f"channel:{i + 2}", lambda i=i: other(i)) for i in range(8))) == list(range(8))
+        assert time.monotonic() - started < 0.4
+        assert queue.stats()['blocked'] == 1
+
+        assert await blocked == list(range(6))
+        assert queue.stats()['rate_limited'] >= 1 and queue.failed == 0
+
+    asyncio.run(scenario())
+
+
+def test_gives_up_after_max_retries():
+    async def scenario():
+        queue = PublishQueue(concurrency=1, max_retries=2)
+
+        async def call():
+            raise discord.RateLimited(0.01)
+
+        with pytest.raises(discord.RateLimited):
+            await queue.submit("channel:1", call)
+        assert (queue.retries, queue.failed) == (2, 1)
+
+    asyncio.run(scenario())
+
+
+def test_definitive_error_is_not_retried():
+    async def scenario():
+        queue = PublishQueue(concurrency=1)
+
+        async def call():
+            raise ValueError("payload invalide")
+
+        with pytest.raises(ValueError):
+            await queue.submit("channel:1", call)
+        assert queue.retries == 0
+
+    asyncio.run(scenario())
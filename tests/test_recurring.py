@@ -0,0 +1,30 @@
+from datetime import date
+
+from config import RECURRING_FILE
+from recurring import RecurringCalendar
+
+
+def payrolls(start, end):
+    return [
+        event.datetime.date() for event in RecurringCalendar(RECURRING_FILE).expand(start, end)
+        if event.name == "Non Farm Payrolls"
+    ]
+
+
+def test_payrolls_on_first_friday():
+    assert payrolls(date(2024, 9, 1), date(2024, 12, 31)) == [
+        date(2024, 9, 6), date(2024, 10, 4), date(2024, 11, 1), date(2024, 12, 6)
+    ]
+
+
+def test_payrolls_holiday_moves_to_previous_session():
+    # Vendredi 4 juillet 2025 férié: publication le jeudi
+    assert payrolls(date(2025, 7, 1), date(2025, 7, 31)) == [date(2025, 7, 3)]
+
+
+def test_payrolls_known_exceptions():
+    assert payrolls(date(2025, 1, 1), date(2025, 1, 31)) == [date(2025, 1, 10)]
+    # Shutdown 2025: septembre publié le 20 novembre, octobre et novembre ensemble le 16 décembre
+    assert payrolls(date(2025, 10, 1), date(2025, 12, 31)) == [date(2025, 11, 20), date(2025, 12, 16)]
+    # Exception plus lointaine que la marge: prise en compte même si la date de la règle est hors plage
+    assert payrolls(date(2025, 11, 15), date(2025, 11, 30)) == [date(2025, 11, 20)]
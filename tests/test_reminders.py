@@ -0,0 +1,125 @@
+import asyncio
+from datetime import date, datetime, timedelta
+
+from models import EconomicEvent
+from release_poller import ReleasePoller
+from reminders import ReminderScheduler
+from timeutils import PARIS
+
+NOW = datetime(2026, 11, 2, 7, 0, tzinfo=PARIS)
+
+
+class Scheduler:
+    """Planificateur minimal: jobs par id"""
+
+    def __init__(self):
+        self.jobs = {}
+        self.added = 0
+
+    def add_job(self, func, trigger, args=(), id=None, **kwargs):
+        self.jobs[id] = trigger
+        self.added += 1
+
+    def remove_job(self, job_id):
+        del self.jobs[job_id]
+
+
+def week():
+    return [
+        EconomicEvent.at(NOW.replace(hour=14, minute=30) + timedelta(days=offset), name=f"Event {offset}",
+                         country="US", importance=3, row_id=str(offset))
+        for offset in range(5)
+    ]
+
+
+async def noop(*args):
+    pass
+
+
+def test_daily_sync_keeps_later_reminders():
+    scheduler = Scheduler()
+    reminders = ReminderScheduler(scheduler)
+    reminders.bind(noop)
+    events = week()
+    assert reminders.sync(events, date(2026, 11, 2), date(2026, 11, 7), now=NOW) == (10, 0, 0)
+
+    # Rafraîchissement du jour (07:00): les rappels des jours suivants restent planifiés
+    assert reminders.sync(events[:1], date(2026, 11, 2), date(2026, 11, 3), now=NOW) == (0, 0, 0)
+    assert len(scheduler.jobs) == 10
+
+    # Une annonce du jour disparue est retirée
+    assert reminders.sync([], date(2026, 11, 2), date(2026, 11, 3), now=NOW) == (0, 0, 2)
+    assert len(scheduler.jobs) == 8 and scheduler.added == 10
+
+
+def test_daily_sync_keeps_later_release_watches():
+    scheduler = Scheduler()
+    poller = ReleasePoller(scheduler, scraper=None)
+    poller.bind(noop)
+    events = week()
+    poller.sync(events, date(2026, 11, 2), date(2026, 11, 7), now=NOW)
+    poller.sync(events[:1], date(2026, 11, 2), date(2026, 11, 3), now=NOW)
+    assert len(scheduler.jobs) == 5 and scheduler.added == 5
+
+
+def test_sync_during_watch_does_not_reschedule_the_slot():
+    scheduler = Scheduler()
+    poller = ReleasePoller(scheduler, scraper=None)
+    poller.bind(noop)
+    events = week()
+    poller.sync(events, date(2026, 11, 2), date(2026, 11, 7), now=NOW)
+    job_id = f"release:{events[0].datetime.isoformat()}"
+
+    async def scenario():
+        started, release = asyncio.Event(), asyncio.Event()
+
+        async def watching(target, slot_events):
+            started.set()
+            await release.wait()
+
+        poller._watch = watching
+        watch = asyncio.create_task(poller.watch(events[:1]))
+        await started.wait()
+        # Le job a été déclenché (APScheduler l'a retiré), le suivi dure encore
+        del scheduler.jobs[job_id]
+        assert poller.stats()['watching'] == 1
+
+        # Rafraîchissement pendant la fenêtre: ni doublon ni retrait du créneau suivi
+        poller.sync(events, date(2026, 11, 2), date(2026, 11, 7), now=NOW)
+        poller.sync([], date(2026, 11, 2), date(2026, 11, 3), now=NOW)
+        assert job_id not in scheduler.jobs and scheduler.added == 5
+
+        release.set()
+        await watch
+        assert poller.stats()['watching'] == 0 and job_id not in poller._jobs
+
+    asyncio.run(scenario())
+
+
+def test_changed_event_replaces_reminder_at_same_time():
+    scheduler = Scheduler()
+    reminders = ReminderScheduler(scheduler)
+    reminders.bind(noop)
+    events = week()
+    reminders.sync(events, now=NOW)
+
+    # Même heure, importance et assets révisés: les deux rappels sont remplacés
+    revised = [events[0].replace(importance=5, assets=("ES", "CL"))] + events[1:]
+    assert reminders.sync(revised, now=NOW) == (0, 2, 0)
+    assert reminders.sync(revised, now=NOW) == (0, 0, 0)
+    assert scheduler.added == 12
+
+
+def test_upcoming_skips_stale_heap_entries():
+    scheduler = Scheduler()
+    reminders = ReminderScheduler(scheduler)
+    reminders.bind(noop)
+    events = week()
+    reminders.sync(events, now=NOW)
+    # Annonce de lundi décalée au vendredi soir, celle de mardi supprimée
+    moved = [events[0].replace(timestamp=events[4].timestamp + 3600)] + events[2:]
+    reminders.sync(moved, now=NOW)
+
+    expected = sorted((run_time, job_id) for job_id, run_time in reminders._jobs.items())
+    assert reminders.upcoming(3) == expected[:3]
+    assert reminders.upcoming(50) == expected
@@ -0,0 +1,38 @@
+import asyncio
+
+import pytest
+
+from benchmarks.fixtures import load_fixture
+from scraper import CalendarRowExtractor, TradingEconomicsScraper
+
+ROW = (
+    b'<table id="calendar"><tbody><tr data-id="1">'
+    b'<td>08:30 AM</td><td>Non Farm Payrolls <span>(Oct)</span></td><td>Interest Rate Decision</td>'
+    b'</tr></tbody></table>'
+)
+
+
+def test_text_survives_every_chunk_boundary():
+    # HTMLParser coupe le texte à chaque bloc passé à feed(): aucun espace ne doit disparaître
+    for chunk_size in range(1, len(ROW) + 1):
+        rows = list(CalendarRowExtractor().iter_rows(ROW, chunk_size=chunk_size))
+        assert [cell.get_text(strip=True) for cell in rows[0].children] == [
+            "08:30 AM", "Non Farm Payrolls(Oct)", "Interest Rate Decision"
+        ], chunk_size
+
+
+@pytest.mark.parametrize("chunk_size", [997, 16384, 65536])
+def test_stream_parser_matches_bs4(chunk_size):
+    content = load_fixture("busy_week")
+    expected = TradingEconomicsScraper(parse_mode="full")._parse_html(content)
+    scraper = TradingEconomicsScraper()
+    events = scraper._parse_rows(CalendarRowExtractor().iter_rows(content, chunk_size=chunk_size))
+    assert events == expected
+
+
+def test_release_values_parsed_in_executor():
+    content = load_fixture("busy_week")
+    scraper = TradingEconomicsScraper()
+    row_ids = {event.row_id for event in scraper._parse_html(content)[:5]}
+    values = asyncio.run(scraper.parse_release_values_async(content, row_ids))
+    assert values == scraper.parse_release_values(content, row_ids) and set(values) == row_ids
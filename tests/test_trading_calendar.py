@@ -0,0 +1,77 @@
+import random
+from datetime import date, timedelta
+
+import pytest
+
+import trading_calendar
+from market_holidays import MarketHolidays
+from trading_calendar import TradingCalendar
+
+MARKETS = ("US", "UK", "ALL")
+
+
+def is_open(day, market):
+    """Référence: jour de semaine hors jours fériés du marché"""
+    return day.weekday() < 5 and day not in MarketHolidays._year_table(day.year)[market]
+
+
+def walk(day, n, market):
+    """Référence: n séances après (ou avant) day, jour par jour"""
+    step = 1 if n > 0 else -1
+    if n == 0:
+        while not is_open(day, market):
+            day += timedelta(days=1)
+        return day
+    for _ in range(abs(n)):
+        day += timedelta(days=step)
+        while not is_open(day, market):
+            day += timedelta(days=step)
+    return day
+
+
+def count(start, end, market):
+    """Référence: séances dans [start, end[, négatif si end < start"""
+    lo, hi = min(start, end), max(start, end)
+    sessions = sum(is_open(lo + timedelta(days=i), market) for i in range((hi - lo).days))
+    return sessions if start <= end else -sessions
+
+
+@pytest.fixture(params=["python", "numpy"])
+def backend(request, monkeypatch):
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(trading_calendar, "np", None)
+    return request.param
+
+
+def sample_days():
+    # Fin et début d'année (Noël, Nouvel An, Boxing Day) plus des dates au hasard, hors plage précalculée comprise
+    days = [date(year, 12, 20) + timedelta(days=i) for year in (2015, 2024, 2026, 2032) for i in range(20)]
+    rng = random.Random(7)
+    days += [date(2005, 1, 1) + timedelta(days=rng.randrange(365 * 30)) for _ in range(150)]
+    return days
+
+
+@pytest.mark.parametrize("market", MARKETS)
+def test_matches_day_by_day_walk(backend, market):
+    calendar = TradingCalendar(market)
+    days = sample_days()
+
+    assert calendar.is_trading_day(days) == [is_open(day, market) for day in days]
+    for n in (-3, -1, 0, 1, 5):
+        assert calendar.add_trading_days(days, n) == [walk(day, n, market) for day in days], n
+    assert calendar.previous_trading_day(days) == [walk(day, -1, market) for day in days]
+
+    ends = [day + timedelta(days=offset) for day, offset in zip(days, range(-40, 400, 3))]
+    assert calendar.trading_days_between(days, ends) == [count(a, b, market) for a, b in zip(days, ends)]
+
+
+@pytest.mark.parametrize("market", MARKETS)
+def test_scalar_queries_across_new_year(market):
+    calendar = TradingCalendar(market)
+    for day in (date(2025, 12, 24) + timedelta(days=i) for i in range(12)):
+        assert calendar.is_trading_day(day) == is_open(day, market)
+        assert calendar.next_trading_day(day) == walk(day, 1, market)
+        assert calendar.add_trading_days(day, -2) == walk(day, -2, market)
+        assert calendar.trading_days_between(day, date(2026, 1, 10)) == count(day, date(2026, 1, 10), market)
@@ -0,0 +1,75 @@
+"""Fuseaux horaires et conversions d'heures partagés
+
+Les fuseaux sont construits une seule fois à l'import. Le calendrier
+TradingEconomics ne contient qu'une centaine de libellés d'heure distincts
+("08:30 AM", "All Day"...) et quelques en-têtes de date par semaine: leur
+parsing est mémoïsé. Le décalage UTC d'un fuseau est précalculé par date
+(changements d'heure inclus), ce qui évite de construire un datetime avec
+fuseau pour chaque ligne.
+"""
+from datetime import date, datetime
+from functools import lru_cache
+from zoneinfo import ZoneInfo
+
+UTC = ZoneInfo("UTC")
+NEW_YORK = ZoneInfo("America/New_York")
+PARIS = ZoneInfo("Europe/Paris")
+
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+# Heure retenue pour "All Day" / "Tentative" / libellé illisible (ET)
+DEFAULT_CLOCK = (9, 0)
+
+@lru_cache(maxsize=512)
+def parse_clock(time_str):
+    """(heure, minute) d'un libellé "08:30 AM" ou "14:30" (09:00 par défaut)"""
+    try:
+        time_str = time_str.strip()
+
+        if 'AM' in time_str or 'PM' in time_str:
+            time_obj = datetime.strptime(time_str, '%I:%M %p')
+            return time_obj.hour, time_obj.minute
+
+        if ':' in time_str:
+            parts = time_str.split(':')
+            return int(parts[0]), int(parts[1])
+
+        return DEFAULT_CLOCK
+
+    except ValueError:
+        return DEFAULT_CLOCK
+
+@lru_cache(maxsize=1024)
+def parse_date_header(date_text):
+    """Date d'un en-tête "Monday, October 19, 2026" (None si illisible)"""
+    try:
+        if ',' in date_text:
+            date_text = date_text.split(',', 1)[1].strip()
+        return datetime.strptime(date_text, '%B %d, %Y').date()
+    except ValueError:
+        return None
+
+@lru_cache(maxsize=4096)
+def _day_offsets(zone, ordinal):
+    """Décalages UTC (secondes) d'un fuseau au début et à la fin d'une journée"""
+    day = date.fromordinal(ordinal)
+    start = datetime(day.year, day.month, day.day, tzinfo=zone).utcoffset()
+    end = datetime(day.year, day.month, day.day, 23, 59, tzinfo=zone).utcoffset()
+    return int(start.total_seconds()), int(end.total_seconds())
+
+def local_timestamp(day, hour, minute, zone=NEW_YORK):
+    """Horodatage epoch de day à hour:minute (heure locale de zone)
+
+    Hors jour de changement d'heure, le décalage du jour vient de la table;
+    le jour du changement, conversion complète par zoneinfo.
+    """
+    start, end = _day_offsets(zone, day.toordinal())
+    if start != end:
+        return datetime(day.year, day.month, day.day, hour, minute, tzinfo=zone).timestamp()
+    return float((day.toordinal() - EPOCH_ORDINAL) * 86400 + hour * 3600 + minute * 60 - start)
+
+def to_timestamp(value, zone=PARIS):
+    """Epoch d'un datetime, ou de minuit (zone) pour une date"""
+    if isinstance(value, datetime):
+        return value.timestamp()
+    return datetime(value.year, value.month, value.day, tzinfo=zone).timestamp()
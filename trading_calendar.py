@@ -0,0 +1,193 @@
+"""Arithmétique en jours de trading construite sur MarketHolidays
+
+Un tableau cumulé du nombre de séances depuis une date origine (façon
+numpy.busday) permet de répondre en O(1) à "N séances après X", "séances
+entre A et B" ou "prochaine séance US / UK". Chaque méthode accepte une
+date ou un tableau de dates (liste, ou ndarray si NumPy est installé).
+"""
+from datetime import date, datetime
+from market_holidays import MarketHolidays
+
+try:
+    import numpy as np
+except ImportError:  # NumPy absent: repli en pur Python
+    np = None
+
+# Ordinal de 1970-01-01 (origine de numpy.datetime64)
+_UNIX_ORDINAL = date(1970, 1, 1).toordinal()
+
+class TradingCalendar:
+    """Calendrier de séances d'un marché: "US", "UK" ou "ALL" (US et UK ouverts)"""
+
+    YEARS_AROUND = 5
+
+    def __init__(self, market="ALL"):
+        self.market = market
+        today = date.today()
+        self._build(today.year - self.YEARS_AROUND, today.year + self.YEARS_AROUND)
+
+    def _build(self, start_year, end_year):
+        """Précalcule séances et comptes cumulés sur [start_year, end_year]"""
+        holidays = set()
+        for year in range(start_year, end_year + 1):
+            holidays.update(MarketHolidays._year_table(year)[self.market])
+
+        self._start_year, self._end_year = start_year, end_year
+        self._first = date(start_year, 1, 1).toordinal()
+        self._last = date(end_year, 12, 31).toordinal()
+
+        # cum[i] = nombre de séances dans [first, first + i[
+        cum = [0]
+        sessions = []
+        for ordinal in range(self._first, self._last + 1):
+            day = date.fromordinal(ordinal)
+            if day.weekday() < 5 and day not in holidays:
+                sessions.append(ordinal)
+            cum.append(len(sessions))
+
+        self._cum = cum
+        self._sessions = sessions
+        if np is not None:
+            self._np_cum = np.array(cum, dtype=np.int64)
+            self._np_sessions = np.array(sessions, dtype=np.int64)
+
+    def _ensure(self, lo, hi):
+        """Étend les tables si [lo, hi] (ordinaux) sort de la plage précalculée"""
+        if lo >= self._first and hi <= self._last:
+            return
+        start_year = min(self._start_year, date.fromordinal(max(int(lo), 1)).year)
+        end_year = max(self._end_year, date.fromordinal(int(hi)).year + 1)
+        self._build(start_year, end_year)
+
+    # --- Conversions -------------------------------------------------------
+
+    @staticmethod
+    def _is_scalar(value):
+        return isinstance(value, date)
+
+    @staticmethod
+    def _ordinal(day):
+        if isinstance(day, datetime):
+            day = day.date()
+        return day.toordinal()
+
+    def _ordinals(self, dates):
+        """Tableau d'ordinaux (ndarray si NumPy, sinon liste)"""
+        if np is not None:
+            if isinstance(dates, np.ndarray) and np.issubdtype(dates.dtype, np.datetime64):
+                return dates.astype('datetime64[D]').astype(np.int64) + _UNIX_ORDINAL
+            return np.fromiter((self._ordinal(d) for d in dates), dtype=np.int64)
+        return [self._ordinal(d) for d in dates]
+
+    @staticmethod
+    def _as_dates(ordinals, like):
+        """Reconvertit des ordinaux dans le type d'entrée (ndarray datetime64 ou liste de dates)"""
+        if np is not None and isinstance(like, np.ndarray):
+            return (ordinals - _UNIX_ORDINAL).astype('datetime64[D]')
+        return [date.fromordinal(int(o)) for o in ordinals]
+
+    @staticmethod
+    def _as_values(values, like):
+        if np is not None and isinstance(like, np.ndarray):
+            return values
+        return [v.item() if hasattr(v, 'item') else v for v in values]
+
+    @staticmethod
+    def _padding(n):
+        """Marge (jours calendaires) couvrant n séances, jours fériés compris"""
+        return abs(int(n)) * 2 + 30
+
+    # --- Requêtes ----------------------------------------------------------
+
+    def is_trading_day(self, dates):
+        """True si la date est une séance (ou tableau de booléens)"""
+        if self._is_scalar(dates):
+            ordinal = self._ordinal(dates)
+            self._ensure(ordinal, ordinal)
+            i = ordinal - self._first
+            return self._cum[i + 1] != self._cum[i]
+
+        ordinals = self._ordinals(dates)
+        if len(ordinals) == 0:
+            return self._as_values([], dates)
+        self._ensure(min(ordinals), max(ordinals))
+        if np is not None:
+            i = ordinals - self._first
+            return self._as_values(self._np_cum[i + 1] != self._np_cum[i], dates)
+        return [self._cum[o - self._first + 1] != self._cum[o - self._first] for o in ordinals]
+
+    def add_trading_days(self, dates, n):
+        """Date située n séances après (n > 0) ou avant (n < 0) chaque date
+
+        n = 0 renvoie la date si c'est une séance, sinon la séance suivante.
+        """
+        if self._is_scalar(dates):
+            ordinal = self._ordinal(dates)
+            pad = self._padding(n)
+            self._ensure(ordinal - pad, ordinal + pad)
+            i = ordinal - self._first
+            if n > 0:
+                pos = self._cum[i + 1] + n - 1
+            elif n < 0:
+                pos = self._cum[i] + n
+            else:
+                pos = self._cum[i]
+            return date.fromordinal(self._sessions[pos])
+
+        ordinals = self._ordinals(dates)
+        if len(ordinals) == 0:
+            return self._as_dates(ordinals, dates)
+        pad = self._padding(n)
+        self._ensure(min(ordinals) - pad, max(ordinals) + pad)
+        if np is not None:
+            i = ordinals - self._first
+            if n > 0:
+                pos = self._np_cum[i + 1] + n - 1
+            elif n < 0:
+                pos = self._np_cum[i] + n
+            else:
+                pos = self._np_cum[i]
+            return self._as_dates(self._np_sessions[pos], dates)
+        return [self.add_trading_days(date.fromordinal(o), n) for o in ordinals]
+
+    def trading_days_between(self, start, end):
+        """Nombre de séances dans [start, end[ (négatif si end < start)
+
+        start et end peuvent être des dates ou des tableaux de même longueur.
+        """
+        if self._is_scalar(start) and self._is_scalar(end):
+            lo, hi = self._ordinal(start), self._ordinal(end)
+            self._ensure(min(lo, hi), max(lo, hi))
+            return self._cum[hi - self._first] - self._cum[lo - self._first]
+
+        like = end if self._is_scalar(start) else start
+        starts = [start] * len(like) if self._is_scalar(start) else start
+        ends = [end] * len(like) if self._is_scalar(end) else end
+        lo, hi = self._ordinals(starts), self._ordinals(ends)
+        if len(lo) == 0:
+            return self._as_values([], like)
+        self._ensure(min(min(lo), min(hi)), max(max(lo), max(hi)))
+        if np is not None:
+            return self._as_values(self._np_cum[hi - self._first] - self._np_cum[lo - self._first], like)
+        return [self._cum[b - self._first] - self._cum[a - self._first] for a, b in zip(lo, hi)]
+
+    def next_trading_day(self, dates):
+        """Séance strictement après chaque date"""
+        return self.add_trading_days(dates, 1)
+
+    def previous_trading_day(self, dates):
+        """Séance strictement avant chaque date"""
+        return self.add_trading_days(dates, -1)
+
+_calendars = {}
+
+def get_trading_calendar(market="ALL"):
+    """Calendrier partagé d'un marché ("US", "UK" ou "ALL")"""
+    calendar = _calendars.get(market)
+    if calendar is None:
+        calendar = _calendars[market] = TradingCalendar(market)
+    return calendar
+
+def next_session(dates, market="US"):
+    """Prochaine séance (strictement après) sur un marché donné"""
+    return get_trading_calendar(market).next_trading_day(dates)
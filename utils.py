@@ -1,69 +1,144 @@
-from datetime import datetime, timedelta
-from zoneinfo import ZoneInfo
+from datetime import datetime
 from market_holidays import MarketHolidays
+from trading_calendar import get_trading_calendar
+from rendering import MAX_MESSAGE_CHARS, digest, event_signature, render_cache, split_lines
+from timeutils import UTC
+
+# Textes des embeds agenda / rappel quotidien par langue d'abonnement
+LABELS = {
+    "fr": {
+        "weekly_title": "📅 Agenda Économique - Semaine du ",
+        "weekly_description": "Toutes les annonces sont créées en Discord Events ⬇️\n*Clique 'Participer' pour recevoir des notifications*",
+        "stale": "\n⚠️ *TradingEconomics injoignable: agenda issu des dernières données connues*",
+        "days": ("Lundi", "Mardi", "Mercredi", "Jeudi", "Vendredi", "Samedi", "Dimanche"),
+        "days_short": ("Lun", "Mar", "Mer", "Jeu", "Ven", "Sam", "Dim"),
+        "holiday": "JOUR FÉRIÉ",
+        "holidays_week": "🚨 Jours Fériés Cette Semaine",
+        "holidays_warning": "⚠️ Marchés potentiellement fermés ou volatilité réduite",
+        "footer": "🔔 Rappels 1h et 5 min avant chaque annonce | Données: TradingEconomics",
+        "no_events": "❌ Aucun événement économique majeur cette semaine",
+        "unavailable": "⚠️ Calendrier économique momentanément indisponible, réessayez plus tard avec `!agenda`",
+        "closed_title": "🔴 Jour Férié - Marchés Fermés",
+        "holidays": "🚨 Jours Fériés",
+        "closed": "⚠️ **Les marchés US et/ou UK sont fermés aujourd'hui**\n📊 Volatilité réduite attendue",
+        "daily_title": "🔔 Annonces Économiques Aujourd'hui",
+        "attention": "🔴 ATTENTION - Jour Férié",
+        "importance": "Importance",
+    },
+    "en": {
+        "weekly_title": "📅 Economic Calendar - Week of ",
+        "weekly_description": "Every release is created as a Discord Event ⬇️\n*Click 'Interested' to get notified*",
+        "stale": "\n⚠️ *TradingEconomics unreachable: calendar built from the last known data*",
+        "days": ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"),
+        "days_short": ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"),
+        "holiday": "MARKET HOLIDAY",
+        "holidays_week": "🚨 Market Holidays This Week",
+        "holidays_warning": "⚠️ Markets may be closed or volatility reduced",
+        "footer": "🔔 Reminders 1h and 5 min before each release | Data: TradingEconomics",
+        "no_events": "❌ No major economic release this week",
+        "unavailable": "⚠️ Economic calendar temporarily unavailable, try again later with `!agenda`",
+        "closed_title": "🔴 Market Holiday - Markets Closed",
+        "holidays": "🚨 Market Holidays",
+        "closed": "⚠️ **US and/or UK markets are closed today**\n📊 Reduced volatility expected",
+        "daily_title": "🔔 Economic Releases Today",
+        "attention": "🔴 WARNING - Market Holiday",
+        "importance": "Importance",
+    },
+}
+
+def labels(language):
+    """Textes d'une langue (français par défaut)"""
+    return LABELS.get(language, LABELS["fr"])
 
 def format_event_message(event):
     """Formate un événement en message Discord élégant"""
-    assets_str = " ".join(event['assets'][:5])  # Limiter à 5 assets
+    assets_str = " ".join(event.assets[:5])  # Limiter à 5 assets
     
     message = f"""
 ╔══════════════════════════════════
-║ **{event['name']}**
+║ **{event.name}**
 ║ 
-║ 🕐 **Heure:** {event['time_paris']} (Paris)
-║ {event['country']} **Impact:** {event['importance']}
+║ 🕐 **Heure:** {event.time_paris} (Paris)
+║ {event.flag} **Impact:** {event.stars}
 ║ 📊 **Assets:** `{assets_str}`
 ╚══════════════════════════════════
 """
     return message.strip()
 
-def format_weekly_agenda(events_by_date):
-    """Formate l'agenda hebdomadaire avec détection des jours fériés"""
-    if not events_by_date:
+def format_weekly_agenda(events):
+    """Formate l'agenda hebdomadaire avec détection des jours fériés (mis en cache par empreinte)"""
+    if not events:
         return "📅 **Aucun événement majeur cette semaine**"
     
-    message = "📅 **AGENDA ÉCONOMIQUE - 7 PROCHAINS JOURS**\n\n"
+    events_by_date = {}
+    for event in sorted(events, key=lambda e: e.timestamp):
+        events_by_date.setdefault(event.datetime.date(), []).append(event)
     
-    sorted_dates = sorted(events_by_date.keys())
+    # Vérifier si c'est un jour férié
+    day_holidays = {date_obj: MarketHolidays.is_market_holiday(date_obj) for date_obj in events_by_date}
+    upcoming_holidays = MarketHolidays.get_upcoming_holidays(days_ahead=7)
     
-    for date_str in sorted_dates:
-        event = events_by_date[date_str]
-        date_obj = datetime.fromisoformat(date_str)
-        
-        # Vérifier si c'est un jour férié
-        holidays = MarketHolidays.is_market_holiday(date_obj.date())
-        
+    key = digest(
+        "weekly_text",
+        [(date_obj, day_holidays[date_obj], [event_signature(e) for e in day_events]) for date_obj, day_events in events_by_date.items()],
+        [(holiday['date'], holiday['holidays']) for holiday in upcoming_holidays]
+    )
+    return render_cache.get(key, lambda: _weekly_agenda_text(events_by_date, day_holidays, upcoming_holidays))
+
+def _weekly_agenda_text(events_by_date, day_holidays, upcoming_holidays):
+    parts = ["📅 **AGENDA ÉCONOMIQUE - 7 PROCHAINS JOURS**\n\n"]
+    
+    for date_obj, day_events in events_by_date.items():
         day_name = date_obj.strftime('%A %d %B').capitalize()
         
         # Ajouter un indicateur si jour férié
-        holiday_indicator = ""
-        if holidays:
-            holiday_names = " | ".join(holidays)
-            holiday_indicator = f"\n🔴 **JOUR FÉRIÉ:** {holiday_names}"
+        holidays = day_holidays[date_obj]
+        holiday_indicator = f"\n🔴 **JOUR FÉRIÉ:** {' | '.join(holidays)}" if holidays else ""
         
-        message += f"**{day_name}**{holiday_indicator}\n"
-        message += f"🕐 {event['time_paris']} | {event['country']} {event['importance']}\n"
-        message += f"**{event['name']}**\n"
-        message += f"📊 Assets: `{' '.join(event['assets'][:5])}`\n\n"
+        parts.append(f"**{day_name}**{holiday_indicator}\n")
+        parts.extend(
+            f"🕐 {event.time_paris} | {event.flag} {event.stars}\n"
+            f"**{event.name}**\n"
+            f"📊 Assets: `{' '.join(event.assets[:5])}`\n"
+            for event in day_events
+        )
+        parts.append("\n")
     
     # Ajouter section des jours fériés à venir
-    upcoming_holidays = MarketHolidays.get_upcoming_holidays(days_ahead=7)
     if upcoming_holidays:
-        message += "\n━━━━━━━━━━━━━━━━━━━━\n"
-        message += "🚨 **JOURS FÉRIÉS CETTE SEMAINE** 🚨\n"
+        parts.append("\n━━━━━━━━━━━━━━━━━━━━\n")
+        parts.append("🚨 **JOURS FÉRIÉS CETTE SEMAINE** 🚨\n")
         for holiday_info in upcoming_holidays:
             date_str = holiday_info['date'].strftime('%A %d %B').capitalize()
-            holidays_str = " & ".join(holiday_info['holidays'])
-            message += f"• **{date_str}:** {holidays_str}\n"
+            parts.append(f"• **{date_str}:** {' & '.join(holiday_info['holidays'])}\n")
     
-    message += "\n━━━━━━━━━━━━━━━━━━━━"
-    message += "\n⚠️ **Les marchés peuvent être fermés ou avoir des horaires réduits les jours fériés**"
+    parts.append("\n━━━━━━━━━━━━━━━━━━━━")
+    parts.append("\n⚠️ **Les marchés peuvent être fermés ou avoir des horaires réduits les jours fériés**")
     
-    return message
+    return "".join(parts)
+
+def format_event_list(title, events):
+    """Annonces groupées par jour pour !asset / !next / !week, en messages de 2000 caractères max"""
+    lines = [f"{title}\n"]
+    day = None
+    for event in events:
+        when = event.datetime
+        if when.date() != day:
+            day = when.date()
+            lines.append(f"\n📆 **{LABELS['fr']['days'][day.weekday()]} {day.strftime('%d/%m')}**\n")
+        lines.append(f"⏰ **{event.time_paris}** {event.flag} {event.name} {event.stars} | `{' '.join(event.assets[:5])}`\n")
+    return split_lines(lines, MAX_MESSAGE_CHARS)
+
+def format_delay(minutes):
+    """Formate un délai en minutes (~1h, ~2h30, 5 min)"""
+    if minutes < 60:
+        return f"{minutes} min"
+    hours, rest = divmod(minutes, 60)
+    return f"~{hours}h{rest:02d}" if rest else f"~{hours}h"
 
-def format_daily_reminder(event):
-    """Formate le rappel du jour avec indication de jour férié"""
-    date_obj = event['datetime'].date()
+def format_daily_reminder(event, minutes_before=60):
+    """Formate le rappel d'une annonce avec indication de jour férié"""
+    date_obj = event.datetime.date()
     holidays = MarketHolidays.is_market_holiday(date_obj)
     
     holiday_warning = ""
@@ -74,10 +149,10 @@ def format_daily_reminder(event):
     message = f"""
 🚨 **RAPPEL ÉVÉNEMENT MAJEUR AUJOURD'HUI** 🚨
 
-**{event['name']}**
-🕐 Dans ~1h ({event['time_paris']} Paris)
-{event['country']} Impact: {event['importance']}
-📊 Assets concernés: `{' '.join(event['assets'][:5])}`
+**{event.name}**
+🕐 Dans {format_delay(minutes_before)} ({event.time_paris} Paris)
+{event.flag} Impact: {event.stars}
+📊 Assets concernés: `{' '.join(event.assets[:5])}`
 {holiday_warning}
 
 ⚡ Préparez vos positions!
@@ -86,70 +161,57 @@ def format_daily_reminder(event):
 
 def get_next_trading_day():
     """Retourne le prochain jour ouvrable (non férié)"""
-    today = datetime.now(ZoneInfo("UTC")).date()
-    
-    for i in range(1, 30):  # Chercher jusqu'à 30 jours dans le futur
-        check_date = today + timedelta(days=i)
-        
-        # Vérifier si c'est un week-end
-        if check_date.weekday() >= 5:  # 5=samedi, 6=dimanche
-            continue
-        
-        # Vérifier si c'est un jour férié
-        holidays = MarketHolidays.is_market_holiday(check_date)
-        if not holidays:
-            return check_date
-    
-    return None
+    today = datetime.now(UTC).date()
+    return get_trading_calendar().next_trading_day(today)
 
 def is_trading_day(check_date):
-    """Vérifie si une date est un jour de trading"""
-    if isinstance(check_date, datetime):
-        check_date = check_date.date()
-    
-    # Week-end ?
-    if check_date.weekday() >= 5:
-        return False
-    
-    # Jour férié ?
-    holidays = MarketHolidays.is_market_holiday(check_date)
-    if holidays:
-        return False
-    
-    return True
+    """Vérifie si une date est un jour de trading (ni week-end, ni férié US/UK)"""
+    return get_trading_calendar().is_trading_day(check_date)
 
-def get_hardcoded_events():
-    """
-    Retourne les événements récurrents hardcodés
-    Utile pour les événements qui ne sont pas toujours sur TradingEconomics
-    """
-    events = {}
-    
-    today = datetime.now(ZoneInfo("UTC"))
-    
-    # Générer les 7 prochains mercredis pour EIA Crude Oil Inventories
-    # Publié chaque mercredi à 10:30 ET (16:30 Paris)
-    for i in range(7):
-        check_date = today + timedelta(days=i)
-        
-        # Si c'est un mercredi (weekday=2) et pas un jour férié
-        if check_date.weekday() == 2 and is_trading_day(check_date):
-            event_datetime = datetime(
-                check_date.year, check_date.month, check_date.day,
-                10, 30,  # 10:30 AM ET
-                tzinfo=ZoneInfo("America/New_York")
-            )
-            
-            event_datetime_paris = event_datetime.astimezone(ZoneInfo("Europe/Paris"))
-            
-            events[check_date.date().isoformat()] = {
-                'name': 'EIA Crude Oil Inventories',
-                'time_paris': event_datetime_paris.strftime('%H:%M'),
-                'country': '🇺🇸',
-                'importance': '⭐⭐⭐⭐',
-                'assets': ['CL', 'ES', 'NQ', 'GC', 'BTC', 'ETH'],
-                'description': 'US Energy Information Administration - Weekly Petroleum Status Report',
-                'datetime': event_datetime_paris
-            }
-    
-    return events
+def format_perf_report(report):
+    """Formate le diagnostic !perf (voir schedulers.perf_report)"""
+    def ms(seconds):
+        if seconds < 0.01:
+            return f"{seconds * 1000:.1f} ms"
+        return f"{seconds * 1000:.0f} ms" if seconds < 10 else f"{seconds:.1f} s"
+    
+    lines = ["📈 **Performances** (dernières exécutions par étape)", "```"]
+    if not report['stages']:
+        lines.append("Aucune mesure (PERF_METRICS=0 ou rien exécuté depuis le démarrage)")
+    for name, stage in report['stages'].items():
+        lines.append(
+            f"{name:<16} n={stage['count']:<5} p50 {ms(stage['p50']):>8} | p95 {ms(stage['p95']):>8} | max {ms(stage['max']):>8}"
+        )
+    lines.append("```")
+    
+    cache = report['cache']
+    lines.append(
+        f"🗄️ Cache calendrier: {cache['hit_rate']:.0%} de hits ({cache['hits']} frais, {cache['stale_hits']} périmés, "
+        f"{cache['misses']} miss, {cache['not_modified']} 304), circuit {cache['circuit']}"
+    )
+    
+    gauges = report['gauges']
+    if 'scrape_bytes' in gauges:
+        lines.append(
+            f"📦 Dernier scraping: {gauges['scrape_bytes'] / 1024:.0f} Ko, "
+            f"{gauges.get('scrape_events', '?')} annonces | {report['store']['events']} en mémoire"
+        )
+    
+    publish = report['publish']
+    lines.append(
+        f"📤 Discord: {publish['completed']} appels, {publish['failed']} échecs, {publish['rate_limited']} rate-limits, "
+        f"file {publish['depth']} | latence p95 {ms(publish['latency']['p95'])}"
+    )
+    
+    subscriptions = report['subscriptions']
+    render = report['render']
+    lines.append(
+        f"📬 Abonnements: {subscriptions['channels']} salon(s), {subscriptions['renders']} rendu(s) distinct(s) | "
+        f"cache de rendu {render['hit_rate']:.0%} ({render['entries']} en cache)"
+    )
+    
+    failed = [name for name, source in report['sources'].items() if name != 'total' and source.get('status') != 'ok']
+    if failed:
+        lines.append(f"⚠️ Sources en échec au dernier rafraîchissement: {', '.join(failed)}")
+    
+    return "\n".join(lines)